@@ -0,0 +1,553 @@
+import argparse
+import math
+import os
+import struct
+import tempfile
+import zlib
+import numpy as np
+
+import kapsayici
+from karistirma import derive_seed, generate_permutation
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Bir şeritte (band) en fazla bu kadar piksel işlenir; bellek kullanımı
+# resim boyutuna değil bu değere bağlıdır
+DEFAULT_BAND_PIXELS = 1 << 22
+# PNG çıktısında IDAT parçalarının boyutu
+_IDAT_SIZE = 1 << 16
+# Sıkıştırılmış veri bu büyüklükte bloklar halinde okunur
+_READ_SIZE = 1 << 16
+# Satır filtreleri bu büyüklükte (bayt) satır blokları halinde geri alınır;
+# Average/Paeth için ayrılan kaydırılmış kopya bunun en fazla iki katıdır
+_UNFILTER_BLOCK_BYTES = 1 << 25
+
+_CHANNELS_BY_COLOR_TYPE = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+_COLOR_TYPE_BY_CHANNELS = {1: 0, 2: 4, 3: 2, 4: 6}
+
+
+def _unfilter_row(filter_type, line, prev, bpp):
+    """None, Sub veya Up filtreli tek bir PNG satırının filtresini geri alır."""
+    if filter_type == 0:
+        return line
+    if filter_type == 1:
+        return np.cumsum(line.reshape(-1, bpp), axis=0, dtype=np.uint8).reshape(-1)
+    if filter_type == 2:
+        return line + prev
+    raise ValueError(f"Geçersiz PNG filtresi: {filter_type}")
+
+
+# Tüm (a, b, c) bayt üçlüleri için Paeth kestiricisi (16 MB, ilk kullanımda üretilir)
+_paeth_table = None
+
+
+def _paeth(a, b, c):
+    """Paeth kestiricisini tablodan okur; hesaplamaktan yaklaşık iki kat hızlıdır."""
+    global _paeth_table
+    if _paeth_table is None:
+        a_all, b_all, c_all = np.meshgrid(*[np.arange(256, dtype=np.int16)] * 3, indexing='ij')
+        pa = np.abs(b_all - c_all)
+        pb = np.abs(a_all - c_all)
+        pc = np.abs(a_all + b_all - 2 * c_all)
+        _paeth_table = np.where((pa <= pb) & (pa <= pc), a_all,
+                                np.where(pb <= pc, b_all, c_all)).astype(np.uint8).ravel()
+    return _paeth_table[(a.astype(np.int32) << 16) | (b.astype(np.int32) << 8) | c]
+
+
+def _unfilter_diagonals(filter_types, lines, prev, bpp):
+    """Satır bloğunun filtresini köşegen köşegen geri alır.
+
+    Average ve Paeth'te bir bayt, soldaki pikselin çözülmüş değerine
+    bağlı olduğundan satır içinde vektörel çözülemez. Ancak (y, x)
+    pikseli yalnızca (y, x-1), (y-1, x) ve (y-1, x-1)'e bağlıdır; aynı
+    köşegendeki (x + y sabit) pikseller birbirinden bağımsızdır. Satırlar
+    y kadar kaydırılıp köşegenler bellekte bitişik olacak şekilde saklanır
+    ve her köşegen tek adımda çözülür; adım sayısı satır sayısı ile
+    satırdaki piksel sayısının toplamıdır. Tüm filtre türleri bu yolla
+    çözülebilir.
+    """
+    rows, stride = lines.shape
+    width = stride // bpp
+    # Satır y'nin (0: önceki satır) x pikseli skewed[x + y + 1, y]'dedir;
+    # her satırın solundaki piksel sıfırdır
+    skewed = np.zeros((rows + width + 1, rows + 1, bpp), dtype=np.uint8)
+    skewed[1:width + 1, 0] = prev.reshape(width, bpp)
+    for y in range(1, rows + 1):
+        skewed[y + 1:y + 1 + width, y] = lines[y - 1].reshape(width, bpp)
+
+    kinds, choice_index = np.unique(filter_types, return_inverse=True)
+    if kinds[-1] > 4:
+        raise ValueError(f"Geçersiz PNG filtresi: {kinds[-1]}")
+    choice_index = choice_index.reshape(-1, 1)
+    zero = np.uint8(0)
+    for k in range(2, rows + width + 1):
+        first, last = max(1, k - width), min(rows, k - 1)
+        a = skewed[k - 1, first:last + 1]
+        b = skewed[k - 1, first - 1:last]
+        choices = []
+        for kind in kinds:
+            if kind == 0:
+                choices.append(zero)
+            elif kind == 1:
+                choices.append(a)
+            elif kind == 2:
+                choices.append(b)
+            elif kind == 3:
+                choices.append(((a.astype(np.uint16) + b) >> 1).astype(np.uint8))
+            else:
+                choices.append(_paeth(a, b, skewed[k - 2, first - 1:last]))
+        if len(kinds) == 1:
+            predictor = choices[0]
+        else:
+            predictor = np.choose(choice_index[first - 1:last], choices)
+        skewed[k, first:last + 1] += predictor
+
+    return np.stack([skewed[y + 1:y + 1 + width, y].reshape(-1) for y in range(1, rows + 1)])
+
+
+def _unfilter_rows(filter_types, lines, prev, bpp):
+    """Ardışık PNG satırlarının filtresini geri alır.
+
+    None, Sub ve Up satırları satır satır vektörel çözülür; Average ve
+    Paeth satırlarının bulunduğu aralık _unfilter_diagonals ile çözülür.
+    """
+    out = np.empty_like(lines)
+    slow = np.flatnonzero(filter_types >= 3)
+    first, last = (slow[0], slow[-1] + 1) if len(slow) else (len(lines), len(lines))
+    for y in range(first):
+        prev = out[y] = _unfilter_row(filter_types[y], lines[y], prev, bpp)
+    if first < last:
+        out[first:last] = _unfilter_diagonals(filter_types[first:last], lines[first:last], prev, bpp)
+        prev = out[last - 1]
+    for y in range(last, len(lines)):
+        prev = out[y] = _unfilter_row(filter_types[y], lines[y], prev, bpp)
+    return out
+
+
+class PngBandReader:
+    """PNG dosyasını tamamını belleğe almadan satır şeritleri halinde okur.
+
+    Şeritler cv2.imdecode(..., cv2.IMREAD_UNCHANGED) ile aynı biçimde
+    döndürülür: gri resimler tek kanallı, renkli resimler BGR, saydamlık
+    kanalı olanlar BGRA; 16 bit resimler uint16 olarak kalır.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        if self._file.read(8) != PNG_SIGNATURE:
+            self._file.close()
+            raise ValueError("Dosya PNG değil")
+
+        self._palette = None
+        self._first_idat = None
+        while self._first_idat is None:
+            chunk_type, data = self._read_chunk()
+            if chunk_type == b'IHDR':
+                (self.width, self.height, self.bit_depth, self.color_type,
+                 _, _, interlace) = struct.unpack('>IIBBBBB', data)
+                if interlace:
+                    raise ValueError("Geçmeli (interlaced) PNG desteklenmiyor")
+                if self.color_type not in _CHANNELS_BY_COLOR_TYPE:
+                    raise ValueError(f"Desteklenmeyen PNG renk tipi: {self.color_type}")
+            elif chunk_type == b'PLTE':
+                self._palette = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+            elif chunk_type == b'IDAT':
+                self._first_idat = data
+            elif chunk_type == b'IEND':
+                raise ValueError("PNG dosyasında görüntü verisi yok")
+
+        channels = _CHANNELS_BY_COLOR_TYPE[self.color_type]
+        # Paletli resimler BGR'ye, gri+saydam resimler BGRA'ya açılır (OpenCV gibi)
+        output_channels = {0: 1, 2: 3, 3: 3, 4: 4, 6: 4}[self.color_type]
+        self.shape = ((self.height, self.width) if output_channels == 1
+                      else (self.height, self.width, output_channels))
+        self.dtype = np.dtype(np.uint16 if self.bit_depth == 16 else np.uint8)
+        bits_per_pixel = channels * self.bit_depth
+        self._bpp = max(1, bits_per_pixel // 8)
+        self._stride = (self.width * bits_per_pixel + 7) // 8
+
+    def _read_chunk(self):
+        header = self._file.read(8)
+        if len(header) < 8:
+            raise ValueError("PNG dosyası eksik")
+        length, chunk_type = struct.unpack('>I4s', header)
+        data = self._file.read(length)
+        crc, = struct.unpack('>I', self._file.read(4))
+        if zlib.crc32(chunk_type + data) != crc:
+            raise ValueError("PNG dosyası bozuk (CRC hatası)")
+        return chunk_type, data
+
+    def _idat_stream(self):
+        yield self._first_idat
+        while True:
+            chunk_type, data = self._read_chunk()
+            if chunk_type == b'IDAT':
+                yield data
+            elif chunk_type == b'IEND':
+                return
+
+    def _raw_rows(self):
+        """Filtresi geri alınmış satırları sırayla üretir.
+
+        Satırlar, köşegen çözme için bellek sınırını aşmayan bloklar
+        halinde açılır ve çözülür.
+        """
+        decompressor = zlib.decompressobj()
+        idat = self._idat_stream()
+        pending = bytearray()
+        line_size = self._stride + 1
+        prev = np.zeros(self._stride, dtype=np.uint8)
+        block_rows = max(1, min(_UNFILTER_BLOCK_BYTES // line_size,
+                                math.isqrt(_UNFILTER_BLOCK_BYTES // self._bpp)))
+
+        for start in range(0, self.height, block_rows):
+            block_size = min(block_rows, self.height - start) * line_size
+            while len(pending) < block_size:
+                source = decompressor.unconsumed_tail or next(idat, b'')
+                data = decompressor.decompress(source, max(_READ_SIZE, block_size - len(pending)))
+                if not data and not source:
+                    raise ValueError("PNG görüntü verisi eksik")
+                pending += data
+            block = np.frombuffer(bytes(pending[:block_size]), dtype=np.uint8).reshape(-1, line_size)
+            del pending[:block_size]
+            rows = _unfilter_rows(block[:, 0], block[:, 1:], prev, self._bpp)
+            prev = rows[-1]
+            yield from rows
+
+    def _to_pixels(self, raw):
+        """Ham satırları IMREAD_UNCHANGED biçimine çevirir."""
+        rows = raw.shape[0]
+        depth = self.bit_depth
+        if depth == 16:
+            samples = raw.view('>u2').astype(np.uint16)
+        elif depth == 8:
+            samples = raw
+        else:
+            shifts = np.arange(8 - depth, -1, -depth, dtype=np.uint8)
+            samples = (raw[:, :, None] >> shifts) & ((1 << depth) - 1)
+            samples = samples.reshape(rows, -1)[:, :self.width]
+            if self.color_type == 0:
+                samples = samples * (255 // ((1 << depth) - 1))
+            samples = samples.astype(np.uint8, copy=False)
+
+        channels = _CHANNELS_BY_COLOR_TYPE[self.color_type]
+        pixels = samples.reshape(rows, self.width, channels)
+        if self.color_type == 3:
+            return np.ascontiguousarray(self._palette[pixels[:, :, 0]][:, :, ::-1])
+        if channels == 1:
+            return np.ascontiguousarray(pixels[:, :, 0])
+        if channels == 2:
+            gray = pixels[:, :, :1]
+            return np.concatenate([gray, gray, gray, pixels[:, :, 1:]], axis=2)
+        return np.concatenate([pixels[:, :, 2::-1], pixels[:, :, 3:]], axis=2)
+
+    def bands(self, band_rows):
+        """Resmi en fazla band_rows satırlık şeritler halinde döndürür."""
+        rows = []
+        for row in self._raw_rows():
+            rows.append(row)
+            if len(rows) == band_rows:
+                yield self._to_pixels(np.stack(rows))
+                rows = []
+        if rows:
+            yield self._to_pixels(np.stack(rows))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PngBandWriter:
+    """Satır şeritlerini gelir gelmez PNG olarak yazar.
+
+    Karıştırılmış pikseller gürültü gibi olduğundan PNG filtreleri fayda
+    sağlamaz; satırlar filtresiz (tip 0) yazılır. adaptive=True ise her
+    satır için filtresiz ve Paeth arasından daha iyi sıkışacak olan seçilir
+    (çözülmüş, doğal resimler için). Çıktı write() metodu olan herhangi bir
+    nesneye akıtılabilir. chunks, IHDR'den hemen sonra yazılacak ek
+    (tür, veri) parçalarıdır (ör. şifreleme şeması).
+    """
+
+    def __init__(self, output, width, height, channels=3, dtype=np.uint8,
+                 compression_level=6, strategy=zlib.Z_DEFAULT_STRATEGY, adaptive=False,
+                 chunks=()):
+        self._output = output
+        self._channels = channels
+        self._dtype = np.dtype(dtype)
+        self._compressor = zlib.compressobj(compression_level, zlib.DEFLATED, zlib.MAX_WBITS,
+                                            zlib.DEF_MEM_LEVEL, strategy)
+        self._buffer = bytearray()
+        self._rows_written = 0
+        self._adaptive = adaptive
+        self._bpp = channels * self._dtype.itemsize
+        self._previous_row = np.zeros(width * self._bpp, dtype=np.uint8)
+        self.height = height
+
+        bit_depth = self._dtype.itemsize * 8
+        self._output.write(PNG_SIGNATURE)
+        self._write_chunk(b'IHDR', struct.pack(
+            '>IIBBBBB', width, height, bit_depth,
+            _COLOR_TYPE_BY_CHANNELS[channels], 0, 0, 0
+        ))
+        for chunk_type, data in chunks:
+            self._write_chunk(chunk_type, data)
+
+    def _write_chunk(self, chunk_type, data):
+        self._output.write(struct.pack('>I', len(data)) + chunk_type)
+        self._output.write(data)
+        self._output.write(struct.pack('>I', zlib.crc32(chunk_type + data)))
+
+    def _emit(self, data, final=False):
+        self._buffer += data
+        while len(self._buffer) >= _IDAT_SIZE or (final and self._buffer):
+            self._write_chunk(b'IDAT', bytes(self._buffer[:_IDAT_SIZE]))
+            del self._buffer[:_IDAT_SIZE]
+
+    def write(self, band):
+        """BGR (veya tek/çift kanallı) bir şeridi PNG'ye ekler."""
+        rows = band.shape[0]
+        pixels = band.reshape(rows, -1, self._channels)
+        if self._channels >= 3:
+            pixels = np.concatenate(
+                [pixels[:, :, 2::-1], pixels[:, :, 3:]], axis=2
+            )
+        samples = pixels.astype(self._dtype.newbyteorder('>'), copy=False)
+        raw = np.zeros((rows, 1 + samples[0].nbytes), dtype=np.uint8)
+        raw[:, 1:] = np.ascontiguousarray(samples).reshape(rows, -1).view(np.uint8)
+        if self._adaptive:
+            self._filter_rows(raw)
+        self._emit(self._compressor.compress(raw))
+        self._rows_written += rows
+
+    def _filter_rows(self, raw):
+        # Kodlamada Paeth tahmini filtrelenmemiş baytlardan hesaplandığından
+        # tüm şerit için vektörel yapılabilir
+        lines = raw[:, 1:]
+        above = np.concatenate([self._previous_row[None], lines[:-1]])
+        self._previous_row = lines[-1].copy()
+        left = np.zeros_like(lines)
+        left[:, self._bpp:] = lines[:, :-self._bpp]
+        upper_left = np.zeros_like(above)
+        upper_left[:, self._bpp:] = above[:, :-self._bpp]
+
+        a, b, c = (x.astype(np.int16) for x in (left, above, upper_left))
+        p = a + b - c
+        pa, pb, pc = np.abs(p - a), np.abs(p - b), np.abs(p - c)
+        predictor = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, above, upper_left))
+        paeth = lines - predictor
+
+        # libpng'nin sezgisi: işaretli bayt değerlerinin mutlak toplamı küçük olan
+        def cost(data):
+            return np.abs(data.view(np.int8).astype(np.int32)).sum(axis=1)
+        use_paeth = cost(paeth) < cost(lines)
+        lines[use_paeth] = paeth[use_paeth]
+        raw[use_paeth, 0] = 4
+
+    def close(self):
+        if self._rows_written != self.height:
+            raise ValueError("PNG çıktısına eksik satır yazıldı")
+        self._emit(self._compressor.flush(), final=True)
+        self._write_chunk(b'IEND', b'')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+
+
+def _band_rows(width, band_pixels):
+    return max(1, band_pixels // max(width, 1))
+
+
+def _open_random_access(input_path, work_dir, band_pixels):
+    """Kaynağı rastgele erişilebilir bir np.memmap olarak açar.
+
+    .npy ve .gsif dosyaları doğrudan eşlenir; PNG dosyaları şerit şerit
+    çözülüp geçici ham bir dosyaya yazılır.
+    """
+    if input_path.lower().endswith('.npy'):
+        return np.load(input_path, mmap_mode='r')
+    if input_path.lower().endswith(kapsayici.EXTENSION):
+        return kapsayici.open_container(input_path)[1]
+
+    with PngBandReader(input_path) as reader:
+        source = np.memmap(os.path.join(work_dir, 'kaynak.raw'), dtype=reader.dtype,
+                           mode='w+', shape=reader.shape)
+        row = 0
+        for band in reader.bands(_band_rows(reader.width, band_pixels)):
+            source[row:row + len(band)] = band
+            row += len(band)
+        return source
+
+
+def _iter_bands(input_path, band_pixels):
+    """Kaynağı sırayla şeritler halinde okur; (şekil, şerit üreteci) döndürür."""
+    if input_path.lower().endswith(('.npy', kapsayici.EXTENSION)):
+        if input_path.lower().endswith('.npy'):
+            source = np.load(input_path, mmap_mode='r')
+        else:
+            source = kapsayici.open_container(input_path)[1]
+        band_rows = _band_rows(source.shape[1], band_pixels)
+        bands = (source[row:row + band_rows] for row in range(0, source.shape[0], band_rows))
+        return source.shape, source.dtype, bands
+
+    reader = PngBandReader(input_path)
+
+    def bands():
+        with reader:
+            yield from reader.bands(_band_rows(reader.width, band_pixels))
+
+    return reader.shape, reader.dtype, bands()
+
+
+class _MappedBandWriter:
+    """Şeritleri .npy veya .gsif dosyasına (np.memmap üzerinden) yazar."""
+
+    def __init__(self, path, shape, dtype):
+        if path.lower().endswith('.npy'):
+            self._target = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+        else:
+            self._target = kapsayici.create_container(path, shape, dtype)[1]
+        self._row = 0
+
+    def write(self, band):
+        self._target[self._row:self._row + len(band)] = band
+        self._row += len(band)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._target.flush()
+        del self._target
+
+
+def _open_writer(output_path, shape, dtype, compression_level):
+    if output_path.lower().endswith(('.npy', kapsayici.EXTENSION)):
+        return _MappedBandWriter(output_path, shape, dtype)
+    output = open(output_path, 'wb')
+    channels = shape[2] if len(shape) == 3 else 1
+    writer = PngBandWriter(output, shape[1], shape[0], channels, dtype, compression_level)
+    return _ClosingWriter(writer, output)
+
+
+class _ClosingWriter:
+    """PNG yazıcıyı ve altındaki dosyayı birlikte kapatır."""
+
+    def __init__(self, writer, output):
+        self._writer = writer
+        self._output = output
+
+    def write(self, band):
+        self._writer.write(band)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        try:
+            self._writer.__exit__(exc_type, *exc_info)
+        finally:
+            self._output.close()
+
+
+def _permutation_memmap(work_dir, key, pixel_count):
+    """Permütasyonu RAM yerine diskte (np.memmap) üretir."""
+    pixel_indices = np.memmap(os.path.join(work_dir, 'permutasyon.u32'), dtype=np.uint32,
+                              mode='w+', shape=(max(pixel_count, 1),))[:pixel_count]
+    return generate_permutation(derive_seed(key), pixel_count, out=pixel_indices)
+
+
+def encrypt_file_streaming(input_path, output_path, key,
+                           band_pixels=DEFAULT_BAND_PIXELS, work_dir=None,
+                           compression_level=6):
+    """Resmi tamamını belleğe almadan şifreler.
+
+    Kaynak np.memmap üzerinden rastgele okunur; çıktı şeritleri
+    encrypted[i] = original[pixel_indices[i]] sırasıyla üretildiğinden
+    hedef için ek bir tampon gerekmez ve PNG doğrudan diske akıtılır.
+    """
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        source = _open_random_access(input_path, tmp, band_pixels)
+        height, width = source.shape[:2]
+        pixel_count = height * width
+        flat_source = source.reshape(pixel_count, -1)
+        pixel_indices = _permutation_memmap(tmp, key, pixel_count)
+
+        band_rows = _band_rows(width, band_pixels)
+        with _open_writer(output_path, source.shape, source.dtype, compression_level) as writer:
+            for row in range(0, height, band_rows):
+                start = row * width
+                stop = min(row + band_rows, height) * width
+                band = flat_source[pixel_indices[start:stop]]
+                writer.write(band.reshape((-1,) + source.shape[1:]))
+        del source, flat_source, pixel_indices
+
+
+def decrypt_file_streaming(input_path, output_path, key,
+                           band_pixels=DEFAULT_BAND_PIXELS, work_dir=None,
+                           compression_level=6):
+    """Şifreli resmi tamamını belleğe almadan çözer.
+
+    Kaynak sırayla okunur ve her şerit decrypted[pixel_indices[i]] =
+    encrypted[i] ile np.memmap hedefe dağıtılır; ardından hedef şerit
+    şerit PNG'ye akıtılır.
+    """
+    from kodlama import read_file_scheme
+
+    if read_file_scheme(input_path) != kapsayici.LEGACY_SCHEME:
+        raise ValueError("Şerit şerit çözme yalnızca piksel karıştırmayla şifrelenmiş resimleri destekler")
+    shape, dtype, bands = _iter_bands(input_path, band_pixels)
+    height, width = shape[:2]
+    pixel_count = height * width
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        pixel_indices = _permutation_memmap(tmp, key, pixel_count)
+        target = np.memmap(os.path.join(tmp, 'hedef.raw'), dtype=dtype,
+                           mode='w+', shape=shape)
+        flat_target = target.reshape(pixel_count, -1)
+
+        start = 0
+        for band in bands:
+            flat_band = band.reshape(-1, flat_target.shape[1])
+            stop = start + len(flat_band)
+            flat_target[pixel_indices[start:stop]] = flat_band
+            start = stop
+
+        band_rows = _band_rows(width, band_pixels)
+        with _open_writer(output_path, shape, dtype, compression_level) as writer:
+            for row in range(0, height, band_rows):
+                writer.write(target[row:row + band_rows])
+        del target, flat_target, pixel_indices
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Çok büyük resimleri şerit şerit şifreler/çözer"
+    )
+    parser.add_argument('islem', choices=['sifrele', 'coz'])
+    parser.add_argument('girdi', help="Girdi dosyası (.png, .npy veya .gsif)")
+    parser.add_argument('cikti', help="Çıktı dosyası (.png, .npy veya .gsif)")
+    parser.add_argument('--sifre', required=True)
+    parser.add_argument('--serit-piksel', type=int, default=DEFAULT_BAND_PIXELS,
+                        help="Bir şeritte işlenecek en fazla piksel sayısı")
+    parser.add_argument('--gecici-dizin', default=None,
+                        help="Geçici dosyaların yazılacağı dizin")
+    parser.add_argument('--sikistirma', type=int, choices=range(10), default=6,
+                        help="PNG sıkıştırma seviyesi (0: en hızlı, 9: en küçük)")
+    args = parser.parse_args(argv)
+
+    process = encrypt_file_streaming if args.islem == 'sifrele' else decrypt_file_streaming
+    process(args.girdi, args.cikti, args.sifre, args.serit_piksel, args.gecici_dizin,
+            args.sikistirma)
+
+
+if __name__ == '__main__':
+    main()
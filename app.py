@@ -1,100 +1,347 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, g, request, jsonify, send_file
 from flask_cors import CORS
-import cv2
-import numpy as np
-import random
 import io
 import os
-from PIL import Image
-import tempfile
+import mmap
+import json
+import time
+import threading
+import posixpath
+import tarfile
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 import locale
 
+import kapsayici
+import olcumler
+import profilleme
+from karistirma import (in_place_preferred, iter_scrambled_rows, iter_unscrambled_rows,
+                        permutation_cache, scramble_pixels, unscramble_pixels)
+from islem_havuzu import ComputePool, PoolBusyError, ENCRYPT, DECRYPT, STREAM_CHUNK_SIZE
+from is_kuyrugu import DONE, JobQueue, QueueFullError
+from kodlama import (DEFAULT_FORMAT, OUTPUT_FORMATS, ChunkSink, check_scheme_format, decode_image,
+                     decrypt_scheme, encode_image, iter_encoded, read_scheme,
+                     validate_output_options, validate_scheme_options)
+
 # Sistem yerel ayarlarını kullan
 locale.setlocale(locale.LC_ALL, '')
 
 app = Flask(__name__, static_folder='.', static_url_path='')
 CORS(app)  # Enable CORS for all routes
 
+# Yüklenebilecek dosya türleri
+ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.npy', '.gsif'}
+
+# Piksel işleri ve PNG kodlama süreç havuzunda yapılır
+compute_pool = ComputePool.from_environment()
+
+# Büyük resimler için arka planda çalışan iş kuyruğu
+job_queue = JobQueue.from_environment()
+
+# Bu boyuttan küçük yüklemeler doğrudan okunur; büyükleri Werkzeug'un
+# yazdığı geçici dosyadan mmap ile eşlenir
+MMAP_THRESHOLD = 1 << 20
+
+# Toplu isteklerde resimler bu kadar iş parçacığında işlenir. İş parçacıkları
+# aynı süreçteki permütasyon önbelleğini paylaştığından aynı boyuttaki
+# resimler için permütasyon bir kez üretilir.
+BATCH_WORKERS = min(32, os.cpu_count() or 1)
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+BATCH_SUMMARY_NAME = 'sonuc.json'
+# Toplu isteklerdeki arşivlerin açılmış toplam boyutu ve dosya sayısı için
+# üst sınırlar (sıkıştırma bombalarına karşı); aşılırsa istek 413 ile reddedilir
+ARCHIVE_SIZE_LIMIT = int(os.environ.get('SIFRELEME_ARSIV_SINIRI_MB', '2048')) * 1024 * 1024
+ARCHIVE_MEMBER_LIMIT = int(os.environ.get('SIFRELEME_ARSIV_DOSYA_SINIRI', '10000'))
+
+class ArchiveTooLargeError(Exception):
+    """Toplu istekteki arşivler açıldığında boyut veya dosya sınırını aşarsa fırlatılır."""
+
+# Süreç havuzunu kullanan endpoint'ler; havuz doluysa gövde okunmadan reddedilir
+POOL_ENDPOINTS = {'encrypt_endpoint', 'decrypt_endpoint',
+                  'encrypt_batch_endpoint', 'decrypt_batch_endpoint'}
+
+# Aynı anda okunabilecek en fazla yükleme (0: sınırsız). Yavaş yüklemeler
+# havuzda yer tutmaz; havuzdaki yer gövde okunduktan sonra ayrılır.
+UPLOAD_LIMIT = int(os.environ.get('SIFRELEME_YUKLEME_SINIRI', '64'))
+_upload_slots = threading.BoundedSemaphore(UPLOAD_LIMIT) if UPLOAD_LIMIT else None
+
+@contextmanager
+def reserve_upload():
+    """Yükleme okumak için yer ayırır; yer yoksa hemen PoolBusyError fırlatır."""
+    if _upload_slots is None:
+        yield
+        return
+    if not _upload_slots.acquire(blocking=False):
+        raise PoolBusyError("Sunucu meşgul, lütfen daha sonra tekrar deneyin")
+    try:
+        yield
+    finally:
+        _upload_slots.release()
+
+def _busy_response(error, retry_after=1):
+    response = jsonify({'error': str(error)})
+    response.headers['Retry-After'] = str(retry_after)
+    return response, 503
+
+@app.before_request
+def _start_request_metrics():
+    g.metrics_started = time.perf_counter()
+    olcumler.IN_FLIGHT.inc()
+    olcumler.BYTES_IN.inc(request.content_length or 0)
+    if request.method == 'POST' and request.mimetype == 'multipart/form-data':
+        upload = ExitStack()
+        if request.endpoint in POOL_ENDPOINTS:
+            try:
+                compute_pool.check_capacity()
+                upload.enter_context(reserve_upload())
+            except PoolBusyError as e:
+                return _busy_response(e)
+        elif request.endpoint == 'submit_job_endpoint':
+            try:
+                job_queue.check_capacity()
+            except QueueFullError as e:
+                return _busy_response(e, retry_after=5)
+        # Form gövdesi burada okunur ki yükleme süresi ayrı ölçülsün
+        with upload, olcumler.stage('upload'):
+            request.files
+
+@app.after_request
+def _finish_request_metrics(response):
+    endpoint = request.url_rule.rule if request.url_rule else 'bilinmiyor'
+    started = g.pop('metrics_started', None)
+    olcumler.REQUESTS.inc(endpoint=endpoint, status=response.status_code)
+    if response.content_length is not None:
+        olcumler.BYTES_OUT.inc(response.content_length)
+
+    def finished():
+        # Akış halindeki yanıtlarda istek ancak gövde gönderilince biter
+        olcumler.IN_FLIGHT.dec()
+        if started is not None:
+            olcumler.REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+
+    response.call_on_close(finished)
+    return response
+
 # Serve the main HTML file
 @app.route('/')
 def index():
     return send_file('index.html')
 
-def encrypt_image_data(image_data, key):
-    """Resim verisini şifreler."""
+def encrypt_image_data(image_data, key, output_format=DEFAULT_FORMAT, compression=None,
+                       scheme=None):
+    """Resim verisini şifreler; çıktı biçimi ve PNG sıkıştırma seviyesi seçilebilir.
+
+    scheme (kapsayici.Scheme) verilmezse eski piksel karıştırma kullanılır.
+    """
     try:
         # Numpy array'e çevir ve OpenCV ile decode et
-        nparr = np.frombuffer(image_data, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        image = decode_image(image_data)
         
         if image is None:
             raise ValueError("Resim yüklenemedi")
             
-        height, width, channels = image.shape
-
-        key_bytes = [ord(k) for k in key]
-        seed = sum(key_bytes)
-        random.seed(seed)
-
-        pixel_indices = list(range(height * width))
-        random.shuffle(pixel_indices)
+        if compute_pool.enabled:
+            return compute_pool.run(ENCRYPT, image, key, output_format, compression, scheme)
 
-        flat_image = image.reshape(-1, 3)
-        encrypted_flat_image = np.zeros_like(flat_image)
-
-        for i in range(len(pixel_indices)):
-            encrypted_flat_image[i] = flat_image[pixel_indices[i]]
-
-        encrypted_image = encrypted_flat_image.reshape(height, width, channels)
+        encrypted_image = scramble_pixels(image, key, scheme=scheme,
+                                          in_place=in_place_preferred(image, scheme))
         
-        # PNG formatı kullanarak kayıpsız sıkıştırma
-        result, encoded_img = cv2.imencode('.png', encrypted_image)
-        if result:
-            return encoded_img.tobytes()
-        else:
-            raise ValueError("Şifreleme işlemi başarısız")
+        # Varsayılan olarak PNG formatı kullanarak kayıpsız sıkıştırma
+        return encode_image(encrypted_image, output_format, compression, scheme)
             
     except Exception as e:
         raise Exception(f"Şifreleme işlemi sırasında hata oluştu: {e}")
 
-def decrypt_image_data(image_data, key):
-    """Şifrelenmiş resim verisini çözer."""
+def decrypt_image_data(image_data, key, output_format=DEFAULT_FORMAT, compression=None,
+                       scheme=None):
+    """Şifrelenmiş resim verisini çözer; çıktı biçimi ve PNG sıkıştırma seviyesi seçilebilir.
+
+    scheme verilmezse resmin kendisinden (kapsayıcı başlığı, PNG şema
+    parçası) okunur; bilgi yoksa eski piksel karıştırma varsayılır.
+    """
     try:
+        scheme = _resolve_scheme(DECRYPT, scheme, image_data)
+
         # Numpy array'e çevir ve OpenCV ile decode et
-        nparr = np.frombuffer(image_data, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        image = decode_image(image_data)
         
         if image is None:
             raise ValueError("Resim yüklenemedi")
             
-        height, width, channels = image.shape
+        if compute_pool.enabled:
+            return compute_pool.run(DECRYPT, image, key, output_format, compression, scheme)
 
-        key_bytes = [ord(k) for k in key]
-        seed = sum(key_bytes)
-        random.seed(seed)
-
-        pixel_indices = list(range(height * width))
-        random.shuffle(pixel_indices)  # Şifreleme ile aynı sırayı elde etmek için
-
-        flat_image = image.reshape(-1, 3)
-        decrypted_flat_image = np.zeros_like(flat_image)
-
-        # Şifre çözme işlemi
-        for i, pos in enumerate(pixel_indices):
-            decrypted_flat_image[pos] = flat_image[i]
-
-        decrypted_image = decrypted_flat_image.reshape(height, width, channels)
+        decrypted_image = unscramble_pixels(image, key, scheme=scheme,
+                                            in_place=in_place_preferred(image, scheme, inverse=True))
         
-        # PNG formatı kullanarak kayıpsız sıkıştırma
-        result, encoded_img = cv2.imencode('.png', decrypted_image)
-        if result:
-            return encoded_img.tobytes()
-        else:
-            raise ValueError("Şifre çözme işlemi başarısız")
+        # Varsayılan olarak PNG formatı kullanarak kayıpsız sıkıştırma
+        return encode_image(decrypted_image, output_format, compression)
             
     except Exception as e:
         raise Exception(f"Şifre çözme işlemi sırasında hata oluştu: {e}")
 
+def _resolve_scheme(operation, scheme, image_data):
+    """Çözmede şemayı gerektiğinde şifreli resimden okur (bkz. kodlama.decrypt_scheme)."""
+    if operation == DECRYPT:
+        return decrypt_scheme(scheme, lambda: read_scheme(image_data))
+    return scheme
+
+@contextmanager
+def _upload_buffer(image_file):
+    """Yüklenen dosyayı bytes kopyası oluşturmadan okunabilir bir tampon olarak verir."""
+    stream = image_file.stream
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    try:
+        fileno = stream.fileno() if size >= MMAP_THRESHOLD else None
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fileno = None
+    if fileno is None:
+        yield stream.read()
+        return
+
+    stream.flush()
+    mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    try:
+        yield mapped
+    finally:
+        try:
+            mapped.close()
+        except BufferError:
+            # Tampona bakan bir görünüm kaldıysa çöp toplayıcı kapatır
+            pass
+
+def _result_chunks(operation, image, key, output_format, compression, scheme=None):
+    """İşlenmiş resmi kodlandıkça parça parça üreten bir üreteç döndürür."""
+    if compute_pool.enabled:
+        return compute_pool.stream(operation, image, key, output_format, compression,
+                                   scheme=scheme)
+
+    if operation == ENCRYPT:
+        bands = iter_scrambled_rows(image, key, scheme=scheme)
+        return iter_encoded(bands, image.shape, image.dtype, output_format, compression,
+                            scheme=scheme)
+    # Çözülmüş (doğal) resimlerde PNG satır filtreleri çıktıyı küçültür
+    bands = iter_unscrambled_rows(image, key, scheme=scheme)
+    return iter_encoded(bands, image.shape, image.dtype, output_format, compression,
+                        adaptive_filter=True)
+
+class _ClosingStream:
+    """Parça üretecini sarar; tükendiğinde veya kapatıldığında kaynakları bırakır.
+
+    Sunucu yanıt bitince (istemci erken ayrılsa da) close() çağırır; üreteç
+    hiç başlamamış olsa bile havuzdaki yer böylece geri verilir. Gönderilen
+    baytlar ve yanıtın gönderilme süresi ölçümlere eklenir.
+    """
+
+    def __init__(self, chunks, resources):
+        self._chunks = chunks
+        self._resources = resources
+        self._started = time.perf_counter()
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            chunk = next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+        olcumler.BYTES_OUT.inc(len(chunk))
+        return chunk
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._chunks.close()
+        finally:
+            self._resources.close()
+            olcumler.observe_stage('response', time.perf_counter() - self._started)
+
+def _profiled_chunks(operation, buffer, key, output_format, compression, scheme=None):
+    """İsteği bu süreçte, baştan sona profilleyerek işler.
+
+    Profil tek bir akışta alınsın diye süreç havuzu ve şerit şerit kodlama
+    kullanılmaz; sonuç bellekte kodlanıp parçalar halinde gönderilir.
+    """
+    with profilleme.profile(operation) as details:
+        image = decode_image(buffer)
+        if image is None:
+            raise ValueError("Resim yüklenemedi")
+        details.update({
+            'shape': list(image.shape),
+            'dtype': str(image.dtype),
+            'output_format': output_format,
+            'compression': compression,
+            'algorithm': (scheme or kapsayici.LEGACY_SCHEME).algorithm,
+        })
+        encoded = _process_image(operation, image, key, output_format, compression, scheme)
+        details['output_bytes'] = len(encoded)
+    return (encoded[start:start + STREAM_CHUNK_SIZE]
+            for start in range(0, len(encoded), STREAM_CHUNK_SIZE))
+
+def open_result_stream(operation, image_file, key, output_format, compression, profile=False,
+                       scheme=None):
+    """Yüklemeyi işler ve kodlanmış sonucu parça parça üreten bir üreteç döndürür.
+
+    Havuzdaki yer ve yükleme tamponu üreteç tükenene (veya kapatılana)
+    kadar tutulur. İlk parça burada üretilir ki hatalar yanıt başlamadan
+    JSON olarak döndürülebilsin. Havuzdaki yer yükleme okunduktan sonra,
+    çözmeden hemen önce ayrılır; havuz doluysa PoolBusyError fırlatır.
+    profile True ise istek profilleme modunda işlenir (bkz. profilleme).
+    scheme, karıştırma şemasıdır; çözmede verilmezse yüklemeden okunur.
+    """
+    resources = ExitStack()
+    try:
+        resources.enter_context(compute_pool.reserve())
+        try:
+            buffer = resources.enter_context(_upload_buffer(image_file))
+            scheme = _resolve_scheme(operation, scheme, buffer)
+            if profile:
+                chunks = _profiled_chunks(operation, buffer, key, output_format, compression,
+                                          scheme)
+            else:
+                image = decode_image(buffer)
+                if image is None:
+                    raise ValueError("Resim yüklenemedi")
+                chunks = _result_chunks(operation, image, key, output_format, compression, scheme)
+            first_chunk = next(chunks, b'')
+        except Exception as e:
+            action = 'Şifreleme' if operation == ENCRYPT else 'Şifre çözme'
+            raise Exception(f"{action} işlemi sırasında hata oluştu: {e}")
+    except BaseException:
+        resources.close()
+        raise
+
+    def generate():
+        yield first_chunk
+        yield from chunks
+
+    return _ClosingStream(generate(), resources)
+
+def content_disposition(download_name, output_format):
+    """İndirme adı ve çıktı biçimine göre Content-Disposition başlığı."""
+    return f'attachment; filename={download_name}{OUTPUT_FORMATS[output_format][0]}'
+
+def _streaming_response(operation, image_file, key, output_format, compression, download_name,
+                        scheme=None):
+    """Sonucu kodlandıkça parça parça gönderen Flask yanıtını döndürür."""
+    profile = profilleme.requested(request.headers.get(profilleme.HEADER))
+    chunks = open_result_stream(operation, image_file, key, output_format, compression, profile,
+                                scheme)
+    return Response(
+        chunks,
+        mimetype=OUTPUT_FORMATS[output_format][1],
+        headers={'Content-Disposition': content_disposition(download_name, output_format)}
+    )
+
 @app.route('/api/encrypt', methods=['POST'])
 def encrypt_endpoint():
     """Resim şifreleme API endpoint'i."""
@@ -116,25 +363,30 @@ def encrypt_endpoint():
             return jsonify({'error': 'Şifre boş olamaz'}), 400
         
         # Dosya türünü kontrol et
-        allowed_extensions = {'.jpg', '.jpeg', '.png', '.bmp'}
         file_ext = os.path.splitext(image_file.filename)[1].lower()
-        if file_ext not in allowed_extensions:
+        if file_ext not in ALLOWED_EXTENSIONS:
             return jsonify({'error': 'Desteklenmeyen dosya türü'}), 400
         
-        # Resim verisini oku
-        image_data = image_file.read()
+        # Çıktı biçimi ve sıkıştırma seviyesi (varsayılan: PNG)
+        try:
+            output_format, compression = validate_output_options(
+                request.form.get('format'), request.form.get('compression')
+            )
+            scheme = validate_scheme_options(
+                request.form.get('mode'), request.form.get('tile_size')
+            )
+            check_scheme_format(scheme, output_format)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Şifreleme işlemini gerçekleştir
-        encrypted_data = encrypt_image_data(image_data, password)
-        
-        # Şifrelenmiş resmi döndür
-        return send_file(
-            io.BytesIO(encrypted_data),
-            mimetype='image/png',
-            as_attachment=True,
-            download_name='sifreli_resim.png'
-        )
+        # Sonuç kodlandıkça parça parça gönderilir
+        return _streaming_response(ENCRYPT, image_file, password, output_format, compression,
+                                   'sifreli_resim', scheme)
         
+    except PoolBusyError as e:
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = '1'
+        return response, 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -159,35 +411,351 @@ def decrypt_endpoint():
             return jsonify({'error': 'Şifre boş olamaz'}), 400
         
         # Dosya türünü kontrol et
-        allowed_extensions = {'.jpg', '.jpeg', '.png', '.bmp'}
         file_ext = os.path.splitext(image_file.filename)[1].lower()
-        if file_ext not in allowed_extensions:
+        if file_ext not in ALLOWED_EXTENSIONS:
             return jsonify({'error': 'Desteklenmeyen dosya türü'}), 400
         
-        # Resim verisini oku
-        image_data = image_file.read()
+        # Çıktı biçimi ve sıkıştırma seviyesi (varsayılan: PNG)
+        try:
+            output_format, compression = validate_output_options(
+                request.form.get('format'), request.form.get('compression')
+            )
+            scheme = validate_scheme_options(
+                request.form.get('mode'), request.form.get('tile_size')
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Şifre çözme işlemini gerçekleştir
-        decrypted_data = decrypt_image_data(image_data, password)
+        # Sonuç kodlandıkça parça parça gönderilir
+        return _streaming_response(DECRYPT, image_file, password, output_format, compression,
+                                   'cozulmus_resim', scheme)
         
-        # Çözülmüş resmi döndür
-        return send_file(
-            io.BytesIO(decrypted_data),
-            mimetype='image/png',
-            as_attachment=True,
-            download_name='cozulmus_resim.png'
+    except PoolBusyError as e:
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _process_image_data(operation, image_data, key, output_format, compression, scheme=None):
+    """Tek bir resmi bu süreçte çözer, işler ve kodlar (toplu istekler için)."""
+    scheme = _resolve_scheme(operation, scheme, image_data)
+    image = decode_image(image_data)
+    if image is None:
+        raise ValueError("Resim yüklenemedi")
+    return _process_image(operation, image, key, output_format, compression, scheme)
+
+def _process_image(operation, image, key, output_format, compression, scheme=None):
+    # Bellek sınırını aşacak resimler (çözülmüş ve yazılabilirse) yerinde taşınır
+    in_place = in_place_preferred(image, scheme, inverse=operation == DECRYPT)
+    if operation == ENCRYPT:
+        result_image = scramble_pixels(image, key, scheme=scheme, in_place=in_place)
+        return encode_image(result_image, output_format, compression, scheme)
+    result_image = unscramble_pixels(image, key, scheme=scheme, in_place=in_place)
+    return encode_image(result_image, output_format, compression)
+
+def _is_image_name(name):
+    return os.path.splitext(name)[1].lower() in ALLOWED_EXTENSIONS
+
+def _detach_upload(upload):
+    """Yüklenen dosyanın, istek kapatıldıktan sonra da okunabilen bir kopyasını açar.
+
+    Flask istek bitince yüklemeleri kapatır; akış halindeki toplu yanıt ise
+    dosyaları ondan sonra okur. Dosya tanıtıcısı çoğaltılır, veri kopyalanmaz.
+    """
+    stream = upload.stream
+    stream.seek(0)
+    try:
+        return os.fdopen(os.dup(stream.fileno()), 'rb')
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return io.BytesIO(stream.read())
+
+def _batch_inputs(uploads):
+    """(ad, dosya) çiftlerinden sırayla (ad, veri, hata) üçlüleri üretir.
+
+    Arşivler açılmadan belleğe alınmaz; üyeler tek tek okunur.
+    """
+    for name, stream in uploads:
+        try:
+            if name.lower().endswith('.zip'):
+                with zipfile.ZipFile(stream) as archive:
+                    for info in archive.infolist():
+                        if not info.is_dir() and _is_image_name(info.filename):
+                            yield info.filename, archive.read(info), None
+            elif name.lower().endswith(ARCHIVE_EXTENSIONS):
+                with tarfile.open(fileobj=stream, mode='r|*') as archive:
+                    for member in archive:
+                        if member.isfile() and _is_image_name(member.name):
+                            yield member.name, archive.extractfile(member).read(), None
+            elif _is_image_name(name):
+                yield name, stream.read(), None
+            else:
+                yield name, None, 'Desteklenmeyen dosya türü'
+        except (zipfile.BadZipFile, tarfile.TarError, EOFError) as e:
+            yield name, None, f"Arşiv okunamadı: {e}"
+
+def _archive_member_sizes(name, stream):
+    """Arşivdeki dosyaların açılmış boyutlarını, verilerini çıkarmadan üretir."""
+    lowered = name.lower()
+    if lowered.endswith('.zip'):
+        # Boyutlar merkez dizinden okunur; zipfile üyeleri bu boyutta keser
+        with zipfile.ZipFile(stream) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    yield info.file_size
+    elif lowered.endswith(ARCHIVE_EXTENSIONS):
+        with tarfile.open(fileobj=stream, mode='r|*') as archive:
+            for member in archive:
+                if member.isfile():
+                    yield member.size
+
+def _check_archive_limits(uploads):
+    """Arşivler ARCHIVE_SIZE_LIMIT veya ARCHIVE_MEMBER_LIMIT'i aşıyorsa ArchiveTooLargeError fırlatır.
+
+    Sınır aşılır aşılmaz taramayı bırakır; okunamayan arşivler burada
+    atlanır, hataları _batch_inputs'ta raporlanır. Akışlar başa sarılır.
+    """
+    total_size = members = 0
+    for name, stream in uploads:
+        try:
+            for size in _archive_member_sizes(name, stream):
+                total_size += size
+                members += 1
+                if total_size > ARCHIVE_SIZE_LIMIT:
+                    raise ArchiveTooLargeError(
+                        f"Arşivlerin açılmış boyutu {ARCHIVE_SIZE_LIMIT // (1024 * 1024)} MB sınırını aşıyor"
+                    )
+                if members > ARCHIVE_MEMBER_LIMIT:
+                    raise ArchiveTooLargeError(
+                        f"Arşivlerdeki dosya sayısı {ARCHIVE_MEMBER_LIMIT} sınırını aşıyor"
+                    )
+        except (zipfile.BadZipFile, tarfile.TarError, EOFError):
+            pass
+        finally:
+            stream.seek(0)
+
+def _batch_output_name(name, extension, used_names):
+    """Arşivdeki göreli yolu korur, güvensiz parçaları atar, çakışmaları numaralar."""
+    parts = [part for part in posixpath.normpath(name.replace('\\', '/')).split('/')
+             if part not in ('', '.', '..')]
+    stem = posixpath.splitext('/'.join(parts) or 'resim')[0]
+    candidate = stem + extension
+    counter = 2
+    while candidate in used_names:
+        candidate = f"{stem} ({counter}){extension}"
+        counter += 1
+    used_names.add(candidate)
+    return candidate
+
+def _batch_chunks(operation, uploads, key, output_format, compression, scheme=None):
+    """Resimleri eşzamanlı işler ve sonuçları ZIP olarak parça parça üretir.
+
+    Sonuçlar girdi sırasıyla yazılır; aynı anda en fazla 2 * BATCH_WORKERS
+    resim bellekte bekler. Hatalı dosyalar isteği durdurmaz, ZIP'in sonuna
+    eklenen sonuc.json dosyasında listelenir.
+    """
+    extension = OUTPUT_FORMATS[output_format][0]
+    sink = ChunkSink()
+    used_names = set()
+    summary = {'processed': 0, 'failed': []}
+    pending = deque()
+
+    def finish(name, future):
+        try:
+            data = future.result()
+        except Exception as e:
+            summary['failed'].append({'name': name, 'error': str(e)})
+            return
+        # Karıştırılmış pikseller sıkışmadığından ZIP içinde tekrar sıkıştırılmaz
+        archive.writestr(_batch_output_name(name, extension, used_names), data)
+        summary['processed'] += 1
+
+    with ThreadPoolExecutor(BATCH_WORKERS) as executor, \
+            zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as archive:
+        for name, data, error in _batch_inputs(uploads):
+            if error is not None:
+                summary['failed'].append({'name': name, 'error': error})
+                continue
+            pending.append((name, executor.submit(
+                _process_image_data, operation, data, key, output_format, compression, scheme
+            )))
+            if len(pending) >= 2 * BATCH_WORKERS:
+                finish(*pending.popleft())
+                yield sink.take()
+        while pending:
+            finish(*pending.popleft())
+            yield sink.take()
+        archive.writestr(BATCH_SUMMARY_NAME, json.dumps(summary, ensure_ascii=False, indent=2))
+    yield sink.take()
+
+def _batch_endpoint(operation, download_name):
+    """Toplu şifreleme/çözme endpoint'lerinin ortak gövdesi."""
+    try:
+        uploads = [upload for upload in request.files.getlist('images') if upload.filename]
+        if not uploads:
+            return jsonify({'error': 'Resim dosyası bulunamadı'}), 400
+
+        if 'password' not in request.form:
+            return jsonify({'error': 'Şifre bulunamadı'}), 400
+
+        password = request.form['password']
+        if not password.strip():
+            return jsonify({'error': 'Şifre boş olamaz'}), 400
+
+        try:
+            output_format, compression = validate_output_options(
+                request.form.get('format'), request.form.get('compression')
+            )
+            scheme = validate_scheme_options(
+                request.form.get('mode'), request.form.get('tile_size')
+            )
+            if operation == ENCRYPT:
+                check_scheme_format(scheme, output_format)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # Toplu istek havuzda tek bir yer tutar
+        resources = ExitStack()
+        resources.enter_context(compute_pool.reserve())
+        try:
+            uploads = [(upload.filename, resources.enter_context(_detach_upload(upload)))
+                       for upload in uploads]
+            _check_archive_limits(uploads)
+        except BaseException:
+            resources.close()
+            raise
+        chunks = _ClosingStream(
+            _batch_chunks(operation, uploads, password, output_format, compression, scheme),
+            resources
         )
-        
+        return Response(
+            chunks,
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename={download_name}.zip'}
+        )
+
+    except ArchiveTooLargeError as e:
+        return jsonify({'error': str(e)}), 413
+    except PoolBusyError as e:
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/encrypt/batch', methods=['POST'])
+def encrypt_batch_endpoint():
+    """Birden çok resmi (veya ZIP/TAR arşivini) tek istekte şifreler, ZIP döndürür."""
+    return _batch_endpoint(ENCRYPT, 'sifreli_resimler')
+
+@app.route('/api/decrypt/batch', methods=['POST'])
+def decrypt_batch_endpoint():
+    """Birden çok şifreli resmi (veya ZIP/TAR arşivini) tek istekte çözer, ZIP döndürür."""
+    return _batch_endpoint(DECRYPT, 'cozulmus_resimler')
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job_endpoint():
+    """İşi kuyruğa ekler ve hemen iş kimliğini döndürür (büyük resimler için)."""
+    try:
+        if 'image' not in request.files:
+            return jsonify({'error': 'Resim dosyası bulunamadı'}), 400
+
+        if 'password' not in request.form:
+            return jsonify({'error': 'Şifre bulunamadı'}), 400
+
+        image_file = request.files['image']
+        password = request.form['password']
+        operation = request.form.get('operation', ENCRYPT)
+
+        if image_file.filename == '':
+            return jsonify({'error': 'Dosya seçilmedi'}), 400
+
+        if not password.strip():
+            return jsonify({'error': 'Şifre boş olamaz'}), 400
+
+        if operation not in (ENCRYPT, DECRYPT):
+            return jsonify({'error': f'Desteklenmeyen işlem: {operation}'}), 400
+
+        file_ext = os.path.splitext(image_file.filename)[1].lower()
+        if file_ext not in ALLOWED_EXTENSIONS:
+            return jsonify({'error': 'Desteklenmeyen dosya türü'}), 400
+
+        try:
+            output_format, compression = validate_output_options(
+                request.form.get('format'), request.form.get('compression')
+            )
+            scheme = validate_scheme_options(
+                request.form.get('mode'), request.form.get('tile_size')
+            )
+            if operation == ENCRYPT:
+                check_scheme_format(scheme, output_format)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        job = job_queue.submit(operation, image_file.stream, image_file.filename, password,
+                               output_format, compression, scheme)
+        response = jsonify(_job_status(job))
+        response.headers['Location'] = f'/api/jobs/{job.id}'
+        return response, 202
+
+    except QueueFullError as e:
+        return _busy_response(e, retry_after=5)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _job_status(job):
+    status = job.to_dict()
+    status['status_url'] = f'/api/jobs/{job.id}'
+    status['result_url'] = f'/api/jobs/{job.id}/result' if job.status == DONE else None
+    return status
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status_endpoint(job_id):
+    """İşin durumunu ve ilerlemesini (taşınan piksel yüzdesi) döndürür."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'İş bulunamadı veya süresi doldu'}), 404
+    return jsonify(_job_status(job))
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def job_result_endpoint(job_id):
+    """Biten işin sonucunu diskten akış halinde gönderir."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'İş bulunamadı veya süresi doldu'}), 404
+    if job.status != DONE:
+        return jsonify({'error': 'İş henüz tamamlanmadı', 'status': job.status}), 409
+    prefix = 'sifreli_resim' if job.operation == ENCRYPT else 'cozulmus_resim'
+    extension, mimetype = OUTPUT_FORMATS[job.output_format]
+    return send_file(job.result_path, mimetype=mimetype, as_attachment=True,
+                     download_name=prefix + extension)
+
+def health_status():
+    """Sağlık kontrolü yanıtının içeriği (Flask ve ASGI sunucuları ortak)."""
+    return {
+        'status': 'healthy',
+        'message': 'Görüntü şifreleme servisi çalışıyor',
+        'permutation_cache': permutation_cache.stats(),
+        'compute_pool': {
+            'workers': compute_pool.workers,
+            'max_pending': compute_pool.max_pending
+        },
+        'job_queue': {
+            'workers': job_queue.workers,
+            'max_queued': job_queue.max_queued,
+            'ttl_seconds': job_queue.ttl
+        }
+    }
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Sunucu durumu kontrolü."""
-    return jsonify({
-        'status': 'healthy',
-        'message': 'Görüntü şifreleme servisi çalışıyor'
-    })
+    return jsonify(health_status())
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus metin biçiminde metrikler."""
+    return Response(olcumler.registry.render(), content_type=olcumler.CONTENT_TYPE)
 
 @app.errorhandler(404)
 def not_found(error):
@@ -0,0 +1,75 @@
+import threading
+import time
+
+
+class TaskCancelled(Exception):
+    """Arka plan işi kullanıcı tarafından iptal edildiğinde fırlatılır."""
+
+
+class BackgroundTask:
+    """Masaüstü uygulamalarında uzun işleri arka plan iş parçacığında çalıştırır.
+
+    work(task) ayrı bir iş parçacığında çağrılır; Flet olay geri çağırması
+    hemen döner ve pencere donmaz. İş, task.progress'i karıştırma motorunun
+    progress parametresine verir ve aşamalar arasında task.check() çağırır;
+    iptal edilmişse ikisi de TaskCancelled fırlatır ve iş yarıda kalır.
+
+    Geri çağırmalar iş parçacığından çağrılır (Flet'te page.update() iş
+    parçacıklarından güvenle çağrılabilir). on_progress en fazla
+    min_interval saniyede bir, 0-1 arası oranla çağrılır.
+    """
+
+    def __init__(self, work, on_progress=None, on_done=None, on_error=None, on_cancel=None,
+                 min_interval=0.1):
+        self._work = work
+        self._on_progress = on_progress
+        self._on_done = on_done
+        self._on_error = on_error
+        self._on_cancel = on_cancel
+        self.min_interval = min_interval
+        self._cancelled = threading.Event()
+        self._last_report = 0.0
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='arka-plan', daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def cancel(self):
+        """İşin bir sonraki ilerleme bildiriminde durmasını ister."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def check(self):
+        """İş iptal edildiyse TaskCancelled fırlatır."""
+        if self._cancelled.is_set():
+            raise TaskCancelled()
+
+    def progress(self, done, total):
+        """Karıştırma motorunun progress(taşınan, toplam) geri çağırması."""
+        self.check()
+        now = time.monotonic()
+        if self._on_progress is not None and (done >= total or now - self._last_report >= self.min_interval):
+            self._last_report = now
+            self._on_progress(done / total if total else 1.0)
+
+    def _run(self):
+        try:
+            result = self._work(self)
+        except TaskCancelled:
+            if self._on_cancel is not None:
+                self._on_cancel()
+        except Exception as e:
+            if self._on_error is not None:
+                self._on_error(e)
+        else:
+            if self._on_done is not None:
+                self._on_done(result)
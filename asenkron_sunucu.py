@@ -0,0 +1,301 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.datastructures import FileStorage
+from werkzeug.http import parse_options_header
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+
+import olcumler
+import profilleme
+from app import (ALLOWED_EXTENSIONS, compute_pool, content_disposition, health_status,
+                 open_result_stream, reserve_upload)
+from islem_havuzu import DECRYPT, ENCRYPT, PoolBusyError
+from kodlama import (OUTPUT_FORMATS, check_scheme_format, validate_output_options,
+                     validate_scheme_options)
+
+# Yüklenen dosyalar bu boyuta kadar bellekte, sonrası geçici dosyada tutulur
+SPOOL_MAX_SIZE = 500 * 1024
+# Dosya dışındaki form alanları (şifre, biçim...) için üst sınır
+MAX_FIELD_SIZE = 64 * 1024
+
+ROUTES = {
+    '/api/encrypt': (ENCRYPT, 'sifreli_resim'),
+    '/api/decrypt': (DECRYPT, 'cozulmus_resim'),
+}
+
+_CORS_HEADERS = [(b'access-control-allow-origin', b'*')]
+
+# Yüklemeler olay döngüsünde okunur; yalnızca piksel işleri ve kodlama bu
+# iş parçacıklarına verilir. Aynı anda en fazla kuyruk sınırı kadar iş
+# kabul edildiğinden o kadar iş parçacığı yeter.
+executor = ThreadPoolExecutor(max_workers=compute_pool.max_pending or None,
+                              thread_name_prefix='sifreleme')
+
+
+class BadRequest(Exception):
+    """İstek gövdesi okunamadığında fırlatılır."""
+
+
+class ClientDisconnected(Exception):
+    """İstemci gövde tamamlanmadan bağlantıyı kapattığında fırlatılır."""
+
+
+async def _send_json(send, status, payload, headers=()):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii')),
+            *_CORS_HEADERS, *headers,
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def read_form(scope, receive):
+    """multipart/form-data gövdesini olay döngüsünde parça parça okur.
+
+    Dosya alanları SpooledTemporaryFile'a yazılır, böylece yavaş bir
+    yükleme ne bir iş parçacığını ne de resmin tamamı kadar belleği tutar.
+    (alanlar, dosyalar) döndürür; dosyalar FileStorage nesneleridir.
+    """
+    headers = dict(scope['headers'])
+    mimetype, options = parse_options_header(headers.get(b'content-type', b'').decode('latin-1'))
+    if mimetype != 'multipart/form-data' or not options.get('boundary'):
+        raise BadRequest("multipart/form-data bekleniyor")
+
+    decoder = MultipartDecoder(options['boundary'].encode('latin-1'))
+    fields, files = {}, {}
+    current = None
+    more_body = True
+    try:
+        while True:
+            event = decoder.next_event()
+            if isinstance(event, NeedData):
+                if not more_body:
+                    raise BadRequest("Form verisi eksik")
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    raise ClientDisconnected()
+                more_body = message.get('more_body', False)
+                body = message.get('body', b'')
+                olcumler.BYTES_IN.inc(len(body))
+                decoder.receive_data(body)
+                if not more_body:
+                    decoder.receive_data(None)
+            elif isinstance(event, Field):
+                current = fields[event.name] = bytearray()
+            elif isinstance(event, File):
+                current = tempfile.SpooledTemporaryFile(SPOOL_MAX_SIZE, mode='w+b')
+                files[event.name] = FileStorage(current, filename=event.filename,
+                                                name=event.name, headers=event.headers)
+            elif isinstance(event, Data):
+                if isinstance(current, bytearray):
+                    current += event.data
+                    if len(current) > MAX_FIELD_SIZE:
+                        raise BadRequest("Form alanı çok büyük")
+                else:
+                    current.write(event.data)
+            elif isinstance(event, Epilogue):
+                break
+    except ValueError as e:
+        # Bozuk multipart gövdesi
+        _close_files(files)
+        raise BadRequest(str(e))
+    except BaseException:
+        _close_files(files)
+        raise
+
+    for image_file in files.values():
+        image_file.stream.seek(0)
+    return {name: value.decode('utf-8', 'replace') for name, value in fields.items()}, files
+
+
+def _close_files(files):
+    for image_file in files.values():
+        image_file.close()
+
+
+def _validate(fields, files):
+    """Flask endpoint'leriyle aynı kontroller; hata mesajı veya None döndürür."""
+    if 'image' not in files:
+        return 'Resim dosyası bulunamadı'
+    if 'password' not in fields:
+        return 'Şifre bulunamadı'
+    if not files['image'].filename:
+        return 'Dosya seçilmedi'
+    if not fields['password'].strip():
+        return 'Şifre boş olamaz'
+    if os.path.splitext(files['image'].filename)[1].lower() not in ALLOWED_EXTENSIONS:
+        return 'Desteklenmeyen dosya türü'
+    return None
+
+
+async def _send_busy(send, error):
+    await _send_json(send, 503, {'error': str(error)}, [(b'retry-after', b'1')])
+
+
+async def _process(scope, receive, send, operation, download_name):
+    # Havuz doluysa yüklemeyi okumadan reddet; havuzdaki yer ancak gövde
+    # okunduktan sonra open_result_stream'de ayrılır
+    try:
+        compute_pool.check_capacity()
+        with reserve_upload(), olcumler.stage('upload'):
+            fields, files = await read_form(scope, receive)
+    except PoolBusyError as e:
+        await _send_busy(send, e)
+        return
+    except BadRequest as e:
+        await _send_json(send, 400, {'error': str(e)})
+        return
+    except ClientDisconnected:
+        return
+
+    try:
+        error = _validate(fields, files)
+        if error is None:
+            try:
+                output_format, compression = validate_output_options(
+                    fields.get('format'), fields.get('compression')
+                )
+                scheme = validate_scheme_options(fields.get('mode'), fields.get('tile_size'))
+                if operation == ENCRYPT:
+                    check_scheme_format(scheme, output_format)
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            await _send_json(send, 400, {'error': error})
+            return
+
+        headers = dict(scope['headers'])
+        profile = profilleme.requested(
+            headers.get(profilleme.HEADER.lower().encode('ascii'), b'').decode('latin-1')
+        )
+        loop = asyncio.get_running_loop()
+        try:
+            chunks = await loop.run_in_executor(
+                executor, open_result_stream, operation, files['image'],
+                fields['password'], output_format, compression, profile, scheme
+            )
+        except PoolBusyError as e:
+            await _send_busy(send, e)
+            return
+        except Exception as e:
+            await _send_json(send, 500, {'error': str(e)})
+            return
+
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', OUTPUT_FORMATS[output_format][1].encode('ascii')),
+                    (b'content-disposition',
+                     content_disposition(download_name, output_format).encode('latin-1')),
+                    *_CORS_HEADERS,
+                ],
+            })
+            # Her parça iş parçacığında üretilir, olay döngüsünde gönderilir
+            while True:
+                chunk = await loop.run_in_executor(executor, next, chunks, None)
+                if chunk is None:
+                    break
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            chunks.close()
+    finally:
+        _close_files(files)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            executor.shutdown(wait=False)
+            compute_pool.shutdown()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    """/api/encrypt, /api/decrypt, /api/health ve /api/metrics için ASGI uygulaması.
+
+    Flask uygulamasıyla aynı sözleşmeyi sunar: aynı form alanları, aynı
+    JSON hata mesajları ve durum kodları, aynı akış halinde yanıtlar.
+    """
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    path, method = scope['path'], scope['method']
+    endpoint = path if path in ROUTES or path in ('/api/health', '/api/metrics') else 'bilinmiyor'
+    status = {}
+
+    async def send_with_metrics(message):
+        if message['type'] == 'http.response.start':
+            status['code'] = message['status']
+        await send(message)
+
+    started = time.perf_counter()
+    olcumler.IN_FLIGHT.inc()
+    try:
+        await _route(scope, receive, send_with_metrics, path, method)
+    finally:
+        olcumler.IN_FLIGHT.dec()
+        olcumler.REQUESTS.inc(endpoint=endpoint, status=status.get('code', 500))
+        olcumler.REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+
+
+async def _route(scope, receive, send, path, method):
+    if method == 'OPTIONS':
+        await send({
+            'type': 'http.response.start',
+            'status': 204,
+            'headers': [
+                *_CORS_HEADERS,
+                (b'access-control-allow-methods', b'GET, POST, OPTIONS'),
+                (b'access-control-allow-headers', b'*'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': b''})
+    elif path == '/api/health' and method == 'GET':
+        await _send_json(send, 200, health_status())
+    elif path == '/api/metrics' and method == 'GET':
+        body = olcumler.registry.render().encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(b'content-type', olcumler.CONTENT_TYPE.encode('ascii')), *_CORS_HEADERS],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+    elif path in ROUTES and method == 'POST':
+        await _process(scope, receive, send, *ROUTES[path])
+    elif path in ROUTES or path in ('/api/health', '/api/metrics'):
+        await _send_json(send, 405, {'error': 'Bu yöntem desteklenmiyor'})
+    else:
+        await _send_json(send, 404, {'error': 'Endpoint bulunamadı'})
+
+
+def main():
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("ASGI sunucusu için uvicorn gerekli: pip install uvicorn")
+
+    print("🚀 Görüntü Şifreleme ASGI Sunucusu Başlatılıyor...")
+    print("🔧 API Durumu: http://localhost:8080/api/health")
+    uvicorn.run(application, host='127.0.0.1', port=8080)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+"""Karıştırma motoru için tekrarlanabilir performans ölçümü.
+
+Her resim boyutu ayrı bir süreçte ölçülür (tepe RSS değerleri karışmasın
+diye). Aşamalar ayrı ayrı zamanlanır: PNG çözme, permütasyon üretimi,
+piksel taşıma (şifreleme/çözme) ve PNG kodlama. Çözme ve kodlama API'nin
+kullandığı kodlama fonksiyonlarıyla ölçülür: decode_image, süreç havuzu ve
+masaüstü yolundaki encode_image ile akış halindeki yanıtların iter_encoded'ı
+(seviye 1, RLE). Sonuçlar JSON olarak kaydedilir ve iki ölçüm eşik
+değerine göre karşılaştırılabilir.
+
+olcekle komutu piksel taşımanın iş parçacığı sayısıyla (1..N çekirdek)
+nasıl ölçeklendiğini ölçer; her iş parçacığı sayısı ayrı bir süreçte
+SIFRELEME_TASIMA_IS_PARCACIGI ile çalıştırılır.
+
+Kullanım:
+    python benchmarks/motor.py calistir --boyutlar 0.1 1 12 --cikti once.json
+    python benchmarks/motor.py calistir --cikti sonra.json
+    python benchmarks/motor.py karsilastir once.json sonra.json --esik 10
+    python benchmarks/motor.py olcekle --mp 100 --is-parcaciklari 1 2 4 8
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_SIZES = [0.1, 1, 12, 24, 50, 100]
+STAGES = ['decode', 'permutation', 'scramble', 'unscramble', 'encode', 'encode_stream']
+KEY = 'benchmark-anahtari'
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta bayt cinsindendir
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def synthetic_image(megapixels, seed=0):
+    """4:3 oranlı, fotoğrafa benzer (düzgün geçişli, gürültülü) bir resim üretir."""
+    import numpy as np
+
+    width = max(1, int(round((megapixels * 1e6 * 4 / 3) ** 0.5)))
+    height = max(1, int(round(megapixels * 1e6 / width)))
+    rng = np.random.default_rng(seed)
+    row = (np.arange(width) * 255 // width).astype(np.uint8)
+    column = (np.arange(height) * 255 // height).astype(np.uint8)
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:, :, 0] = row
+    image[:, :, 1] = column[:, None]
+    image[:, :, 2] = row // 2 + column[:, None] // 2
+    image += rng.integers(0, 8, image.shape, dtype=np.uint8)
+    return image
+
+
+def _timed(function, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def measure_size(megapixels, repeat):
+    """Tek bir boyut için aşama sürelerini (saniye, ortanca) ölçer."""
+    import numpy as np
+    from karistirma import derive_seed, generate_permutation, permutation_cache
+    from karistirma import scramble_pixels, unscramble_pixels
+    from kodlama import decode_image, encode_image, iter_encoded
+
+    image = synthetic_image(megapixels)
+    upload = encode_image(image)
+    pixel_count = image.shape[0] * image.shape[1]
+    seed = derive_seed(KEY)
+
+    timings = {}
+    timings['decode'], decoded = _timed(lambda: decode_image(upload), repeat)
+    timings['permutation'], _ = _timed(lambda: generate_permutation(seed, pixel_count), repeat)
+
+    # Piksel taşıma, permütasyon önbellekteyken ölçülür
+    permutation_cache.get(seed, pixel_count)
+    permutation_cache.get(seed, pixel_count, inverse=True)
+    timings['scramble'], encrypted = _timed(lambda: scramble_pixels(decoded, KEY), repeat)
+    timings['unscramble'], decrypted = _timed(lambda: unscramble_pixels(encrypted, KEY), repeat)
+    timings['encode'], _ = _timed(lambda: encode_image(encrypted), repeat)
+    timings['encode_stream'], _ = _timed(
+        lambda: b''.join(iter_encoded([encrypted], encrypted.shape, encrypted.dtype)), repeat
+    )
+
+    if not np.array_equal(decrypted, decoded):
+        raise RuntimeError("Şifre çözme sonucu orijinal resimle aynı değil")
+
+    return {
+        'megapixels': megapixels,
+        'shape': list(image.shape),
+        'seconds': timings,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def measure_threads(megapixels, repeat):
+    """Geçerli iş parçacığı sayısıyla şifreleme ve çözme taşıma sürelerini ölçer."""
+    import karistirma
+    from karistirma import derive_seed, permutation_cache, scramble_pixels, unscramble_pixels
+
+    image = synthetic_image(megapixels)
+    pixel_count = image.shape[0] * image.shape[1]
+    seed = derive_seed(KEY)
+    permutation_cache.get(seed, pixel_count)
+    permutation_cache.get(seed, pixel_count, inverse=True)
+    # İlk çağrı iş parçacığı havuzunu açar; ölçüme katılmaz
+    encrypted = scramble_pixels(image, KEY)
+
+    timings = {}
+    timings['scramble'], encrypted = _timed(lambda: scramble_pixels(image, KEY), repeat)
+    timings['unscramble'], _ = _timed(lambda: unscramble_pixels(encrypted, KEY), repeat)
+    return {'threads': karistirma.MOVE_THREADS, 'megapixels': megapixels, 'seconds': timings}
+
+
+def default_thread_counts():
+    """1, 2, 4, ... ve çekirdek sayısı."""
+    cpu_count = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 < cpu_count:
+        counts.append(counts[-1] * 2)
+    if cpu_count > 1:
+        counts.append(cpu_count)
+    return counts
+
+
+def run_scaling(megapixels, thread_counts, repeat):
+    """Her iş parçacığı sayısını ayrı bir süreçte ölçer; hızlanmayı 1'e göre yazdırır."""
+    results = []
+    for threads in thread_counts:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '_olcek',
+             '--mp', str(megapixels), '--tekrar', str(repeat)],
+            capture_output=True, text=True,
+            env=dict(os.environ, SIFRELEME_TASIMA_IS_PARCACIGI=str(threads))
+        )
+        if completed.returncode != 0:
+            raise SystemExit(completed.stderr)
+        result = json.loads(completed.stdout)
+        results.append(result)
+        base = results[0]['seconds']
+        print(f"{threads:>3} iş parçacığı: " + ', '.join(
+            f"{stage} {result['seconds'][stage] * 1000:.0f} ms "
+            f"(x{base[stage] / result['seconds'][stage]:.2f})"
+            for stage in ('scramble', 'unscramble')
+        ), file=sys.stderr)
+
+    return {
+        'revision': _git_revision(),
+        'cpu_count': os.cpu_count(),
+        'megapixels': megapixels,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, repeat):
+    """Her boyutu ayrı bir süreçte ölçer ve sonuç sözlüğünü döndürür."""
+    import cv2
+    import numpy as np
+
+    results = []
+    for megapixels in sizes:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '_tek',
+             '--mp', str(megapixels), '--tekrar', str(repeat)],
+            capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            raise SystemExit(completed.stderr)
+        result = json.loads(completed.stdout)
+        results.append(result)
+        stages = ', '.join(f"{stage} {result['seconds'][stage] * 1000:.0f} ms" for stage in STAGES
+                           if stage in result['seconds'])
+        print(f"{megapixels:>6} MP: {stages}, tepe RSS {result['peak_rss_mb']:.0f} MB", file=sys.stderr)
+
+    return {
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold_percent):
+    """İki ölçümü karşılaştırır; eşiği aşan gerilemelerin listesini döndürür."""
+    baseline_by_size = {result['megapixels']: result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        previous = baseline_by_size.get(result['megapixels'])
+        if previous is None:
+            continue
+        metrics = [(stage, previous['seconds'][stage], result['seconds'][stage]) for stage in STAGES
+                   if stage in previous['seconds'] and stage in result['seconds']]
+        if previous.get('peak_rss_mb') and result.get('peak_rss_mb'):
+            metrics.append(('peak_rss_mb', previous['peak_rss_mb'], result['peak_rss_mb']))
+        for metric, before, after in metrics:
+            change = (after - before) / before * 100 if before else 0.0
+            marker = ' <-- GERİLEME' if change > threshold_percent else ''
+            print(f"{result['megapixels']:>6} MP {metric:<12} {before:>10.4f} -> {after:>10.4f} "
+                  f"({change:+.1f}%){marker}")
+            if marker:
+                regressions.append((result['megapixels'], metric, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Karıştırma motoru performans ölçümü")
+    commands = parser.add_subparsers(dest='komut', required=True)
+
+    run_parser = commands.add_parser('calistir', help="Ölçümü çalıştır ve JSON kaydet")
+    run_parser.add_argument('--boyutlar', type=float, nargs='+', default=DEFAULT_SIZES,
+                            help="Megapiksel cinsinden resim boyutları")
+    run_parser.add_argument('--tekrar', type=int, default=3)
+    run_parser.add_argument('--cikti', default=None, help="Sonuç JSON dosyası (varsayılan: stdout)")
+
+    compare_parser = commands.add_parser('karsilastir', help="İki ölçümü karşılaştır")
+    compare_parser.add_argument('once')
+    compare_parser.add_argument('sonra')
+    compare_parser.add_argument('--esik', type=float, default=10.0,
+                                help="İzin verilen en fazla yavaşlama/bellek artışı (yüzde)")
+
+    scaling_parser = commands.add_parser('olcekle',
+                                         help="Piksel taşımanın iş parçacığı sayısıyla ölçeklenmesi")
+    scaling_parser.add_argument('--mp', type=float, default=24, help="Resim boyutu (megapiksel)")
+    scaling_parser.add_argument('--is-parcaciklari', type=int, nargs='+', default=None,
+                                help="Denenecek iş parçacığı sayıları (varsayılan: 1, 2, 4 ... CPU sayısı)")
+    scaling_parser.add_argument('--tekrar', type=int, default=3)
+    scaling_parser.add_argument('--cikti', default=None, help="Sonuç JSON dosyası (varsayılan: stdout)")
+
+    single_parser = commands.add_parser('_tek')
+    single_parser.add_argument('--mp', type=float, required=True)
+    single_parser.add_argument('--tekrar', type=int, default=3)
+
+    threads_parser = commands.add_parser('_olcek')
+    threads_parser.add_argument('--mp', type=float, required=True)
+    threads_parser.add_argument('--tekrar', type=int, default=3)
+
+    args = parser.parse_args()
+    if args.komut == '_tek':
+        json.dump(measure_size(args.mp, args.tekrar), sys.stdout)
+    elif args.komut == '_olcek':
+        json.dump(measure_threads(args.mp, args.tekrar), sys.stdout)
+    elif args.komut == 'olcekle':
+        report = json.dumps(run_scaling(args.mp, args.is_parcaciklari or default_thread_counts(),
+                                        args.tekrar), indent=2)
+        if args.cikti:
+            with open(args.cikti, 'w', encoding='utf-8') as f:
+                f.write(report)
+        else:
+            print(report)
+    elif args.komut == 'calistir':
+        report = json.dumps(run(args.boyutlar, args.tekrar), indent=2)
+        if args.cikti:
+            with open(args.cikti, 'w', encoding='utf-8') as f:
+                f.write(report)
+        else:
+            print(report)
+    else:
+        with open(args.once, encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.sonra, encoding='utf-8') as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.esik)
+        if regressions:
+            print(f"{len(regressions)} ölçüm %{args.esik:g} eşiğini aştı", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
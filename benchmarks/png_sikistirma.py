@@ -0,0 +1,73 @@
+"""Web yolunda çıktı biçimi / PNG sıkıştırma seviyesinin gecikme ve boyut etkisi.
+
+Kullanım:
+    python benchmarks/png_sikistirma.py --genislik 4000 --yukseklik 3000 --tekrar 3
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+# Ölçüm istek iş parçacığında yapılsın diye süreç havuzu kapatılır
+os.environ.setdefault('SIFRELEME_ISCI_SAYISI', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from app import app
+
+VARIANTS = [
+    ('png (varsayılan)', {}),
+    ('png seviye 0', {'compression': '0'}),
+    ('png seviye 1', {'compression': '1'}),
+    ('png seviye 6', {'compression': '6'}),
+    ('png seviye 9', {'compression': '9'}),
+    ('tiff', {'format': 'tiff'}),
+    ('npy', {'format': 'npy'}),
+]
+
+
+def synthetic_photo(width, height):
+    """Fotoğrafa benzer (düzgün geçişli, biraz gürültülü) bir resim üretir."""
+    yy, xx = np.mgrid[0:height, 0:width]
+    image = np.stack([xx * 255 // width, yy * 255 // height, (xx + yy) % 256], axis=-1)
+    noise = np.random.default_rng(0).integers(0, 8, image.shape)
+    return (image + noise).clip(0, 255).astype(np.uint8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--genislik', type=int, default=2000)
+    parser.add_argument('--yukseklik', type=int, default=1500)
+    parser.add_argument('--tekrar', type=int, default=3)
+    args = parser.parse_args()
+
+    upload = cv2.imencode('.png', synthetic_photo(args.genislik, args.yukseklik))[1].tobytes()
+    client = app.test_client()
+
+    def post(fields):
+        data = {'image': (io.BytesIO(upload), 'resim.png'), 'password': 'benchmark'}
+        data.update(fields)
+        response = client.post('/api/encrypt', data=data)
+        if response.status_code != 200:
+            raise SystemExit(response.get_json())
+        return response.data
+
+    post({})  # permütasyonu önbelleğe al
+
+    print(f"{args.genislik}x{args.yukseklik}, giriş {len(upload) / 1e6:.1f} MB")
+    print(f"{'biçim':<18}{'ortanca (ms)':>14}{'çıktı (MB)':>12}")
+    for name, fields in VARIANTS:
+        timings = []
+        for _ in range(args.tekrar):
+            started = time.perf_counter()
+            output = post(fields)
+            timings.append(time.perf_counter() - started)
+        print(f"{name:<18}{statistics.median(timings) * 1000:>14.1f}{len(output) / 1e6:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
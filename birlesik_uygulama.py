@@ -1,104 +1,56 @@
 import flet as ft
-import base64
-import cv2
-import numpy as np
-import random
 import pathlib
 import os
+import time
 import locale
 
+from arka_plan import BackgroundTask, TaskCancelled
+from resim_oturumu import ImageSession
+from kodlama import PICKER_INPUT_EXTENSIONS, PICKER_OUTPUT_EXTENSIONS
+from toplu_islem import collect_inputs, process_inputs
+
 # Sistem yerel ayarlarını kullan
 locale.setlocale(locale.LC_ALL, '')
 
-def encrypt_image(input_image_path, output_image_path, key):
-    """Resmi şifreler."""
-    # Türkçe karakterleri içeren dosya yollarını düzgün işlemek için
-    try:
-        # OpenCV'nin Türkçe karakter sorunu için alternatif yöntem
-        with open(input_image_path, 'rb') as f:
-            image_data = f.read()
-        
-        # Numpy array'e çevir ve OpenCV ile decode et
-        nparr = np.frombuffer(image_data, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        if image is None:
-            print(f"Hata: Resim yüklenemedi: {input_image_path}")
-            return False
-            
-        height, width, channels = image.shape
-
-        key_bytes = [ord(k) for k in key]
-        seed = sum(key_bytes)
-        random.seed(seed)
+def encrypt_image(session, output_image_path, key, task=None):
+    """Oturumdaki resmi şifreler ve kaydeder.
 
-        pixel_indices = list(range(height * width))
-        random.shuffle(pixel_indices)
-
-        flat_image = image.reshape(-1, 3)
-        encrypted_flat_image = np.zeros_like(flat_image)
-
-        for i in range(len(pixel_indices)):
-            encrypted_flat_image[i] = flat_image[pixel_indices[i]]
-
-        encrypted_image = encrypted_flat_image.reshape(height, width, channels)
+    task (BackgroundTask) verilirse piksel taşıma ilerlemesi bildirilir;
+    iş iptal edilirse dosya yazılmadan TaskCancelled fırlatılır.
+    """
+    try:
+        # Pikseller seçim sırasında bir kez çözüldü; dosya tekrar okunmaz
+        session.encrypt(key, task.progress if task is not None else None)
+        if task is not None:
+            task.check()
         
         # Türkçe karakterli dosya yolları için alternatif kaydetme yöntemi
-        # PNG formatı kullanarak kayıpsız sıkıştırma
-        result, encoded_img = cv2.imencode('.png', encrypted_image)
-        if result:
-            with open(output_image_path, 'wb') as f:
-                f.write(encoded_img.tobytes())
-            return True
-        else:
-            return False
+        # Uzantıya göre PNG (varsayılan, kayıpsız) veya .gsif kapsayıcısı
+        session.save(output_image_path)
+        return True
+    except TaskCancelled:
+        raise
     except Exception as e:
         print(f"Şifreleme işlemi sırasında hata oluştu: {e}")
         return False
 
-def decrypt_image(input_image_path, output_image_path, key):
-    """Şifrelenmiş resmi çözer."""
-    # Türkçe karakterleri içeren dosya yollarını düzgün işlemek için
-    try:
-        # OpenCV'nin Türkçe karakter sorunu için alternatif yöntem
-        with open(input_image_path, 'rb') as f:
-            image_data = f.read()
-        
-        # Numpy array'e çevir ve OpenCV ile decode et
-        nparr = np.frombuffer(image_data, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        if image is None:
-            print(f"Hata: Resim yüklenemedi: {input_image_path}")
-            return False
-            
-        height, width, channels = image.shape
-
-        key_bytes = [ord(k) for k in key]
-        seed = sum(key_bytes)
-        random.seed(seed)
-
-        pixel_indices = list(range(height * width))
-        random.shuffle(pixel_indices)  # Önemli: Şifreleme ile aynı sırayı elde etmek için tekrar çağırıyoruz
-
-        flat_image = image.reshape(-1, 3)
-        decrypted_flat_image = np.zeros_like(flat_image)
+def decrypt_image(session, output_image_path, key, task=None):
+    """Oturumdaki şifrelenmiş resmi çözer ve kaydeder.
 
-        # Düzeltme:
-        for i, pos in enumerate(pixel_indices):
-            decrypted_flat_image[pos] = flat_image[i]
-
-        decrypted_image = decrypted_flat_image.reshape(height, width, channels)
+    task, encrypt_image'daki gibidir.
+    """
+    try:
+        # Pikseller seçim sırasında bir kez çözüldü; dosya tekrar okunmaz
+        session.decrypt(key, task.progress if task is not None else None)
+        if task is not None:
+            task.check()
         
         # Türkçe karakterli dosya yolları için alternatif kaydetme yöntemi
-        # PNG formatı kullanarak kayıpsız sıkıştırma
-        result, encoded_img = cv2.imencode('.png', decrypted_image)
-        if result:
-            with open(output_image_path, 'wb') as f:
-                f.write(encoded_img.tobytes())
-            return True
-        else:
-            return False
+        # Uzantıya göre PNG (varsayılan, kayıpsız) veya .gsif kapsayıcısı
+        session.save(output_image_path)
+        return True
+    except TaskCancelled:
+        raise
     except Exception as e:
         print(f"Şifre çözme işlemi sırasında hata oluştu: {e}")
         return False
@@ -126,30 +78,76 @@ def main(page: ft.Page):
     decrypt_input_image = ft.Ref[ft.Image]()
     decrypt_output_image = ft.Ref[ft.Image]()
     
+    # İlerleme göstergeleri ve işlem sırasında kilitlenen düğmeler
+    encrypt_progress = ft.Ref[ft.ProgressBar]()
+    encrypt_status = ft.Ref[ft.Text]()
+    encrypt_cancel_button = ft.Ref[ft.ElevatedButton]()
+    encrypt_busy_buttons = [ft.Ref[ft.ElevatedButton]() for _ in range(4)]
+    decrypt_progress = ft.Ref[ft.ProgressBar]()
+    decrypt_status = ft.Ref[ft.Text]()
+    decrypt_cancel_button = ft.Ref[ft.ElevatedButton]()
+    decrypt_busy_buttons = [ft.Ref[ft.ElevatedButton]() for _ in range(4)]
+    
+    # Seçilen resimlerin bellek içi oturumları (dosya bir kez okunur)
+    encrypt_session = None
+    decrypt_session = None
+    # Çalışan arka plan işleri (iptal için)
+    encrypt_task = None
+    decrypt_task = None
+    
+    # Toplu işlem sekmesi için değişkenler
+    queue_list = ft.Ref[ft.Column]()
+    queue_operation = ft.Ref[ft.RadioGroup]()
+    queue_output_dir = ft.Ref[ft.Text]()
+    queue_key_field = ft.Ref[ft.TextField]()
+    queue_progress = ft.Ref[ft.ProgressBar]()
+    queue_status = ft.Ref[ft.Text]()
+    queue_cancel_button = ft.Ref[ft.ElevatedButton]()
+    queue_busy_buttons = [ft.Ref[ft.ElevatedButton]() for _ in range(5)]
+    # Kuyruktaki dosyalar: girdi yolu -> (göreli çıktı adı, durum metni)
+    queue_items = {}
+    queue_task = None
+    
     # Global FilePicker'lar
     encrypt_input_picker = ft.FilePicker()
     encrypt_output_picker = ft.FilePicker()
     decrypt_input_picker = ft.FilePicker()
     decrypt_output_picker = ft.FilePicker()
+    queue_files_picker = ft.FilePicker()
+    queue_folder_picker = ft.FilePicker()
+    queue_output_picker = ft.FilePicker()
     
     # FilePicker'ları overlay'e ekle
     page.overlay.extend([encrypt_input_picker, encrypt_output_picker, decrypt_input_picker, decrypt_output_picker])
+    page.overlay.extend([queue_files_picker, queue_folder_picker, queue_output_picker])
     page.update()
 
     def pick_encrypt_input_file(e):
         """Şifrelenecek dosya seçimi."""
         def file_picker_result(e: ft.FilePickerResultEvent):
+            nonlocal encrypt_session
             if e.files and len(e.files) > 0 and e.files[0].path:
                 file_path = e.files[0].path
                 encrypt_input_file.current.value = file_path
                 # Şifrelenmiş görseli temizle
                 encrypt_output_image.current.src = None
-                # Görseli göster (base64 ile)
-                with open(file_path, "rb") as f:
-                    encoded_string = base64.b64encode(f.read()).decode("utf-8")
-                encrypt_input_image.current.src = None
-                encrypt_input_image.current.src_base64 = encoded_string
+                encrypt_output_image.current.src_base64 = None
+                try:
+                    # Resim bir kez okunup çözülür; önizleme aynı baytlardan
+                    encrypt_session = ImageSession(file_path)
+                    encrypt_input_image.current.src = None
+                    encrypt_input_image.current.src_base64 = encrypt_session.source_preview()
+                except Exception as ex:
+                    encrypt_session = None
+                    encrypt_input_image.current.src_base64 = None
+                    snack_bar = ft.SnackBar(
+                        content=ft.Text(f"Görsel yüklenirken hata oluştu: {ex}"),
+                        bgcolor=ft.colors.RED
+                    )
+                    page.overlay.append(snack_bar)
+                    snack_bar.open = True
             else:
+                encrypt_session = None
                 encrypt_input_file.current.value = "Henüz dosya seçilmedi"
                 encrypt_input_image.current.src = None
                 encrypt_input_image.current.src_base64 = None
@@ -158,7 +156,7 @@ def main(page: ft.Page):
         encrypt_input_picker.on_result = file_picker_result
         encrypt_input_picker.pick_files(
             dialog_title="Şifrelenecek resmi seçin",
-            allowed_extensions=["jpg", "jpeg", "png", "bmp"]
+            allowed_extensions=PICKER_INPUT_EXTENSIONS
         )
 
     def pick_encrypt_output_file(e):
@@ -171,23 +169,27 @@ def main(page: ft.Page):
         encrypt_output_picker.on_result = file_picker_result
         encrypt_output_picker.save_file(
             dialog_title="Şifrelenmiş resmi kaydet",
-            file_name="sifreli_resim.png"
+            file_name="sifreli_resim.png",
+            allowed_extensions=PICKER_OUTPUT_EXTENSIONS
         )
 
     def pick_decrypt_input_file(e):
         """Çözülecek dosya seçimi."""
         def file_picker_result(e: ft.FilePickerResultEvent):
+            nonlocal decrypt_session
             if e.files and e.files[0].path:
                 file_path = e.files[0].path
                 decrypt_input_file.current.value = file_path
                 decrypt_output_image.current.src = None
                 decrypt_output_image.current.src_base64 = None
                 try:
-                    with open(file_path, "rb") as f:
-                        encoded_string = base64.b64encode(f.read()).decode("utf-8")
+                    # .gsif kapsayıcıları çözülmeden eşlenir, önizleme PNG'ye çevrilir
+                    decrypt_session = ImageSession(file_path)
                     decrypt_input_image.current.src = None
-                    decrypt_input_image.current.src_base64 = encoded_string
+                    decrypt_input_image.current.src_base64 = decrypt_session.source_preview()
                 except Exception as ex:
+                    decrypt_session = None
+                    decrypt_input_image.current.src_base64 = None
                     snack_bar = ft.SnackBar(
                         content=ft.Text(f"Görsel yüklenirken hata oluştu: {ex}"),
                         bgcolor=ft.colors.RED
@@ -195,6 +197,7 @@ def main(page: ft.Page):
                     page.overlay.append(snack_bar)
                     snack_bar.open = True
             else:
+                decrypt_session = None
                 decrypt_input_file.current.value = "Henüz dosya seçilmedi"
                 decrypt_input_image.current.src = None
                 decrypt_input_image.current.src_base64 = None
@@ -203,7 +206,7 @@ def main(page: ft.Page):
         decrypt_input_picker.on_result = file_picker_result
         decrypt_input_picker.pick_files(
             dialog_title="Çözülecek şifrelenmiş resmi seçin",
-            allowed_extensions=["jpg", "jpeg", "png", "bmp"]
+            allowed_extensions=PICKER_INPUT_EXTENSIONS
         )
 
     def pick_decrypt_output_file(e):
@@ -216,12 +219,43 @@ def main(page: ft.Page):
         decrypt_output_picker.on_result = file_picker_result
         decrypt_output_picker.save_file(
             dialog_title="Çözülmüş resmi kaydet",
-            file_name="cozulmus_resim.png"
+            file_name="cozulmus_resim.png",
+            allowed_extensions=PICKER_OUTPUT_EXTENSIONS
         )
 
+    def set_busy(progress, status, cancel_button, buttons, busy):
+        """Sekmeyi işlem sürerken/bittiğinde günceller."""
+        for button in buttons:
+            button.current.disabled = busy
+        cancel_button.current.visible = busy
+        cancel_button.current.disabled = False
+        progress.current.visible = busy
+        # Permütasyon hazırlanırken ilerleme belirsizdir
+        progress.current.value = None
+        status.current.value = "Hazırlanıyor..." if busy else ""
+
+    def report_progress(progress, status, fraction):
+        """Piksel taşıma ilerlemesini gösterir."""
+        if fraction >= 1:
+            progress.current.value = None
+            status.current.value = "Kaydediliyor..."
+        else:
+            progress.current.value = fraction
+            status.current.value = f"Pikseller taşınıyor... %{fraction * 100:.0f}"
+        page.update()
+
+    def cancel_task(task, status, cancel_button):
+        """Çalışan işi iptal eder; iş bir sonraki dilimde durur."""
+        if task is not None and task.running:
+            task.cancel()
+            cancel_button.current.disabled = True
+            status.current.value = "İptal ediliyor..."
+            page.update()
+
     def save_encrypted_image(e):
         """Şifrelenmiş resmi kaydet."""
-        if not encrypt_input_file.current.value or encrypt_input_file.current.value == "Henüz dosya seçilmedi":
+        nonlocal encrypt_task
+        if encrypt_session is None:
             snack_bar = ft.SnackBar(
                 content=ft.Text("Lütfen şifrelenecek bir resim seçin!"),
                 bgcolor=ft.colors.RED
@@ -251,37 +285,73 @@ def main(page: ft.Page):
             page.update()
             return
         
-        success = encrypt_image(
-            encrypt_input_file.current.value,
-            encrypt_output_file.current.value,
-            encrypt_key_field.current.value
-        )
-        
-        if success:
-            # Şifrelenmiş görseli göster (base64 ile)
-            output_path = encrypt_output_file.current.value
-            with open(output_path, "rb") as f:
-                encoded_string = base64.b64encode(f.read()).decode("utf-8")
-            encrypt_output_image.current.src = None
-            encrypt_output_image.current.src_base64 = encoded_string
+        session = encrypt_session
+        output_path = encrypt_output_file.current.value
+        key = encrypt_key_field.current.value
+        busy_controls = (encrypt_progress, encrypt_status, encrypt_cancel_button, encrypt_busy_buttons)
+
+        def work(task):
+            success = encrypt_image(session, output_path, key, task)
+            # Önizleme de arka planda hazırlanır
+            return success, session.result_preview() if success else None
+
+        def on_done(result):
+            success, preview = result
+            set_busy(*busy_controls, False)
+            if success:
+                # Şifrelenmiş görseli göster (kaydedilen dosya tekrar okunmaz)
+                encrypt_output_image.current.src = None
+                encrypt_output_image.current.src_base64 = preview
+                
+                snack_bar = ft.SnackBar(
+                    content=ft.Text("Resim başarıyla şifrelendi!"),
+                    bgcolor=ft.colors.GREEN
+                )
+            else:
+                snack_bar = ft.SnackBar(
+                    content=ft.Text("Resim şifreleme işlemi başarısız oldu!"),
+                    bgcolor=ft.colors.RED
+                )
             
+            page.overlay.append(snack_bar)
+            snack_bar.open = True
+            page.update()
+
+        def on_cancel():
+            set_busy(*busy_controls, False)
             snack_bar = ft.SnackBar(
-                content=ft.Text("Resim başarıyla şifrelendi!"),
-                bgcolor=ft.colors.GREEN
+                content=ft.Text("İşlem iptal edildi, dosya kaydedilmedi."),
+                bgcolor=ft.colors.ORANGE
             )
-        else:
+            page.overlay.append(snack_bar)
+            snack_bar.open = True
+            page.update()
+
+        def on_error(ex):
+            set_busy(*busy_controls, False)
             snack_bar = ft.SnackBar(
-                content=ft.Text("Resim şifreleme işlemi başarısız oldu!"),
+                content=ft.Text(f"İşlem sırasında hata oluştu: {ex}"),
                 bgcolor=ft.colors.RED
             )
-        
-        page.overlay.append(snack_bar)
-        snack_bar.open = True
+            page.overlay.append(snack_bar)
+            snack_bar.open = True
+            page.update()
+
+        # İşlem arka planda yapılır; pencere donmaz
+        set_busy(*busy_controls, True)
         page.update()
+        encrypt_task = BackgroundTask(
+            work,
+            on_progress=lambda fraction: report_progress(encrypt_progress, encrypt_status, fraction),
+            on_done=on_done,
+            on_error=on_error,
+            on_cancel=on_cancel
+        ).start()
 
     def save_decrypted_image(e):
         """Çözülmüş resmi kaydet."""
-        if not decrypt_input_file.current.value or decrypt_input_file.current.value == "Henüz dosya seçilmedi":
+        nonlocal decrypt_task
+        if decrypt_session is None:
             snack_bar = ft.SnackBar(
                 content=ft.Text("Lütfen çözülecek bir resim seçin!"),
                 bgcolor=ft.colors.RED
@@ -311,36 +381,73 @@ def main(page: ft.Page):
             page.update()
             return
         
-        success = decrypt_image(
-            decrypt_input_file.current.value,
-            decrypt_output_file.current.value,
-            decrypt_key_field.current.value
-        )
-        
-        if success:
-            # Çözülen görseli göster (base64 ile)
-            output_path = decrypt_output_file.current.value
-            with open(output_path, "rb") as f:
-                encoded_string = base64.b64encode(f.read()).decode("utf-8")
-            decrypt_output_image.current.src = None
-            decrypt_output_image.current.src_base64 = encoded_string
+        session = decrypt_session
+        output_path = decrypt_output_file.current.value
+        key = decrypt_key_field.current.value
+        busy_controls = (decrypt_progress, decrypt_status, decrypt_cancel_button, decrypt_busy_buttons)
+
+        def work(task):
+            success = decrypt_image(session, output_path, key, task)
+            # Önizleme de arka planda hazırlanır
+            return success, session.result_preview() if success else None
+
+        def on_done(result):
+            success, preview = result
+            set_busy(*busy_controls, False)
+            if success:
+                # Çözülen görseli göster (kaydedilen dosya tekrar okunmaz)
+                decrypt_output_image.current.src = None
+                decrypt_output_image.current.src_base64 = preview
+                
+                snack_bar = ft.SnackBar(
+                    content=ft.Text("Resim başarıyla çözüldü!"),
+                    bgcolor=ft.colors.GREEN
+                )
+            else:
+                snack_bar = ft.SnackBar(
+                    content=ft.Text("Resim çözme işlemi başarısız oldu!"),
+                    bgcolor=ft.colors.RED
+                )
             
+            page.overlay.append(snack_bar)
+            snack_bar.open = True
+            page.update()
+
+        def on_cancel():
+            set_busy(*busy_controls, False)
             snack_bar = ft.SnackBar(
-                content=ft.Text("Resim başarıyla çözüldü!"),
-                bgcolor=ft.colors.GREEN
+                content=ft.Text("İşlem iptal edildi, dosya kaydedilmedi."),
+                bgcolor=ft.colors.ORANGE
             )
-        else:
+            page.overlay.append(snack_bar)
+            snack_bar.open = True
+            page.update()
+
+        def on_error(ex):
+            set_busy(*busy_controls, False)
             snack_bar = ft.SnackBar(
-                content=ft.Text("Resim çözme işlemi başarısız oldu!"),
+                content=ft.Text(f"İşlem sırasında hata oluştu: {ex}"),
                 bgcolor=ft.colors.RED
             )
-        
-        page.overlay.append(snack_bar)
-        snack_bar.open = True
+            page.overlay.append(snack_bar)
+            snack_bar.open = True
+            page.update()
+
+        # İşlem arka planda yapılır; pencere donmaz
+        set_busy(*busy_controls, True)
         page.update()
+        decrypt_task = BackgroundTask(
+            work,
+            on_progress=lambda fraction: report_progress(decrypt_progress, decrypt_status, fraction),
+            on_done=on_done,
+            on_error=on_error,
+            on_cancel=on_cancel
+        ).start()
 
     def reset_encrypt_tab(e):
         """Şifreleme sekmesini sıfırla."""
+        nonlocal encrypt_session
+        encrypt_session = None
         encrypt_input_file.current.value = "Henüz dosya seçilmedi"
         encrypt_output_file.current.value = "Henüz konum seçilmedi"
         encrypt_key_field.current.value = ""
@@ -352,6 +459,8 @@ def main(page: ft.Page):
 
     def reset_decrypt_tab(e):
         """Şifre çözme sekmesini sıfırla."""
+        nonlocal decrypt_session
+        decrypt_session = None
         decrypt_input_file.current.value = "Henüz dosya seçilmedi"
         decrypt_output_file.current.value = "Henüz konum seçilmedi"
         decrypt_key_field.current.value = ""
@@ -361,6 +470,168 @@ def main(page: ft.Page):
         decrypt_output_image.current.src_base64 = None
         page.update()
 
+    def add_to_queue(inputs):
+        """(girdi yolu, göreli çıktı adı) çiftlerini kuyruğa ekler."""
+        for input_path, relative_name in inputs:
+            if input_path in queue_items:
+                continue
+            status = ft.Text("Sırada", size=12, color="#666666", width=160)
+            queue_items[input_path] = (relative_name, status)
+            queue_list.current.controls.append(
+                ft.Row([
+                    ft.Text(relative_name, size=12, expand=True, tooltip=input_path),
+                    status
+                ])
+            )
+        queue_status.current.value = f"Kuyrukta {len(queue_items)} dosya"
+        page.update()
+
+    def pick_queue_files(e):
+        """Kuyruğa birden çok dosya ekler."""
+        def file_picker_result(e: ft.FilePickerResultEvent):
+            if e.files:
+                add_to_queue(collect_inputs([f.path for f in e.files if f.path]))
+        
+        queue_files_picker.on_result = file_picker_result
+        queue_files_picker.pick_files(
+            dialog_title="Kuyruğa eklenecek resimleri seçin",
+            allow_multiple=True,
+            allowed_extensions=PICKER_INPUT_EXTENSIONS
+        )
+
+    def pick_queue_folder(e):
+        """Bir klasördeki (alt klasörler dahil) tüm resimleri kuyruğa ekler."""
+        def file_picker_result(e: ft.FilePickerResultEvent):
+            if e.path:
+                add_to_queue(collect_inputs([e.path]))
+        
+        queue_folder_picker.on_result = file_picker_result
+        queue_folder_picker.get_directory_path(dialog_title="Kuyruğa eklenecek klasörü seçin")
+
+    def pick_queue_output_dir(e):
+        """Çıktı klasörü seçimi."""
+        def file_picker_result(e: ft.FilePickerResultEvent):
+            if e.path:
+                queue_output_dir.current.value = e.path
+                page.update()
+        
+        queue_output_picker.on_result = file_picker_result
+        queue_output_picker.get_directory_path(dialog_title="Çıktı klasörünü seçin")
+
+    def start_queue(e):
+        """Kuyruktaki dosyaları tüm CPU çekirdeklerinde işler."""
+        nonlocal queue_task
+        if not queue_items:
+            message = "Lütfen kuyruğa resim ekleyin!"
+        elif not queue_output_dir.current.value or queue_output_dir.current.value == "Henüz konum seçilmedi":
+            message = "Lütfen çıktı klasörü seçin!"
+        elif not queue_key_field.current.value:
+            message = "Lütfen bir şifre girin!"
+        else:
+            message = None
+        if message is not None:
+            snack_bar = ft.SnackBar(
+                content=ft.Text(message),
+                bgcolor=ft.colors.RED
+            )
+            page.overlay.append(snack_bar)
+            snack_bar.open = True
+            page.update()
+            return
+
+        operation = queue_operation.current.value
+        output_dir = queue_output_dir.current.value
+        key = queue_key_field.current.value
+        inputs = [(input_path, relative_name) for input_path, (relative_name, _) in queue_items.items()]
+        busy_controls = (queue_progress, queue_status, queue_cancel_button, queue_busy_buttons)
+        counts = {'finished': 0, 'processed': 0, 'pixels': 0}
+        started = time.perf_counter()
+
+        for _, status in queue_items.values():
+            status.value = "Sırada"
+            status.color = "#666666"
+
+        def on_file(result):
+            # İşçi süreçlerden gelen sonuçlar arka plan iş parçacığında işlenir
+            status = queue_items[result['input']][1]
+            if 'error' in result:
+                status.value = f"Hata: {result['error']}"
+                status.color = ft.colors.RED
+            elif result.get('skipped'):
+                status.value = "Atlandı (güncel)"
+                status.color = "#666666"
+            else:
+                status.value = "Tamamlandı"
+                status.color = ft.colors.GREEN
+                counts['processed'] += 1
+                counts['pixels'] += result['pixels']
+            counts['finished'] += 1
+            elapsed = time.perf_counter() - started
+            queue_progress.current.value = counts['finished'] / len(inputs)
+            queue_status.current.value = (
+                f"{counts['finished']}/{len(inputs)} dosya, "
+                f"{counts['processed'] / elapsed:.2f} resim/sn, "
+                f"{counts['pixels'] / 1e6 / elapsed:.2f} MP/sn"
+            )
+            page.update()
+
+        def work(task):
+            return process_inputs(
+                operation, inputs, output_dir, key,
+                log=lambda message: None,
+                on_file=on_file,
+                cancelled=lambda: task.cancelled
+            )
+
+        def on_done(summary):
+            set_busy(*busy_controls, False)
+            queue_status.current.value = (
+                f"{summary['processed']} işlendi, {summary['skipped']} atlandı, "
+                f"{summary['failed']} hatalı ({summary['seconds']:.2f} sn) - "
+                f"{summary['images_per_second']:.2f} resim/sn, "
+                f"{summary['megapixels_per_second']:.2f} MP/sn"
+            )
+            if summary['cancelled']:
+                snack_bar = ft.SnackBar(
+                    content=ft.Text("Toplu işlem iptal edildi; başlamamış dosyalar işlenmedi."),
+                    bgcolor=ft.colors.ORANGE
+                )
+            elif summary['failed']:
+                snack_bar = ft.SnackBar(
+                    content=ft.Text(f"{summary['failed']} dosya işlenemedi!"),
+                    bgcolor=ft.colors.RED
+                )
+            else:
+                snack_bar = ft.SnackBar(
+                    content=ft.Text("Toplu işlem tamamlandı!"),
+                    bgcolor=ft.colors.GREEN
+                )
+            page.overlay.append(snack_bar)
+            snack_bar.open = True
+            page.update()
+
+        def on_error(ex):
+            set_busy(*busy_controls, False)
+            snack_bar = ft.SnackBar(
+                content=ft.Text(f"Toplu işlem sırasında hata oluştu: {ex}"),
+                bgcolor=ft.colors.RED
+            )
+            page.overlay.append(snack_bar)
+            snack_bar.open = True
+            page.update()
+
+        set_busy(*busy_controls, True)
+        queue_progress.current.value = 0
+        page.update()
+        queue_task = BackgroundTask(work, on_done=on_done, on_error=on_error).start()
+
+    def clear_queue(e):
+        """Kuyruğu boşaltır."""
+        queue_items.clear()
+        queue_list.current.controls.clear()
+        queue_status.current.value = ""
+        page.update()
+
     # Şifreleme sekmesi
     encrypt_tab = ft.Tab(
         text="Şifreleme",
@@ -384,6 +655,7 @@ def main(page: ft.Page):
                             ft.Text("Şifrelenecek Resim:", size=16, weight="w500"),
                             ft.ElevatedButton(
                                 "Resim Seç",
+                                ref=encrypt_busy_buttons[0],
                                 icon=ft.icons.FOLDER_OPEN,
                                 on_click=pick_encrypt_input_file,
                                 color=ft.colors.RED
@@ -398,6 +670,7 @@ def main(page: ft.Page):
                             ft.Text("Kayıt Konumu:", size=16, weight="w500"),
                             ft.ElevatedButton(
                                 "Kayıt Yeri Seç",
+                                ref=encrypt_busy_buttons[1],
                                 icon=ft.icons.SAVE,
                                 on_click=pick_encrypt_output_file,
                                 color=ft.colors.RED
@@ -420,6 +693,7 @@ def main(page: ft.Page):
                             
                             ft.ElevatedButton(
                                 "Şifrele",
+                                ref=encrypt_busy_buttons[2],
                                 icon=ft.icons.LOCK,
                                 on_click=save_encrypted_image,
                                 style=ft.ButtonStyle(
@@ -430,6 +704,7 @@ def main(page: ft.Page):
                             
                             ft.ElevatedButton(
                                 "Sıfırla",
+                                ref=encrypt_busy_buttons[3],
                                 icon=ft.icons.REFRESH,
                                 on_click=reset_encrypt_tab,
                                 style=ft.ButtonStyle(
@@ -437,6 +712,27 @@ def main(page: ft.Page):
                                     color=ft.colors.WHITE
                                 )
                             ),
+                            
+                            # İşlem sürerken görünen ilerleme ve iptal
+                            ft.ProgressBar(
+                                ref=encrypt_progress,
+                                width=300,
+                                color=ft.colors.RED,
+                                visible=False
+                            ),
+                            ft.Text(
+                                ref=encrypt_status,
+                                value="",
+                                size=12,
+                                color="#666666"
+                            ),
+                            ft.ElevatedButton(
+                                "İptal",
+                                ref=encrypt_cancel_button,
+                                icon=ft.icons.CANCEL,
+                                on_click=lambda e: cancel_task(encrypt_task, encrypt_status, encrypt_cancel_button),
+                                visible=False
+                            ),
                         ], spacing=10),
                         width=350,
                         padding=10
@@ -514,6 +810,7 @@ def main(page: ft.Page):
                             ft.Text("Çözülecek Şifrelenmiş Resim:", size=16, weight="w500"),
                             ft.ElevatedButton(
                                 "Resim Seç",
+                                ref=decrypt_busy_buttons[0],
                                 icon=ft.icons.FOLDER_OPEN,
                                 on_click=pick_decrypt_input_file,
                                 color=ft.colors.GREEN
@@ -528,6 +825,7 @@ def main(page: ft.Page):
                             ft.Text("Kayıt Konumu:", size=16, weight="w500"),
                             ft.ElevatedButton(
                                 "Kayıt Yeri Seç",
+                                ref=decrypt_busy_buttons[1],
                                 icon=ft.icons.SAVE,
                                 on_click=pick_decrypt_output_file,
                                 color=ft.colors.GREEN
@@ -550,6 +848,7 @@ def main(page: ft.Page):
                             
                             ft.ElevatedButton(
                                 "Şifreyi Çöz",
+                                ref=decrypt_busy_buttons[2],
                                 icon=ft.icons.LOCK_OPEN,
                                 on_click=save_decrypted_image,
                                 style=ft.ButtonStyle(
@@ -560,6 +859,7 @@ def main(page: ft.Page):
                             
                             ft.ElevatedButton(
                                 "Sıfırla",
+                                ref=decrypt_busy_buttons[3],
                                 icon=ft.icons.REFRESH,
                                 on_click=reset_decrypt_tab,
                                 style=ft.ButtonStyle(
@@ -567,6 +867,27 @@ def main(page: ft.Page):
                                     color=ft.colors.WHITE
                                 )
                             ),
+                            
+                            # İşlem sürerken görünen ilerleme ve iptal
+                            ft.ProgressBar(
+                                ref=decrypt_progress,
+                                width=300,
+                                color=ft.colors.GREEN,
+                                visible=False
+                            ),
+                            ft.Text(
+                                ref=decrypt_status,
+                                value="",
+                                size=12,
+                                color="#666666"
+                            ),
+                            ft.ElevatedButton(
+                                "İptal",
+                                ref=decrypt_cancel_button,
+                                icon=ft.icons.CANCEL,
+                                on_click=lambda e: cancel_task(decrypt_task, decrypt_status, decrypt_cancel_button),
+                                visible=False
+                            ),
                         ], spacing=10),
                         width=350,
                         padding=10
@@ -621,11 +942,117 @@ def main(page: ft.Page):
         )
     )
 
+    # Toplu işlem sekmesi
+    queue_tab = ft.Tab(
+        text="Toplu İşlem",
+        icon=ft.icons.QUEUE,
+        content=ft.Container(
+            content=ft.Column([
+                ft.Text(
+                    "Toplu Şifreleme / Çözme",
+                    size=24,
+                    weight="bold",
+                    text_align="center",
+                    color="#8A2BE2"
+                ),
+                ft.Divider(),
+                
+                ft.Row([
+                    ft.ElevatedButton(
+                        "Dosya Ekle",
+                        ref=queue_busy_buttons[0],
+                        icon=ft.icons.ADD_PHOTO_ALTERNATE,
+                        on_click=pick_queue_files
+                    ),
+                    ft.ElevatedButton(
+                        "Klasör Ekle",
+                        ref=queue_busy_buttons[1],
+                        icon=ft.icons.FOLDER_OPEN,
+                        on_click=pick_queue_folder
+                    ),
+                    ft.ElevatedButton(
+                        "Temizle",
+                        ref=queue_busy_buttons[2],
+                        icon=ft.icons.DELETE_SWEEP,
+                        on_click=clear_queue
+                    ),
+                ], spacing=10),
+                
+                # Dosya başına durum
+                ft.Container(
+                    content=ft.Column(ref=queue_list, controls=[], scroll="auto", spacing=4),
+                    height=250,
+                    bgcolor="#f5f5f5",
+                    padding=10,
+                    border_radius=10
+                ),
+                
+                ft.RadioGroup(
+                    ref=queue_operation,
+                    value="sifrele",
+                    content=ft.Row([
+                        ft.Radio(value="sifrele", label="Şifrele"),
+                        ft.Radio(value="coz", label="Şifreyi Çöz"),
+                    ])
+                ),
+                
+                ft.Row([
+                    ft.ElevatedButton(
+                        "Çıktı Klasörü Seç",
+                        ref=queue_busy_buttons[3],
+                        icon=ft.icons.SAVE,
+                        on_click=pick_queue_output_dir
+                    ),
+                    ft.Text(
+                        ref=queue_output_dir,
+                        value="Henüz konum seçilmedi",
+                        size=12,
+                        color="#666666"
+                    ),
+                ], spacing=10),
+                
+                ft.TextField(
+                    ref=queue_key_field,
+                    label="Şifre",
+                    hint_text="Şifrenizi girin",
+                    password=True,
+                    can_reveal_password=True,
+                    width=300
+                ),
+                
+                ft.Row([
+                    ft.ElevatedButton(
+                        "Başlat",
+                        ref=queue_busy_buttons[4],
+                        icon=ft.icons.PLAY_ARROW,
+                        on_click=start_queue,
+                        style=ft.ButtonStyle(
+                            bgcolor="#8A2BE2",
+                            color=ft.colors.WHITE
+                        )
+                    ),
+                    ft.ElevatedButton(
+                        "İptal",
+                        ref=queue_cancel_button,
+                        icon=ft.icons.CANCEL,
+                        on_click=lambda e: cancel_task(queue_task, queue_status, queue_cancel_button),
+                        visible=False
+                    ),
+                ], spacing=10),
+                
+                # İlerleme ve toplam hız
+                ft.ProgressBar(ref=queue_progress, width=500, visible=False),
+                ft.Text(ref=queue_status, value="", size=12, color="#666666"),
+            ], spacing=15),
+            padding=20
+        )
+    )
+
     # Ana tab görünümü
     tabs = ft.Tabs(
         selected_index=0,
         animation_duration=300,
-        tabs=[encrypt_tab, decrypt_tab],
+        tabs=[encrypt_tab, decrypt_tab, queue_tab],
         expand=1
     )
 
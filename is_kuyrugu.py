@@ -0,0 +1,205 @@
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+from islem_havuzu import DECRYPT, ENCRYPT
+from karistirma import in_place_preferred, scramble_pixels, unscramble_pixels
+from kodlama import (DEFAULT_FORMAT, OUTPUT_FORMATS, decrypt_scheme, read_file_scheme, read_image_file,
+                     write_image_file)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class QueueFullError(Exception):
+    """İş kuyruğu dolu olduğunda fırlatılır."""
+
+
+class Job:
+    """Kuyruktaki tek bir şifreleme/çözme işinin durumu."""
+
+    def __init__(self, operation, directory, input_name, key, output_format, compression,
+                 scheme=None):
+        self.id = uuid.uuid4().hex
+        self.operation = operation
+        self.directory = directory
+        self.input_path = os.path.join(directory, 'girdi' + os.path.splitext(input_name)[1].lower())
+        self.result_path = os.path.join(directory, 'sonuc' + OUTPUT_FORMATS[output_format][0])
+        self.key = key
+        self.output_format = output_format
+        self.compression = compression
+        self.scheme = scheme
+        self.status = QUEUED
+        self.progress = 0.0
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'operation': self.operation,
+            'status': self.status,
+            'progress': round(self.progress, 1),
+            'error': self.error,
+            'created': self.created,
+            'finished': self.finished,
+        }
+
+
+class JobQueue:
+    """Büyük resimler için yerel iş kuyruğu.
+
+    İşler gönderildiği anda diske yazılır ve kimliği döndürülür; arka plan
+    iş parçacıkları kuyruktan sırayla işler. İlerleme, taşınan piksellerin
+    yüzdesi olarak izlenir. Biten işlerin sonuçları ttl saniye sonra silinir.
+    """
+
+    def __init__(self, directory, workers, max_queued, ttl):
+        self.directory = directory
+        self.workers = workers
+        self.max_queued = max_queued
+        self.ttl = ttl
+        self._queue = queue.Queue()
+        # Bekleyen iş yerleri; girdi diske kopyalanmadan önce ayrılır (0: sınırsız)
+        self._slots = threading.BoundedSemaphore(max_queued) if max_queued > 0 else None
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._threads = []
+
+    @classmethod
+    def from_environment(cls):
+        """Ayarları ortam değişkenlerinden okur."""
+        directory = os.environ.get('SIFRELEME_IS_DIZINI') or os.path.join(
+            tempfile.gettempdir(), 'goruntu_sifreleme_isler'
+        )
+        workers = int(os.environ.get('SIFRELEME_IS_ISCI_SAYISI', 2))
+        max_queued = int(os.environ.get('SIFRELEME_IS_KUYRUK_SINIRI', 32))
+        ttl = int(os.environ.get('SIFRELEME_IS_SURESI', 3600))
+        return cls(directory, workers, max_queued, ttl)
+
+    def _start_workers(self):
+        # İş parçacıkları ilk işte başlatılır
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name='is-kuyrugu', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _reserve_slot(self):
+        if self._slots is not None and not self._slots.acquire(blocking=False):
+            raise QueueFullError("İş kuyruğu dolu, lütfen daha sonra tekrar deneyin")
+
+    def _release_slot(self):
+        if self._slots is not None:
+            self._slots.release()
+
+    def check_capacity(self):
+        """Kuyrukta yer yoksa yer ayırmadan hemen QueueFullError fırlatır."""
+        self._reserve_slot()
+        self._release_slot()
+
+    def submit(self, operation, source, input_name, key, output_format=DEFAULT_FORMAT,
+               compression=None, scheme=None):
+        """Girdiyi (dosya benzeri nesne) iş dizinine kopyalar ve işi kuyruğa ekler.
+
+        scheme (kapsayici.Scheme) verilmezse şifrelemede eski piksel
+        karıştırma kullanılır, çözmede şema girdi dosyasından okunur.
+        Kuyruk doluysa girdi okunmadan QueueFullError fırlatır.
+        """
+        self.cleanup()
+        # Yer girdi kopyalanmadan önce ayrılır; iş kuyruktan alınınca bırakılır
+        self._reserve_slot()
+        job = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            job = Job(operation, tempfile.mkdtemp(dir=self.directory), input_name, key,
+                      output_format, compression, scheme)
+            with open(job.input_path, 'wb') as f:
+                shutil.copyfileobj(source, f, 1 << 20)
+        except BaseException:
+            self._release_slot()
+            if job is not None:
+                shutil.rmtree(job.directory, ignore_errors=True)
+            raise
+
+        with self._lock:
+            self._jobs[job.id] = job
+        self._queue.put_nowait(job)
+        self._start_workers()
+        return job
+
+    def get(self, job_id):
+        """İşi döndürür; bilinmiyorsa veya süresi dolduysa None."""
+        self.cleanup()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _work(self):
+        while True:
+            try:
+                job = self._queue.get(timeout=self.ttl or None)
+            except queue.Empty:
+                self.cleanup()
+                continue
+            self._release_slot()
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job):
+        job.status = RUNNING
+
+        def progress(moved, total):
+            job.progress = moved * 100.0 / total if total else 100.0
+
+        try:
+            scheme = job.scheme
+            if job.operation == DECRYPT:
+                scheme = decrypt_scheme(scheme, lambda: read_file_scheme(job.input_path))
+            image = read_image_file(job.input_path)
+            if image is None:
+                raise ValueError("Resim yüklenemedi")
+            in_place = in_place_preferred(image, scheme, inverse=job.operation == DECRYPT)
+            if job.operation == ENCRYPT:
+                result_image = scramble_pixels(image, job.key, progress=progress, scheme=scheme,
+                                               in_place=in_place)
+                output_scheme = scheme
+            else:
+                result_image = unscramble_pixels(image, job.key, progress=progress, scheme=scheme,
+                                                 in_place=in_place)
+                output_scheme = None
+            del image
+            write_image_file(job.result_path, result_image, job.output_format, job.compression,
+                             output_scheme)
+            job.progress = 100.0
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            # Şifre ve girdi dosyası iş bittikten sonra tutulmaz
+            job.key = None
+            try:
+                os.remove(job.input_path)
+            except OSError:
+                pass
+            job.finished = time.time()
+
+    def cleanup(self):
+        """Süresi dolmuş işleri ve sonuç dosyalarını siler."""
+        now = time.time()
+        with self._lock:
+            expired = [job for job in self._jobs.values()
+                       if job.finished is not None and now - job.finished > self.ttl]
+            for job in expired:
+                del self._jobs[job.id]
+        for job in expired:
+            shutil.rmtree(job.directory, ignore_errors=True)
@@ -0,0 +1,168 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+import numpy as np
+
+import olcumler
+from karistirma import in_place_preferred, limit_move_threads, scramble_pixels, unscramble_pixels
+from kodlama import DEFAULT_FORMAT, encode_image
+
+ENCRYPT = 'encrypt'
+DECRYPT = 'decrypt'
+
+# Akış halindeki yanıtlarda bir parçanın en büyük boyutu
+STREAM_CHUNK_SIZE = 1 << 20
+
+
+class PoolBusyError(Exception):
+    """İşlem havuzu dolu olduğunda fırlatılır."""
+
+
+def _process_shared_image(operation, shm_name, shape, dtype, key, output_format, compression,
+                          scheme=None):
+    """İşçi süreçte çalışır: paylaşımlı bellekteki resmi işler ve kodlar.
+
+    Çözülmüş pikseller süreçler arasında kopyalanmaz; kodlanmış çıktı da yeni
+    bir paylaşımlı bellek bloğuna yazılır ve yalnızca adı geri döner. Aşama
+    ölçümleri de ana süreçteki metriklere eklenmek üzere döndürülür.
+    Şifrelemede scheme (kapsayici.Scheme) çıktıya da yazılır.
+    """
+    with olcumler.capture() as observations:
+        input_shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            image = np.ndarray(shape, dtype=dtype, buffer=input_shm.buf)
+            # Büyük resimler paylaşımlı bellekte yerinde karıştırılır
+            in_place = in_place_preferred(image, scheme, inverse=operation == DECRYPT)
+            if operation == ENCRYPT:
+                result_image = scramble_pixels(image, key, scheme=scheme, in_place=in_place)
+            else:
+                result_image = unscramble_pixels(image, key, scheme=scheme, in_place=in_place)
+            del image
+            encoded = encode_image(result_image, output_format, compression,
+                                   scheme if operation == ENCRYPT else None)
+            del result_image
+        finally:
+            input_shm.close()
+
+    output_shm = shared_memory.SharedMemory(create=True, size=max(len(encoded), 1))
+    try:
+        output_shm.buf[:len(encoded)] = encoded
+        return output_shm.name, len(encoded), observations
+    finally:
+        output_shm.close()
+
+
+class ComputePool:
+    """Şifreleme işlerini süreç havuzunda çalıştırır.
+
+    workers 0 ise havuz kapalıdır ve işler çağıran iş parçacığında yapılır.
+    Aynı anda en fazla max_pending iş kabul edilir; fazlası beklemeden
+    PoolBusyError ile reddedilir.
+    """
+
+    def __init__(self, workers, max_pending):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending) if max_pending else None
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls):
+        """Ayarları ortam değişkenlerinden okur."""
+        workers = int(os.environ.get('SIFRELEME_ISCI_SAYISI', os.cpu_count() or 1))
+        max_pending = int(os.environ.get('SIFRELEME_KUYRUK_SINIRI', workers * 2))
+        return cls(workers, max_pending)
+
+    @property
+    def enabled(self):
+        return self.workers > 0
+
+    def _get_executor(self):
+        # Havuz ilk kullanımda açılır; spawn, çok iş parçacıklı sunucuda
+        # fork'un kilit sorunlarından kaçınır. İşçilerin taşıma iş
+        # parçacıkları CPU'ları aşmayacak şekilde paylaştırılır.
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=limit_move_threads,
+                    initargs=(self.workers,)
+                )
+            return self._executor
+
+    @contextmanager
+    def reserve(self):
+        """Kuyrukta bir yer ayırır; yer yoksa hemen PoolBusyError fırlatır."""
+        if self._slots is None:
+            yield
+            return
+        if not self._slots.acquire(blocking=False):
+            raise PoolBusyError("Sunucu meşgul, lütfen daha sonra tekrar deneyin")
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def check_capacity(self):
+        """Kuyrukta boş yer yoksa hemen PoolBusyError fırlatır; yer ayırmaz.
+
+        Yükleme okunmadan önce çağrılır ki dolu sunucu gövdeyi beklemeden
+        reddedebilsin; asıl yer gövde okunduktan sonra reserve() ile ayrılır.
+        """
+        with self.reserve():
+            pass
+
+    def _submit(self, operation, image, key, output_format, compression, scheme):
+        input_shm = shared_memory.SharedMemory(create=True, size=max(image.nbytes, 1))
+        try:
+            np.ndarray(image.shape, dtype=image.dtype, buffer=input_shm.buf)[...] = image
+            future = self._get_executor().submit(
+                _process_shared_image, operation, input_shm.name,
+                image.shape, image.dtype.str, key, output_format, compression, scheme
+            )
+            output_name, output_size, observations = future.result()
+        finally:
+            input_shm.close()
+            input_shm.unlink()
+        olcumler.replay(observations)
+        return output_name, output_size
+
+    def run(self, operation, image, key, output_format=DEFAULT_FORMAT, compression=None,
+            scheme=None):
+        """Resmi işçi süreçte şifreler/çözer ve kodlanmış baytları döndürür."""
+        output_name, output_size = self._submit(operation, image, key, output_format, compression,
+                                                scheme)
+        output_shm = shared_memory.SharedMemory(name=output_name)
+        try:
+            return bytes(output_shm.buf[:output_size])
+        finally:
+            output_shm.close()
+            output_shm.unlink()
+
+    def stream(self, operation, image, key, output_format=DEFAULT_FORMAT, compression=None,
+               chunk_size=STREAM_CHUNK_SIZE, scheme=None):
+        """run() gibi çalışır ama kodlanmış çıktıyı parça parça üretir.
+
+        Çıktı paylaşımlı bellekten chunk_size'lık parçalar halinde okunur;
+        tamamının bir kopyası oluşturulmaz.
+        """
+        output_name, output_size = self._submit(operation, image, key, output_format, compression,
+                                                scheme)
+        output_shm = shared_memory.SharedMemory(name=output_name)
+        try:
+            for start in range(0, output_size, chunk_size):
+                yield bytes(output_shm.buf[start:min(start + chunk_size, output_size)])
+        finally:
+            output_shm.close()
+            output_shm.unlink()
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
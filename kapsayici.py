@@ -0,0 +1,183 @@
+import os
+import struct
+from collections import namedtuple
+import numpy as np
+
+# Ham piksel kapsayıcısı (.gsif): 64 baytlık başlık + ham piksel baytları.
+# Başlık sabit boyutlu olduğundan pikseller np.memmap ile doğrudan,
+# çözme/kodlama yapılmadan eşlenebilir.
+MAGIC = b'GSIF'
+VERSION = 1
+EXTENSION = '.gsif'
+HEADER_SIZE = 64
+
+# Algoritma kimlikleri
+ALGORITHM_PIXEL_SHUFFLE = 1  # random.shuffle uyumlu piksel karıştırma
+ALGORITHM_TILE_SHUFFLE = 2  # blok karıştırma; algorithm_param = blok kenarı (piksel)
+ALGORITHM_FEISTEL = 3  # tablosuz Feistel permütasyonu; algorithm_param = tur sayısı
+
+# Anahtar türetme kimlikleri
+KDF_ORD_SUM = 1  # tohum = şifredeki karakter kodlarının toplamı
+KDF_PBKDF2_SHA256 = 2  # PBKDF2-HMAC-SHA256; kdf_iterations ve 16 baytlık kdf_salt ile
+
+# Blok karıştırmada izin verilen blok kenarı aralığı
+MIN_TILE_SIZE = 2
+MAX_TILE_SIZE = 256
+DEFAULT_TILE_SIZE = 16
+
+# Feistel permütasyonunun varsayılan ve izin verilen tur sayıları ile
+# PBKDF2 tekrar sayısı; üst sınır, başlığı değiştirilmiş bir dosyanın
+# çözmeyi dakikalarca meşgul etmesini önler
+DEFAULT_FEISTEL_ROUNDS = 8
+MIN_FEISTEL_ROUNDS = 4
+MAX_FEISTEL_ROUNDS = 32
+DEFAULT_KDF_ITERATIONS = 100_000
+MAX_KDF_ITERATIONS = 10_000_000
+
+_HEADER_FORMAT = '<4sHHHH4sIIII16sI'
+_SUPPORTED_DTYPES = {'|u1', '<u2'}
+
+ContainerHeader = namedtuple('ContainerHeader', [
+    'version', 'algorithm', 'algorithm_param', 'kdf', 'kdf_iterations', 'kdf_salt',
+    'dtype', 'shape',
+])
+
+# Şifreli resmin nasıl karıştırıldığı; alan adları pack_header'ın
+# parametreleriyle aynıdır, böylece başlığa doğrudan aktarılabilir
+Scheme = namedtuple('Scheme', ['algorithm', 'algorithm_param', 'kdf', 'kdf_iterations', 'kdf_salt'])
+
+LEGACY_SCHEME = Scheme(ALGORITHM_PIXEL_SHUFFLE, 0, KDF_ORD_SUM, 0, b'\0' * 16)
+
+
+def tile_scheme(tile_size=DEFAULT_TILE_SIZE):
+    """tile_size × tile_size bloklarla karıştırma şemasını döndürür."""
+    scheme = LEGACY_SCHEME._replace(algorithm=ALGORITHM_TILE_SHUFFLE, algorithm_param=tile_size)
+    check_scheme(scheme)
+    return scheme
+
+
+def feistel_scheme(rounds=DEFAULT_FEISTEL_ROUNDS, iterations=DEFAULT_KDF_ITERATIONS, salt=None):
+    """Feistel permütasyonu şemasını döndürür; tuz verilmezse rastgele üretilir."""
+    scheme = Scheme(ALGORITHM_FEISTEL, rounds, KDF_PBKDF2_SHA256, iterations,
+                    os.urandom(16) if salt is None else salt)
+    check_scheme(scheme)
+    return scheme
+
+
+def check_scheme(scheme):
+    """Şema bu sürümde desteklenmiyorsa ValueError fırlatır."""
+    if scheme.algorithm == ALGORITHM_FEISTEL:
+        if scheme.kdf != KDF_PBKDF2_SHA256 or len(scheme.kdf_salt) != 16:
+            raise ValueError(f"Desteklenmeyen anahtar türetme yöntemi: {scheme.kdf}")
+        if not 1 <= scheme.kdf_iterations <= MAX_KDF_ITERATIONS:
+            raise ValueError(
+                f"KDF tekrar sayısı 1-{MAX_KDF_ITERATIONS} arasında olmalı: {scheme.kdf_iterations}"
+            )
+        if not MIN_FEISTEL_ROUNDS <= scheme.algorithm_param <= MAX_FEISTEL_ROUNDS:
+            raise ValueError(
+                f"Tur sayısı {MIN_FEISTEL_ROUNDS}-{MAX_FEISTEL_ROUNDS} arasında olmalı: "
+                f"{scheme.algorithm_param}"
+            )
+        return
+    if scheme.kdf != KDF_ORD_SUM:
+        raise ValueError(f"Desteklenmeyen anahtar türetme yöntemi: {scheme.kdf}")
+    if scheme.algorithm == ALGORITHM_TILE_SHUFFLE:
+        if not MIN_TILE_SIZE <= scheme.algorithm_param <= MAX_TILE_SIZE:
+            raise ValueError(
+                f"Blok boyutu {MIN_TILE_SIZE}-{MAX_TILE_SIZE} arasında olmalı: {scheme.algorithm_param}"
+            )
+    elif scheme.algorithm != ALGORITHM_PIXEL_SHUFFLE:
+        raise ValueError(f"Desteklenmeyen şifreleme algoritması: {scheme.algorithm}")
+
+
+def header_scheme(header):
+    """Kapsayıcı başlığındaki şifreleme şemasını döndürür."""
+    return Scheme(header.algorithm, header.algorithm_param, header.kdf,
+                  header.kdf_iterations, header.kdf_salt)
+
+
+def is_container(data):
+    """Verinin (veya dosya başının) kapsayıcı olup olmadığını söyler."""
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def pack_header(shape, dtype, algorithm=ALGORITHM_PIXEL_SHUFFLE, algorithm_param=0,
+                kdf=KDF_ORD_SUM, kdf_iterations=0, kdf_salt=b''):
+    """Verilen resim bilgileri için 64 baytlık başlığı üretir."""
+    dtype = np.dtype(dtype)
+    if dtype.str not in _SUPPORTED_DTYPES:
+        raise ValueError(f"Desteklenmeyen piksel türü: {dtype}")
+    height, width = shape[:2]
+    channels = shape[2] if len(shape) == 3 else 1
+    if not 1 <= channels <= 4:
+        raise ValueError(f"Desteklenmeyen kanal sayısı: {channels}")
+    header = struct.pack(
+        _HEADER_FORMAT, MAGIC, VERSION, HEADER_SIZE, algorithm, kdf,
+        dtype.str.encode('ascii'), height, width, channels,
+        kdf_iterations, kdf_salt.ljust(16, b'\0'), algorithm_param
+    )
+    return header.ljust(HEADER_SIZE, b'\0')
+
+
+def read_header(data):
+    """Başlığı çözer ve ContainerHeader döndürür."""
+    if len(data) < HEADER_SIZE or not is_container(data):
+        raise ValueError("Geçerli bir kapsayıcı dosyası değil")
+    (_, version, header_size, algorithm, kdf, dtype, height, width, channels,
+     kdf_iterations, kdf_salt, algorithm_param) = struct.unpack_from(_HEADER_FORMAT, data)
+    if version != VERSION or header_size != HEADER_SIZE:
+        raise ValueError(f"Desteklenmeyen kapsayıcı sürümü: {version}")
+    dtype = dtype.rstrip(b'\0').decode('ascii', 'replace')
+    if dtype not in _SUPPORTED_DTYPES:
+        raise ValueError(f"Desteklenmeyen piksel türü: {dtype}")
+    if not 1 <= channels <= 4:
+        raise ValueError(f"Desteklenmeyen kanal sayısı: {channels}")
+    dtype = np.dtype(dtype)
+    shape = (height, width) if channels == 1 else (height, width, channels)
+    return ContainerHeader(version, algorithm, algorithm_param, kdf, kdf_iterations,
+                           kdf_salt, dtype, shape)
+
+
+def pack_container(image, **header_fields):
+    """Resmi başlık + ham piksel baytları olarak paketler."""
+    image = np.ascontiguousarray(image)
+    return pack_header(image.shape, image.dtype, **header_fields) + image.tobytes()
+
+
+def unpack_container(data):
+    """Kapsayıcıyı çözer; pikseller verinin kendisine bakan bir görünümdür (kopya yok)."""
+    header = read_header(data)
+    count = int(np.prod(header.shape))
+    if len(data) < HEADER_SIZE + count * header.dtype.itemsize:
+        raise ValueError("Kapsayıcı dosyası eksik")
+    pixels = np.frombuffer(data, dtype=header.dtype, count=count, offset=HEADER_SIZE)
+    return header, pixels.reshape(header.shape)
+
+
+def write_container(path, image, **header_fields):
+    """Resmi kapsayıcı dosyasına yazar (ara kopya oluşturmadan)."""
+    image = np.ascontiguousarray(image)
+    with open(path, 'wb') as f:
+        f.write(pack_header(image.shape, image.dtype, **header_fields))
+        f.write(memoryview(image).cast('B'))
+
+
+def open_container(path, mode='r'):
+    """Kapsayıcı dosyasını np.memmap olarak eşler; (başlık, pikseller) döndürür.
+
+    mode='r+' ile açılan pikseller yerinde değiştirilebilir.
+    """
+    with open(path, 'rb') as f:
+        header = read_header(f.read(HEADER_SIZE))
+    pixels = np.memmap(path, dtype=header.dtype, mode=mode,
+                       offset=HEADER_SIZE, shape=header.shape)
+    return header, pixels
+
+
+def create_container(path, shape, dtype, **header_fields):
+    """Boş bir kapsayıcı dosyası oluşturur ve piksellerini yazılabilir eşler."""
+    header = pack_header(shape, dtype, **header_fields)
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.truncate(HEADER_SIZE + int(np.prod(shape)) * np.dtype(dtype).itemsize)
+    return open_container(path, mode='r+')
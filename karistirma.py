@@ -0,0 +1,526 @@
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+import numpy as np
+
+import olcumler
+from feistel import FeistelIndices, FeistelPermutation
+from kapsayici import ALGORITHM_FEISTEL, ALGORITHM_TILE_SHUFFLE, LEGACY_SCHEME, check_scheme
+from onbellek import PermutationCache
+
+# Mersenne Twister çıktısı bu büyüklükte bloklar halinde üretilir
+_WORD_CHUNK = 1 << 16
+# Piksel taşıma işlemi bu büyüklükte dilimler halinde yapılır
+_MOVE_CHUNK = 1 << 20
+# Bir dilim, iş parçacıkları arasında bu büyüklükte bloklara bölünür; bir
+# bloğun indeksleri ve çıktısı (64K piksel için birkaç yüz KB) işlemci
+# önbelleğinde kalır
+_MOVE_BLOCK = 1 << 16
+# Piksel taşımada kullanılan iş parçacığı sayısı (1: taşıma çağıran iş
+# parçacığında yapılır). np.take GIL'i bıraktığından bloklar paralel işlenir.
+MOVE_THREADS = max(1, int(os.environ.get('SIFRELEME_TASIMA_IS_PARCACIGI',
+                                         min(8, os.cpu_count() or 1))))
+# Yerinde taşımada permütasyon döngüleri bu kadar noktadan aynı anda izlenir
+_CYCLE_WALKERS = 1 << 16
+# Bir isteğin piksel taşıma için tahmini bellek ihtiyacı bu sınırı aşarsa
+# sunucu ikinci bir resim tamponu ayırmadan yerinde taşıma yapar (0: kapalı)
+IN_PLACE_THRESHOLD = int(os.environ.get('SIFRELEME_YERINDE_ESIK_MB', '1024')) * 1024 * 1024
+# Piksel boyutuna (bayt) göre kayıt türü; diğer boyutlar np.void olarak taşınır
+_RECORD_TYPES = {1: np.uint8, 2: np.uint16, 4: np.uint32, 8: np.uint64}
+
+
+def derive_seed(key):
+    """Şifreden karıştırma tohumunu üretir."""
+    key_bytes = [ord(k) for k in key]
+    return sum(key_bytes)
+
+
+def _legacy_bit_generator(seed):
+    """random.seed(seed) sonrasındaki durumla aynı MT19937 üretecini döndürür."""
+    state = random.Random(seed).getstate()[1]
+    bit_generator = np.random.MT19937()
+    bit_generator.state = {
+        'bit_generator': 'MT19937',
+        'state': {'key': np.array(state[:-1], dtype=np.uint32), 'pos': state[-1]},
+    }
+    return bit_generator
+
+
+def generate_permutation(seed, pixel_count, out=None):
+    """Tohuma göre piksel sırasını (permütasyonu) üretir.
+
+    Sonuç, random.seed(seed) + random.shuffle(list(range(pixel_count)))
+    ile birebir aynıdır; böylece eski şifreli resimler çözülmeye devam
+    eder. Python int listesi yerine doğrudan uint32 dizisine yazılır ve
+    rastgele sayılar blok blok üretildiği için bellek kullanımı piksel
+    başına 4 bayt ile sınırlı kalır.
+
+    Her çağrı kendi üretecini kullanır, random modülünün global durumuna
+    dokunmaz; bu yüzden eşzamanlı isteklerde güvenle çağrılabilir.
+
+    out verilirse (ör. çok büyük resimler için np.memmap) sonuç ona yazılır.
+    """
+    if pixel_count >= 1 << 32:
+        raise ValueError("Resim çok büyük: piksel sayısı 2^32'den küçük olmalı")
+
+    bit_generator = _legacy_bit_generator(seed)
+    words = chain.from_iterable(
+        iter(lambda: bit_generator.random_raw(_WORD_CHUNK).tolist(), None)
+    )
+    next_word = words.__next__
+
+    if out is None:
+        pixel_indices = np.arange(pixel_count, dtype=np.uint32)
+    else:
+        pixel_indices = out
+        for start in range(0, pixel_count, _MOVE_CHUNK):
+            stop = min(start + _MOVE_CHUNK, pixel_count)
+            pixel_indices[start:stop] = np.arange(start, stop, dtype=np.uint32)
+    view = memoryview(pixel_indices)
+
+    # random.shuffle: i = n-1 ... 1 için j = _randbelow(i + 1) ve takas.
+    # _randbelow, (i + 1).bit_length() bitlik sayılar üretip i'den büyük
+    # olanları reddeder; bit sayısı sabit kalan aralıklar tek döngüde işlenir.
+    upper = pixel_count - 1
+    while upper > 0:
+        bits = (upper + 1).bit_length()
+        shift = 32 - bits
+        lower = max(1, (1 << (bits - 1)) - 1)
+        for i in range(upper, lower - 1, -1):
+            j = next_word() >> shift
+            while j > i:
+                j = next_word() >> shift
+            view[i], view[j] = view[j], view[i]
+        upper = lower - 1
+
+    return pixel_indices
+
+
+# Aynı tohum ve çözünürlükteki istekler permütasyonu yeniden üretmez
+permutation_cache = PermutationCache(
+    generate_permutation,
+    int(os.environ.get('SIFRELEME_ONBELLEK_MB', '512')) * 1024 * 1024,
+    observer=olcumler.count_cache_lookup
+)
+
+
+def _flatten(image):
+    """Resmi her pikseli tek bir sabit genişlikli kayıt olan düz bir görünüme çevirir.
+
+    Kanal sayısı (gri, BGR, BGRA) ve örnek türü (uint8/uint16) ne olursa
+    olsun bir pikselin tüm baytları tek öğe olarak taşınır. 1, 2, 4 ve 8
+    baytlık pikseller tamsayı, diğerleri (ör. 3 kanallı BGR) np.void
+    kaydı olarak görülür; kopya oluşturulmaz.
+    """
+    height, width = image.shape[:2]
+    pixels = np.ascontiguousarray(image).reshape(height * width, -1)
+    record_size = pixels.shape[1] * pixels.itemsize
+    record = _RECORD_TYPES.get(record_size, np.dtype((np.void, record_size)))
+    return pixels.view(record).reshape(height * width)
+
+
+def _unflatten(flat_image, shape, dtype):
+    """_flatten ile düzleştirilmiş pikselleri verilen şekle geri çevirir."""
+    return flat_image.view(dtype).reshape(shape)
+
+
+def _output_buffer(flat_image, out):
+    if out is None:
+        return np.empty_like(flat_image)
+    return _flatten(out)
+
+
+_move_executor = None
+_move_executor_lock = threading.Lock()
+
+
+def _get_move_executor():
+    # Havuz ilk büyük taşımada açılır ve süreç boyunca paylaşılır
+    global _move_executor
+    with _move_executor_lock:
+        if _move_executor is None:
+            _move_executor = ThreadPoolExecutor(MOVE_THREADS, thread_name_prefix='piksel-tasima')
+        return _move_executor
+
+
+def limit_move_threads(processes):
+    """Süreç havuzu işçilerinde taşıma iş parçacıklarını CPU'ları paylaşacak şekilde sınırlar.
+
+    Havuz başlatıcısı (initializer) olarak çağrılır. Aynı anda processes
+    kadar süreç taşıma yaptığından her birine CPU sayısının süreç
+    sayısına bölümü (en az 1) düşer. SIFRELEME_TASIMA_IS_PARCACIGI açıkça
+    verildiyse değiştirilmez.
+    """
+    global MOVE_THREADS
+    if 'SIFRELEME_TASIMA_IS_PARCACIGI' not in os.environ:
+        MOVE_THREADS = max(1, min(MOVE_THREADS, (os.cpu_count() or 1) // max(1, processes)))
+
+
+def _take_block(flat_image, indices, out, offset, start, stop):
+    # İndeksler permütasyondan geldiği için her zaman geçerlidir; mode='clip'
+    # sınır denetimini ve varsayılan moddaki ara tamponu atlar
+    np.take(flat_image, indices[offset + start:offset + stop], axis=0,
+            out=out[start:stop], mode='clip')
+
+
+def _take(flat_image, indices, out, offset=0):
+    """out = flat_image[indices[offset:offset + len(out)]] işlemini iş parçacıklarına bölerek yapar.
+
+    Permütasyon _MOVE_BLOCK'luk bloklara ayrılır; her iş parçacığı kendi
+    bloklarının indekslerini okuyup (tablosuz permütasyonlarda hesaplayıp)
+    çıktının ilgili bölümüne yazar, yani yazmalar çakışmaz. Fonksiyon tüm
+    bloklar bitmeden dönmez.
+    """
+    count = len(out)
+    if MOVE_THREADS <= 1 or count <= _MOVE_BLOCK:
+        _take_block(flat_image, indices, out, offset, 0, count)
+        return
+    futures = [
+        _get_move_executor().submit(_take_block, flat_image, indices, out, offset,
+                                    start, min(start + _MOVE_BLOCK, count))
+        for start in range(0, count, _MOVE_BLOCK)
+    ]
+    for future in futures:
+        future.result()
+
+
+def _gather(flat_image, indices, out, progress=None):
+    """out[i] = flat_image[indices[i]] atamasını dilimler halinde yapar."""
+    total = len(indices)
+    for start in range(0, total, _MOVE_CHUNK):
+        stop = min(start + _MOVE_CHUNK, total)
+        _take(flat_image, indices, out[start:stop], start)
+        if progress is not None:
+            progress(stop, total)
+
+
+def _tile_plan(shape, tile_size, seed, inverse):
+    """Blok karıştırma için kaynak konumlarını hesaplar.
+
+    Resmin tile_size'a bölünebilen bölgesi bloklara ayrılır. Bloklar
+    kendi aralarında, her bloğun pikselleri de blok içinde (tüm bloklar
+    için aynı) ikinci bir permütasyonla karıştırılır; iki permütasyon da
+    eski piksel karıştırmayla aynı üreteçle ve önbellekten alınır. Bloklara
+    sığmayan sağ ve alt kenar pikselleri kendi aralarında karıştırılır.
+
+    Çıktıdaki k. blok kaynaktaki tile_order[k]. bloğun, bloktaki p.
+    konum ise kaynak bloktaki intra_order[p]. konumun kopyasıdır; ters
+    permütasyonlarla aynı hesap şifreyi çözer. (blok başlangıçları, blok
+    içi kaydırmalar, kenar konumları, kenar kaynakları) döndürür.
+    """
+    height, width = shape[0], shape[1] if len(shape) > 1 else 1
+    tile_rows, tile_cols = height // tile_size, width // tile_size
+    tiled_height, tiled_width = tile_rows * tile_size, tile_cols * tile_size
+
+    tile_order = permutation_cache.get(seed, tile_rows * tile_cols, inverse=inverse).astype(np.int64)
+    intra_order = permutation_cache.get(seed, tile_size * tile_size, inverse=inverse).astype(np.int64)
+    tile_starts = (tile_order // tile_cols) * tile_size * width + (tile_order % tile_cols) * tile_size
+    intra_offsets = (intra_order // tile_size) * width + intra_order % tile_size
+
+    edge_positions = np.concatenate((
+        (np.arange(tiled_height, dtype=np.int64)[:, None] * width
+         + np.arange(tiled_width, width, dtype=np.int64)).ravel(),
+        np.arange(tiled_height * width, height * width, dtype=np.int64),
+    ))
+    edge_order = permutation_cache.get(seed, len(edge_positions), inverse=inverse)
+    return tile_starts, intra_offsets, edge_positions, edge_positions[edge_order]
+
+
+def _iter_tile_bands(flat_image, shape, tile_size, plan, band_pixels, out=None):
+    """Blok karıştırmanın sonucunu satır şeritleri halinde üretir.
+
+    Şeritler blok satırlarına hizalıdır; her şeritte bloklar tek bir
+    np.take ile taşınır. Bir bloğun satırları bellekte bitişik olduğundan
+    okuma tek tek rastgele pikseller yerine blok satırları halinde yapılır.
+    (şeridin bittiği piksel, şerit) çiftleri üretir; out verilirse
+    şeritler ona yazılır.
+    """
+    tile_starts, intra_offsets, edge_positions, edge_sources = plan
+    height, width = shape[0], shape[1] if len(shape) > 1 else 1
+    tile_cols = width // tile_size
+    tiled_height, tiled_width = height // tile_size * tile_size, tile_cols * tile_size
+    tile_offsets = intra_offsets.reshape(1, tile_size, 1, tile_size)
+    band_tile_rows = max(1, band_pixels // max(tile_size * width, 1))
+
+    row_starts = list(range(0, tiled_height, band_tile_rows * tile_size))
+    if tiled_height < height:
+        row_starts.append(tiled_height)
+    row_starts.append(height)
+    for row, next_row in zip(row_starts, row_starts[1:]):
+        start, stop = row * width, next_row * width
+        band = np.empty(stop - start, flat_image.dtype) if out is None else out[start:stop]
+        if row < tiled_height and tiled_width:
+            first_tile = row // tile_size * tile_cols
+            last_tile = next_row // tile_size * tile_cols
+            sources = (tile_starts[first_tile:last_tile].reshape(-1, 1, tile_cols, 1)
+                       + tile_offsets)
+            moved = np.empty(sources.size, flat_image.dtype)
+            _take(flat_image, sources.ravel(), moved)
+            band.reshape(-1, width)[:, :tiled_width] = moved.reshape(-1, tiled_width)
+        first_edge, last_edge = np.searchsorted(edge_positions, (start, stop))
+        band[edge_positions[first_edge:last_edge] - start] = \
+            flat_image[edge_sources[first_edge:last_edge]]
+        yield stop, band
+
+
+def _mark_visited(visited, positions):
+    np.bitwise_or.at(visited, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+
+
+def _unvisited(visited, total, limit):
+    """Bit haritasında işaretlenmemiş ilk limit konumu (sıralı) döndürür."""
+    window = _MOVE_CHUNK // 8
+    found = []
+    count = 0
+    for byte in range(0, len(visited), window):
+        positions = np.flatnonzero(
+            np.unpackbits(visited[byte:byte + window], bitorder='little') == 0
+        ) + byte * 8
+        positions = positions[positions < total][:limit - count]
+        found.append(positions)
+        count += len(positions)
+        if count >= limit:
+            break
+    return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+
+def _walk_cycle_segments(flat_image, indices, anchors, visited, inverse, report):
+    """Çapalardan başlayan döngü parçalarını aynı anda, adım adım taşır.
+
+    Her çapa, döngüsünde bir sonraki çapaya kadar olan parçayı izler;
+    parçalar ayrık olduğundan tüm yürüyüşler bir adımda vektörel
+    ilerletilir. Çapalar baştan işaretlendiği için bir yürüyüşün vardığı
+    konum işaretliyse o konum bir çapadır ve parça biter. Çapaların özgün
+    değerleri başta saklanır, çünkü bir parçanın sonunda okunacak çapa
+    kendi parçasının ilk adımında yazılır. report(taşınan) yaklaşık her
+    _MOVE_CHUNK pikselde çağrılır; taşınan piksel sayısını döndürür.
+    """
+    saved = flat_image[anchors]
+    carry = saved
+    current = anchors
+    _mark_visited(visited, anchors)
+    moved = reported = 0
+    while len(current):
+        following = indices[current].astype(np.int64)
+        ends = (visited[following >> 3] >> (following & 7).astype(np.uint8)) & 1 == 1
+        going = ~ends
+        if inverse:
+            # Çözme: x[sonraki] <- x[şimdiki]; sonraki değer yazılmadan okunur
+            next_carry = flat_image[following[going]]
+            flat_image[following] = carry
+            carry = next_carry
+        else:
+            # Şifreleme: x[şimdiki] <- x[sonraki]; çapalar saklanan değerden
+            values = flat_image[following]
+            values[ends] = saved[np.searchsorted(anchors, following[ends])]
+            flat_image[current] = values
+        moved += len(current)
+        current = following[going]
+        _mark_visited(visited, current)
+        if moved - reported >= _MOVE_CHUNK:
+            reported = moved
+            report(moved)
+    return moved
+
+
+def _permute_in_place(flat_image, indices, inverse, progress=None):
+    """flat_image'ı ikinci bir tampon ayırmadan permütasyona göre yerinde değiştirir.
+
+    Permütasyon döngülerine ayrılır: c0 → indices[c0] → ... → c0. Şifrelemede
+    (out[i] = x[indices[i]]) her döngü bir adım geri, çözmede (out[indices[i]]
+    = x[i]) bir adım ileri kaydırılır; bu yüzden ters permütasyon da
+    gerekmez. Döngüler eşit aralıklı _CYCLE_WALKERS çapadan başlayarak
+    parça parça ve aynı anda izlenir. Taşınan konumlar piksel başına bir
+    bitlik haritada tutulur; çapa düşmeyen (kısa) döngüler sonraki
+    turlarda işaretlenmemiş konumlardan seçilen çapalarla taşınır. Ek
+    bellek ikinci bir resim yerine N/8 bayt ve çapa sayısı kadardır.
+
+    progress'in fırlattığı istisna işlemi keser ama resim yarı taşınmış kalır.
+    """
+    total = len(indices)
+    visited = np.zeros((total + 7) // 8, dtype=np.uint8)
+    anchors = np.arange(0, total, max(1, total // _CYCLE_WALKERS), dtype=np.int64)
+    moved = 0
+
+    def report(walked):
+        if progress is not None:
+            progress(moved + walked, total)
+
+    while len(anchors):
+        moved += _walk_cycle_segments(flat_image, indices, anchors, visited, inverse, report)
+        report(0)
+        anchors = _unvisited(visited, total, _CYCLE_WALKERS)
+
+
+def in_place_preferred(image, scheme=None, inverse=False):
+    """Sunucu bu resmi yerinde mi taşımalı?
+
+    Normal taşımanın tahmini bellek ihtiyacı (girdi + çıktı tamponu +
+    permütasyon, çözmede ters permütasyon da) IN_PLACE_THRESHOLD'u aşıyorsa
+    ve resim yazılabilir, bitişik bir tamponsa True döner. Yerinde taşıma
+    blok karıştırmada desteklenmez; Feistel permütasyonu bellekte tutulmaz.
+    """
+    scheme = scheme or LEGACY_SCHEME
+    if not IN_PLACE_THRESHOLD or scheme.algorithm == ALGORITHM_TILE_SHUFFLE:
+        return False
+    if not (image.flags.writeable and image.flags.c_contiguous):
+        return False
+    pixel_count = image.shape[0] * (image.shape[1] if image.ndim > 1 else 1)
+    if scheme.algorithm == ALGORITHM_FEISTEL:
+        permutation_bytes = 0
+    else:
+        permutation_bytes = pixel_count * 4 * (2 if inverse else 1)
+    return 2 * image.nbytes + permutation_bytes > IN_PLACE_THRESHOLD
+
+
+def _pixel_indices(key, scheme, pixel_count, inverse):
+    """Piksel karıştırma şemalarının permütasyonunu indeks dizisi olarak döndürür.
+
+    Eski şemada önbellekteki uint32 dizisi, Feistel şemasında ise indeksleri
+    istendiği anda hesaplayan feistel.FeistelIndices döner; ikisi de
+    dilimlenip dizilerle indekslenebilir.
+    """
+    if scheme.algorithm == ALGORITHM_FEISTEL:
+        permutation = FeistelPermutation.from_scheme(key, scheme, pixel_count)
+        return FeistelIndices(permutation, inverse)
+    return permutation_cache.get(derive_seed(key), pixel_count, inverse=inverse)
+
+
+def _permute(flat_image, shape, key, scheme, inverse, out, progress, in_place=False):
+    """Şemaya göre pikselleri taşır; scramble/unscramble_pixels'in ortak gövdesi."""
+    check_scheme(scheme)
+    if in_place:
+        if scheme.algorithm == ALGORITHM_TILE_SHUFFLE:
+            raise ValueError("Yerinde taşıma blok karıştırmada desteklenmez")
+        with olcumler.stage('permutation'):
+            indices = _pixel_indices(key, scheme, len(flat_image), False)
+        with olcumler.stage('pixel_move'):
+            _permute_in_place(flat_image, indices, inverse, progress)
+        return flat_image
+    result = _output_buffer(flat_image, out)
+    if scheme.algorithm == ALGORITHM_TILE_SHUFFLE:
+        with olcumler.stage('permutation'):
+            plan = _tile_plan(shape, scheme.algorithm_param, derive_seed(key), inverse)
+        with olcumler.stage('pixel_move'):
+            for stop, _ in _iter_tile_bands(flat_image, shape, scheme.algorithm_param, plan,
+                                            _MOVE_CHUNK, result):
+                if progress is not None:
+                    progress(stop, len(flat_image))
+        return result
+
+    with olcumler.stage('permutation'):
+        indices = _pixel_indices(key, scheme, len(flat_image), inverse)
+    with olcumler.stage('pixel_move'):
+        _gather(flat_image, indices, result, progress)
+    return result
+
+
+def scramble_pixels(image, key, out=None, progress=None, scheme=None, in_place=False):
+    """Pikselleri şifreye göre karıştırır (şifreleme).
+
+    encrypted[i] = original[pixel_indices[i]] ataması NumPy indeksleme
+    (gather) işlemiyle, geçici indeks belleğini sınırlamak için dilimler
+    halinde yapılır. out verilirse (ör. kapsayıcı dosyasının np.memmap'i)
+    sonuç doğrudan ona yazılır. progress verilirse her dilimden sonra
+    progress(taşınan_piksel, toplam_piksel) çağrılır; geri çağırmanın
+    fırlattığı istisna işlemi yarıda keser.
+
+    scheme (kapsayici.Scheme) verilmezse eski piksel karıştırma kullanılır;
+    kapsayici.tile_scheme() ile pikseller bloklar halinde karıştırılır,
+    kapsayici.feistel_scheme() ile permütasyon tablo üretilmeden anahtarlı
+    bir Feistel ağıyla hesaplanır.
+
+    in_place True ise ikinci bir resim tamponu ayrılmaz; image'ın kendisi
+    (yazılabilir, bitişik olmalı) döngü ayrıştırmasıyla yerinde karıştırılır
+    ve döndürülür. Daha yavaştır; bellek sınırında kullanılır (bkz.
+    in_place_preferred).
+    """
+    flat_image = _flatten(image)
+    encrypted_flat_image = _permute(flat_image, image.shape, key, scheme or LEGACY_SCHEME,
+                                    False, out, progress, in_place)
+    olcumler.count_pixels('encrypt', len(flat_image))
+    return _unflatten(encrypted_flat_image, image.shape, image.dtype)
+
+
+def unscramble_pixels(image, key, out=None, progress=None, scheme=None, in_place=False):
+    """Karıştırılmış pikselleri eski yerlerine koyar (şifre çözme).
+
+    decrypted[pixel_indices[i]] = encrypted[i] ataması, önbellekteki ters
+    permütasyonla decrypted = encrypted[inverse] gather işlemine çevrilir
+    ve dilimler halinde yapılır. out, progress, scheme ve in_place,
+    scramble_pixels'teki gibidir; scheme şifrelemede kullanılanla aynı
+    olmalıdır. Yerinde çözmede ters permütasyon da üretilmez.
+    """
+    flat_image = _flatten(image)
+    decrypted_flat_image = _permute(flat_image, image.shape, key, scheme or LEGACY_SCHEME,
+                                    True, out, progress, in_place)
+    olcumler.count_pixels('decrypt', len(flat_image))
+    return _unflatten(decrypted_flat_image, image.shape, image.dtype)
+
+
+def _iter_gathered_rows(flat_image, indices, shape, dtype, band_pixels, operation):
+    width = shape[1] if len(shape) > 1 else 1
+    band_rows = max(1, band_pixels // max(width, 1))
+    # Şeritler arasında kodlama yapıldığından yalnızca taşıma süreleri toplanır
+    timer = olcumler.Stopwatch()
+    moved = 0
+    try:
+        for row in range(0, shape[0], band_rows):
+            start = row * width
+            stop = min(row + band_rows, shape[0]) * width
+            with timer:
+                band = np.empty(stop - start, flat_image.dtype)
+                _take(flat_image, indices, band, start)
+            moved = stop
+            yield _unflatten(band, (-1,) + tuple(shape[1:]), dtype)
+    finally:
+        olcumler.observe_stage('pixel_move', timer.elapsed)
+        olcumler.count_pixels(operation, moved)
+
+
+def _iter_tile_rows(flat_image, shape, dtype, tile_size, plan, band_pixels, operation):
+    timer = olcumler.Stopwatch()
+    moved = 0
+    bands = _iter_tile_bands(flat_image, shape, tile_size, plan, band_pixels)
+    try:
+        while True:
+            with timer:
+                stop, band = next(bands, (None, None))
+            if band is None:
+                break
+            moved = stop
+            yield _unflatten(band, (-1,) + tuple(shape[1:]), dtype)
+    finally:
+        olcumler.observe_stage('pixel_move', timer.elapsed)
+        olcumler.count_pixels(operation, moved)
+
+
+def _iter_permuted_rows(image, key, band_pixels, scheme, inverse):
+    check_scheme(scheme)
+    flat_image = _flatten(image)
+    operation = 'decrypt' if inverse else 'encrypt'
+    if scheme.algorithm == ALGORITHM_TILE_SHUFFLE:
+        with olcumler.stage('permutation'):
+            plan = _tile_plan(image.shape, scheme.algorithm_param, derive_seed(key), inverse)
+        return _iter_tile_rows(flat_image, image.shape, image.dtype, scheme.algorithm_param,
+                               plan, band_pixels, operation)
+
+    with olcumler.stage('permutation'):
+        indices = _pixel_indices(key, scheme, len(flat_image), inverse)
+    return _iter_gathered_rows(flat_image, indices, image.shape, image.dtype, band_pixels, operation)
+
+
+def iter_scrambled_rows(image, key, band_pixels=_MOVE_CHUNK, scheme=None):
+    """scramble_pixels ile aynı sonucu satır şeritleri halinde üretir.
+
+    Sonuç resmin tamamı bellekte oluşturulmaz; her şerit üretildiği anda
+    kodlanıp gönderilebilir (ör. akış halinde HTTP yanıtı).
+    """
+    return _iter_permuted_rows(image, key, band_pixels, scheme or LEGACY_SCHEME, False)
+
+
+def iter_unscrambled_rows(image, key, band_pixels=_MOVE_CHUNK, scheme=None):
+    """unscramble_pixels ile aynı sonucu satır şeritleri halinde üretir."""
+    return _iter_permuted_rows(image, key, band_pixels, scheme or LEGACY_SCHEME, True)
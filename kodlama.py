@@ -0,0 +1,388 @@
+import io
+import mmap
+import os
+import struct
+import zlib
+import cv2
+import numpy as np
+
+import kapsayici
+import olcumler
+
+# Desteklenen çıktı biçimleri: uzantı ve MIME türü
+OUTPUT_FORMATS = {
+    'png': ('.png', 'image/png'),
+    'tiff': ('.tiff', 'image/tiff'),
+    'npy': ('.npy', 'application/octet-stream'),
+    'gsif': (kapsayici.EXTENSION, 'application/octet-stream'),
+}
+DEFAULT_FORMAT = 'png'
+
+# Masaüstü dosya seçicilerinde açılabilen ve kaydedilebilen uzantılar (noktasız)
+PICKER_INPUT_EXTENSIONS = ['png', 'jpg', 'jpeg', 'bmp', 'tif', 'tiff', 'npy', 'gsif']
+PICKER_OUTPUT_EXTENSIONS = [extension[1:] for extension, _ in OUTPUT_FORMATS.values()]
+
+_NPY_MAGIC = b'\x93NUMPY'
+# Saydamlık kanalı veya 16 bit derinlik taşıyabilen biçimler (PNG, TIFF);
+# bunlar olduğu gibi (IMREAD_UNCHANGED) çözülür
+_UNCHANGED_MAGICS = (b'\x89PNG\r\n\x1a\n', b'II*\x00', b'MM\x00*')
+# Diğer biçimler (JPEG, BMP...) için EXIF yönünü uygulayan, gri resimleri
+# tek kanallı bırakan bayraklar
+_ORIENTED_FLAGS = cv2.IMREAD_ANYCOLOR | cv2.IMREAD_ANYDEPTH
+
+# Şifreleme şeması PNG çıktısında bu özel, yardımcı (ancillary) parçada
+# saklanır; resmi değiştiren düzenleyicilerin parçayı kopyalamaması için
+# "güvenli kopyalanamaz" olarak adlandırılmıştır
+SCHEME_CHUNK = b'siFR'
+_SCHEME_CHUNK_FORMAT = '>HIHI16s'
+
+# Şemayı saklayabilen çıktı biçimleri; tuzlu (Feistel) şemayla şifrelenen
+# resimler şema olmadan çözülemeyeceğinden yalnızca bunlara yazılabilir
+SCHEME_FORMATS = ('png', 'gsif')
+
+# Şifrelenebilen piksel türleri (PNG, TIFF ve kapsayıcı tarafından desteklenen)
+SUPPORTED_DTYPES = (np.dtype(np.uint8), np.dtype(np.uint16))
+
+
+def validate_output_options(output_format, compression):
+    """Çıktı biçimi ve sıkıştırma seviyesini doğrular, normalize eder."""
+    output_format = (output_format or DEFAULT_FORMAT).lower()
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Desteklenmeyen çıktı biçimi: {output_format}")
+
+    if compression is None or compression == '':
+        return output_format, None
+    try:
+        compression = int(compression)
+    except (TypeError, ValueError):
+        raise ValueError("Sıkıştırma seviyesi 0-9 arasında bir sayı olmalı")
+    if not 0 <= compression <= 9:
+        raise ValueError("Sıkıştırma seviyesi 0-9 arasında bir sayı olmalı")
+    return output_format, compression
+
+
+def validate_scheme_options(mode, tile_size=None):
+    """İstekteki karıştırma modunu doğrular ve kapsayici.Scheme döndürür.
+
+    mode 'pixel' (eski piksel karıştırma), 'tile' (blok karıştırma) veya
+    'feistel' (tablosuz permütasyon, her çağrıda yeni tuzla) olabilir; boşsa
+    None döner ve şema çözmede resmin kendisinden okunur, şifrelemede eski
+    piksel karıştırma kullanılır.
+    """
+    if not mode:
+        return None
+    mode = mode.lower()
+    if mode == 'pixel':
+        return kapsayici.LEGACY_SCHEME
+    if mode == 'feistel':
+        return kapsayici.feistel_scheme()
+    if mode != 'tile':
+        raise ValueError(f"Desteklenmeyen karıştırma modu: {mode}")
+    if tile_size is None or tile_size == '':
+        return kapsayici.tile_scheme()
+    try:
+        tile_size = int(tile_size)
+    except (TypeError, ValueError):
+        raise ValueError("Blok boyutu bir sayı olmalı")
+    return kapsayici.tile_scheme(tile_size)
+
+
+def check_scheme_format(scheme, output_format):
+    """Şifreli resmin şeması bu biçimde saklanamıyorsa ValueError fırlatır.
+
+    Eski ve blok karıştırma şemaları çözmede yeniden seçilebilir; Feistel
+    şemasının tuzu ise yalnızca resimde saklanır.
+    """
+    if (scheme is not None and scheme.algorithm == kapsayici.ALGORITHM_FEISTEL
+            and output_format not in SCHEME_FORMATS):
+        raise ValueError(f"Feistel modu {output_format} çıktısında kullanılamaz; "
+                         f"png veya gsif seçin")
+
+
+def decrypt_scheme(scheme, read_stored):
+    """Çözmede kullanılacak şemayı döndürür; read_stored() resimdeki şemayı okur.
+
+    Mod seçilmediyse (None) şema resimden okunur. Feistel modu seçildiyse
+    tuz ve KDF parametreleri yalnızca resimde bulunduğundan şema yine
+    resimden okunur ve Feistel şeması olduğu doğrulanır.
+    """
+    if scheme is None:
+        return read_stored()
+    if scheme.algorithm == kapsayici.ALGORITHM_FEISTEL:
+        scheme = read_stored()
+        if scheme.algorithm != kapsayici.ALGORITHM_FEISTEL:
+            raise ValueError("Resimde Feistel şeması bulunamadı")
+    return scheme
+
+
+def _scheme_chunks(scheme):
+    """Şifreleme şemasını saklayan PNG parçaları (eski şema için hiçbiri)."""
+    if scheme is None or scheme == kapsayici.LEGACY_SCHEME:
+        return []
+    return [(SCHEME_CHUNK, struct.pack(_SCHEME_CHUNK_FORMAT, *scheme))]
+
+
+def _insert_png_chunks(encoded, chunks):
+    """OpenCV'nin ürettiği PNG'ye parçaları IHDR'den hemen sonra ekler."""
+    if not chunks:
+        return encoded
+    # İmza (8) + IHDR parçası (4 uzunluk + 4 tür + 13 veri + 4 CRC)
+    ihdr_end = 33
+    extra = b''.join(
+        struct.pack('>I', len(data)) + chunk_type + data
+        + struct.pack('>I', zlib.crc32(chunk_type + data))
+        for chunk_type, data in chunks
+    )
+    return encoded[:ihdr_end] + extra + encoded[ihdr_end:]
+
+
+def read_scheme(image_data):
+    """Kodlanmış resimdeki şifreleme şemasını (kapsayici.Scheme) döndürür.
+
+    Şema kapsayıcı (gsif) başlığından veya PNG'deki şema parçasından
+    okunur; bilgi yoksa (eski şifreli resimler, TIFF, NPY) eski piksel
+    karıştırma şeması döner. Desteklenmeyen şemalarda ValueError fırlatır.
+    """
+    from akis_isleme import PNG_SIGNATURE
+
+    scheme = kapsayici.LEGACY_SCHEME
+    if kapsayici.is_container(image_data):
+        scheme = kapsayici.header_scheme(kapsayici.read_header(image_data))
+    elif bytes(image_data[:len(PNG_SIGNATURE)]) == PNG_SIGNATURE:
+        # Şema parçası IHDR'den sonra, piksel verisinden önce gelir
+        offset = len(PNG_SIGNATURE)
+        while offset + 8 <= len(image_data):
+            length, chunk_type = struct.unpack_from('>I4s', image_data, offset)
+            if chunk_type in (b'IDAT', b'IEND'):
+                break
+            if chunk_type == SCHEME_CHUNK and length == struct.calcsize(_SCHEME_CHUNK_FORMAT):
+                scheme = kapsayici.Scheme(*struct.unpack_from(_SCHEME_CHUNK_FORMAT, image_data,
+                                                              offset + 8))
+                break
+            offset += 12 + length
+    kapsayici.check_scheme(scheme)
+    return scheme
+
+
+def read_file_scheme(path):
+    """read_scheme gibi çalışır; dosyayı belleğe okumadan eşler."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return kapsayici.LEGACY_SCHEME
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return read_scheme(mapped)
+
+
+def encode_image(image, output_format=DEFAULT_FORMAT, compression=None, scheme=None):
+    """Resmi kayıpsız bir biçimde kodlar ve baytlarını döndürür.
+
+    compression yalnızca PNG için geçerlidir (0: sıkıştırma yok, 9: en
+    yüksek); None ise OpenCV varsayılanı kullanılır. Karıştırılmış
+    pikseller neredeyse sıkıştırılamadığından TIFF (sıkıştırmasız), NPY ve
+    ham piksel kapsayıcısı (gsif) çok daha hızlı kodlanır.
+
+    scheme verilirse (şifreli resimler) kapsayıcı başlığına veya PNG şema
+    parçasına yazılır; TIFF ve NPY şemayı saklayamaz.
+    """
+    with olcumler.stage('encode'):
+        return _encode(image, output_format, compression, scheme)
+
+
+def _encode(image, output_format, compression, scheme=None):
+    check_scheme_format(scheme, output_format)
+    if output_format == 'gsif':
+        return kapsayici.pack_container(image, **(scheme or kapsayici.LEGACY_SCHEME)._asdict())
+
+    if output_format == 'npy':
+        buffer = io.BytesIO()
+        np.save(buffer, image, allow_pickle=False)
+        return buffer.getvalue()
+
+    if output_format == 'tiff':
+        result, encoded_img = cv2.imencode('.tiff', image, [cv2.IMWRITE_TIFF_COMPRESSION, 1])
+    else:
+        params = [] if compression is None else [cv2.IMWRITE_PNG_COMPRESSION, compression]
+        result, encoded_img = cv2.imencode('.png', image, params)
+
+    if not result:
+        raise ValueError("Resim kodlama işlemi başarısız")
+    if output_format == 'png':
+        return _insert_png_chunks(encoded_img.tobytes(), _scheme_chunks(scheme))
+    return encoded_img.tobytes()
+
+
+class ChunkSink:
+    """write() ile gelen baytları biriktirir; take() ile boşaltılır.
+
+    Akış halindeki yanıtlarda dosya benzeri bir nesne bekleyen yazıcılara
+    (PngBandWriter, zipfile) hedef olarak verilir.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_encoded(bands, shape, dtype, output_format=DEFAULT_FORMAT, compression=None,
+                 adaptive_filter=False, scheme=None):
+    """Satır şeritlerini kodlar ve çıktıyı parça parça bayt olarak üretir.
+
+    PNG, NPY ve kapsayıcı (gsif) çıktısı şeritler geldikçe üretilir; bellekte
+    hiçbir zaman resmin tamamının kodlanmış hali tutulmaz. TIFF akış halinde
+    yazılamadığından önce tamamı toplanıp encode_image ile kodlanır.
+    compression None ise PNG, OpenCV varsayılanı gibi hızlı (seviye 1, RLE)
+    sıkıştırılır; adaptive_filter satır filtresi seçimini açar. scheme,
+    encode_image'deki gibi çıktıya yazılır.
+    """
+    from akis_isleme import PngBandWriter
+
+    check_scheme_format(scheme, output_format)
+    # Şeritler arasında piksel taşıma yapıldığından yalnızca kodlama
+    # süreleri toplanıp sonunda tek bir ölçüm olarak kaydedilir
+    timer = olcumler.Stopwatch()
+    dtype = np.dtype(dtype)
+    try:
+        if output_format == 'png':
+            sink = ChunkSink()
+            if compression is None:
+                level, strategy = 1, zlib.Z_RLE
+            else:
+                level, strategy = compression, zlib.Z_DEFAULT_STRATEGY
+            with timer:
+                writer = PngBandWriter(sink, shape[1], shape[0], shape[2] if len(shape) == 3 else 1,
+                                       dtype, level, strategy, adaptive_filter,
+                                       _scheme_chunks(scheme))
+            for band in bands:
+                with timer:
+                    writer.write(band)
+                    chunk = sink.take()
+                yield chunk
+            with timer:
+                writer.close()
+                chunk = sink.take()
+            yield chunk
+            return
+
+        if output_format == 'tiff':
+            image = np.concatenate(list(bands)) if shape[0] else np.empty(shape, dtype)
+            with timer:
+                chunk = _encode(image, output_format, compression, scheme)
+            yield chunk
+            return
+
+        if output_format == 'gsif':
+            yield kapsayici.pack_header(shape, dtype, **(scheme or kapsayici.LEGACY_SCHEME)._asdict())
+        else:
+            header = io.BytesIO()
+            np.lib.format.write_array_header_1_0(header, {
+                'descr': np.lib.format.dtype_to_descr(dtype),
+                'fortran_order': False,
+                'shape': tuple(shape),
+            })
+            yield header.getvalue()
+        for band in bands:
+            with timer:
+                chunk = np.ascontiguousarray(band).tobytes()
+            yield chunk
+    finally:
+        olcumler.observe_stage('encode', timer.elapsed)
+
+
+def decode_image(image_data, flags=None):
+    """Resim baytlarını çözer; NPY verisi kopyalanmadan okunur.
+
+    Resim çözülemezse None döndürür (cv2.imdecode gibi). Kapsayıcı
+    (gsif) verisinde pikseller verinin kendisine bakan bir görünümdür.
+    flags verilmezse gri resimler tek kanallı kalır; PNG ve TIFF olduğu
+    gibi çözülür (saydamlık kanalı ve 16 bit derinlik korunur), JPEG gibi
+    diğer biçimlerde EXIF yönü uygulanır. uint8/uint16 dışındaki türler
+    (ör. kayan noktalı TIFF) 8 bit BGR'ye çevrilir.
+    """
+    with olcumler.stage('decode'):
+        return _decode(image_data, flags)
+
+
+def _decode(image_data, flags):
+    if kapsayici.is_container(image_data):
+        header, pixels = kapsayici.unpack_container(image_data)
+        _check_algorithm(header)
+        return pixels
+
+    if bytes(image_data[:len(_NPY_MAGIC)]) == _NPY_MAGIC:
+        buffer = io.BytesIO(image_data)
+        version = np.lib.format.read_magic(buffer)
+        if version == (1, 0):
+            header = np.lib.format.read_array_header_1_0(buffer)
+        else:
+            header = np.lib.format.read_array_header_2_0(buffer)
+        shape, fortran_order, dtype = header
+        if fortran_order or dtype.hasobject:
+            return None
+        return np.frombuffer(image_data, dtype=dtype, count=int(np.prod(shape)),
+                             offset=buffer.tell()).reshape(shape)
+
+    if flags is None:
+        magic = bytes(image_data[:8])
+        unchanged = any(magic.startswith(prefix) for prefix in _UNCHANGED_MAGICS)
+        flags = cv2.IMREAD_UNCHANGED if unchanged else _ORIENTED_FLAGS
+    nparr = np.frombuffer(image_data, np.uint8)
+    image = cv2.imdecode(nparr, flags)
+    if image is not None and image.dtype not in SUPPORTED_DTYPES:
+        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    return image
+
+
+def _check_algorithm(header):
+    kapsayici.check_scheme(kapsayici.header_scheme(header))
+
+
+def format_for_path(path):
+    """Dosya uzantısına göre çıktı biçimini seçer (bilinmiyorsa PNG)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.tif':
+        return 'tiff'
+    for output_format, (format_extension, _) in OUTPUT_FORMATS.items():
+        if extension == format_extension:
+            return output_format
+    return DEFAULT_FORMAT
+
+
+def read_image_file(path):
+    """Resim dosyasını okur; kapsayıcı dosyaları kopyalanmadan eşlenir."""
+    with open(path, 'rb') as f:
+        magic = f.read(len(kapsayici.MAGIC))
+    if kapsayici.is_container(magic):
+        header, pixels = kapsayici.open_container(path)
+        _check_algorithm(header)
+        return pixels
+
+    # OpenCV'nin Türkçe karakter sorunu için dosya Python ile okunur
+    with open(path, 'rb') as f:
+        image_data = f.read()
+    return decode_image(image_data)
+
+
+def write_image_file(path, image, output_format=None, compression=None, scheme=None):
+    """Resmi dosyaya yazar; biçim verilmezse uzantıdan seçilir.
+
+    scheme, encode_image'deki gibi şifreli resmin şemasını saklar.
+    """
+    output_format = output_format or format_for_path(path)
+    check_scheme_format(scheme, output_format)
+    if output_format == 'gsif':
+        kapsayici.write_container(path, image, **(scheme or kapsayici.LEGACY_SCHEME)._asdict())
+        return
+    encoded = encode_image(image, output_format, compression, scheme)
+    with open(path, 'wb') as f:
+        f.write(encoded)
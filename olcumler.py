@@ -0,0 +1,272 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Süre histogramlarının kova sınırları (saniye)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key, value):
+        return [f'{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}']
+
+
+class Counter(_Metric):
+    """Yalnızca artan sayaç."""
+
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Artıp azalabilen anlık değer."""
+
+    type = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Kovalı dağılım (Prometheus histogramı)."""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def _render_value(self, key, value):
+        counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            labels = _format_labels(self.label_names, key, [('le', _format_value(bound))])
+            lines.append(f'{self.name}_bucket{labels} {cumulative}')
+        labels = _format_labels(self.label_names, key, [('le', '+Inf')])
+        lines.append(f'{self.name}_bucket{labels} {count}')
+        labels = _format_labels(self.label_names, key)
+        lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+        lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Registry:
+    """Metrikleri ve toplama anında değer üreten toplayıcıları tutar."""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        """collector() (ad, tür, açıklama, değer) dörtlülerinin listesini döndürür."""
+        self._collectors.append(collector)
+
+    def render(self):
+        """Prometheus metin biçiminde tüm metrikleri döndürür."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, metric_type, documentation, value in collector():
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                lines.append(f'{name} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+REQUESTS = registry.register(Counter(
+    'sifreleme_requests_total', 'İşlenen HTTP istekleri', ('endpoint', 'status')))
+REQUEST_SECONDS = registry.register(Histogram(
+    'sifreleme_request_duration_seconds', 'İsteğin başından yanıtın sonuna kadar geçen süre',
+    ('endpoint',)))
+IN_FLIGHT = registry.register(Gauge(
+    'sifreleme_requests_in_flight', 'Şu anda işlenen istekler'))
+STAGE_SECONDS = registry.register(Histogram(
+    'sifreleme_stage_duration_seconds',
+    'Aşama süreleri (upload, decode, permutation, pixel_move, encode, response)', ('stage',)))
+BYTES_IN = registry.register(Counter(
+    'sifreleme_received_bytes_total', 'Alınan istek gövdesi baytları'))
+BYTES_OUT = registry.register(Counter(
+    'sifreleme_sent_bytes_total', 'Gönderilen yanıt gövdesi baytları'))
+PIXELS = registry.register(Counter(
+    'sifreleme_pixels_total', 'Taşınan pikseller', ('operation',)))
+CACHE_LOOKUPS = registry.register(Counter(
+    'sifreleme_permutation_cache_lookups_total', 'Permütasyon önbelleği aramaları', ('result',)))
+
+
+def _cache_hit_ratio():
+    hits = CACHE_LOOKUPS.value(result='hit')
+    misses = CACHE_LOOKUPS.value(result='miss')
+    total = hits + misses
+    return [('sifreleme_permutation_cache_hit_ratio', 'gauge',
+             'Permütasyon önbelleği isabet oranı', hits / total if total else 0.0)]
+
+
+registry.register_collector(_cache_hit_ratio)
+
+_local = threading.local()
+
+
+def observe_stage(name, seconds):
+    """Bir aşamanın süresini kaydeder."""
+    STAGE_SECONDS.observe(seconds, stage=name)
+    captured = getattr(_local, 'captured', None)
+    if captured is not None:
+        captured.append(('stage', name, seconds))
+
+
+def count_pixels(operation, pixels):
+    """İşlenen piksel sayısını kaydeder."""
+    PIXELS.inc(pixels, operation=operation)
+    captured = getattr(_local, 'captured', None)
+    if captured is not None:
+        captured.append(('pixels', operation, pixels))
+
+
+def count_cache_lookup(hit):
+    """Permütasyon önbelleği aramasının sonucunu kaydeder."""
+    result = 'hit' if hit else 'miss'
+    CACHE_LOOKUPS.inc(result=result)
+    captured = getattr(_local, 'captured', None)
+    if captured is not None:
+        captured.append(('cache', result, 1))
+
+
+@contextmanager
+def stage(name):
+    """with bloğunun süresini verilen aşama adıyla kaydeder."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(name, time.perf_counter() - started)
+
+
+class Stopwatch:
+    """Birden çok with bloğunun toplam süresini biriktirir.
+
+    Akış halindeki işlerde bir aşama başka işlerle iç içe geçtiğinde (ör.
+    şeritler arasında kodlama) yalnızca o aşamanın süresini ölçmek için.
+    """
+
+    def __init__(self):
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed += time.perf_counter() - self._started
+
+
+@contextmanager
+def capture():
+    """Bu iş parçacığındaki ölçümleri ayrıca bir listeye toplar.
+
+    İşçi süreçler ölçümlerini bu listeyle ana sürece döndürür; ana süreç
+    replay() ile kendi metriklerine ekler.
+    """
+    previous = getattr(_local, 'captured', None)
+    _local.captured = observations = []
+    try:
+        yield observations
+    finally:
+        _local.captured = previous
+
+
+def replay(observations):
+    """capture() ile başka bir süreçte toplanan ölçümleri kaydeder."""
+    for kind, name, value in observations:
+        if kind == 'stage':
+            observe_stage(name, value)
+        elif kind == 'cache':
+            count_cache_lookup(name == 'hit')
+        else:
+            count_pixels(name, value)
+
+
+def stage_totals(observations):
+    """Ölçüm listesinden aşama başına toplam süreyi hesaplar."""
+    totals = {}
+    for kind, name, value in observations:
+        if kind == 'stage':
+            totals[name] = totals.get(name, 0.0) + value
+    return totals
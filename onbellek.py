@@ -0,0 +1,113 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+class PermutationCache:
+    """Permütasyon dizileri için bayt sınırlı LRU önbelleği.
+
+    Girdiler (tohum, piksel sayısı) ile anahtarlanır. Her girdi ileri
+    permütasyonu ve gerektiğinde hesaplanan tersini uint32 dizisi olarak
+    tutar. Toplam boyut max_bytes'ı aşınca en uzun süre kullanılmayan
+    girdiler atılır. observer verilirse her aramada observer(isabet_mi)
+    çağrılır (ör. metrikler için).
+    """
+
+    def __init__(self, factory, max_bytes, observer=None):
+        self._factory = factory
+        self._observer = observer
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, seed, pixel_count, inverse=False):
+        """Permütasyonu (veya tersini) döndürür; yoksa üretip saklar.
+
+        Aynı girdiyi aynı anda isteyen iş parçacıklarından yalnızca biri
+        üretim yapar, diğerleri onun sonucunu bekler.
+        """
+        key = (seed, pixel_count)
+        kind = 'inverse' if inverse else 'forward'
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and kind in entry:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    result = entry[kind]
+                    break
+                pending = self._pending.get((key, kind))
+                if pending is None:
+                    self.misses += 1
+                    forward = entry.get('forward') if entry is not None else None
+                    pending = self._pending[(key, kind)] = threading.Event()
+                    result = None
+                    break
+            # Başka bir iş parçacığı üretiyor; bitince önbellekten okunur
+            pending.wait()
+
+        if self._observer is not None:
+            self._observer(result is not None)
+        if result is not None:
+            return result
+
+        try:
+            # Üretim kilit dışında yapılır; diğer istekler beklemez
+            if forward is None:
+                forward = self._factory(seed, pixel_count)
+                forward.setflags(write=False)
+            if inverse:
+                result = np.empty_like(forward)
+                result[forward] = np.arange(pixel_count, dtype=forward.dtype)
+                result.setflags(write=False)
+            else:
+                result = forward
+
+            with self._lock:
+                self._store(key, 'forward', forward)
+                if inverse:
+                    self._store(key, 'inverse', result)
+                self._evict()
+            return result
+        finally:
+            with self._lock:
+                del self._pending[(key, kind)]
+            pending.set()
+
+    def _store(self, key, kind, array):
+        entry = self._entries.setdefault(key, {})
+        if kind not in entry:
+            entry[kind] = array
+            self._bytes += array.nbytes
+        self._entries.move_to_end(key)
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= sum(array.nbytes for array in entry.values())
+
+    def clear(self):
+        """Önbelleği boşaltır ve sayaçları sıfırlar."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Önbellek durumunu sözlük olarak döndürür."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
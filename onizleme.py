@@ -0,0 +1,78 @@
+import os
+import threading
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+# Önizleme kutuları 150×150; yüksek DPI ekranlar için iki katı üretilir
+THUMBNAIL_SIZE = 300
+JPEG_QUALITY = 85
+
+
+def make_thumbnail(image, size=THUMBNAIL_SIZE):
+    """Resmi en uzun kenarı size olacak şekilde küçültüp JPEG baytları döndürür.
+
+    Küçültme alan ortalamasıyla (INTER_AREA) yapılır; hem hızlıdır hem de
+    karıştırılmış resimlerde kenar yumuşatma hatası oluşturmaz. 16 bit
+    resimler önizleme için 8 bite indirilir; saydamlık kanalı olan
+    resimler saydamlık korunsun diye PNG olarak kodlanır.
+    """
+    height, width = image.shape[:2]
+    scale = size / max(height, width, 1)
+    if scale < 1:
+        image = cv2.resize(
+            image,
+            (max(1, round(width * scale)), max(1, round(height * scale))),
+            interpolation=cv2.INTER_AREA
+        )
+    if image.dtype == np.uint16:
+        image = (image >> 8).astype(np.uint8)
+    if image.ndim == 3 and image.shape[2] == 4:
+        result, encoded = cv2.imencode('.png', image)
+    else:
+        result, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    if not result:
+        raise ValueError("Önizleme oluşturulamadı")
+    return encoded.tobytes()
+
+
+class ThumbnailCache:
+    """Dosya önizlemeleri için LRU önbelleği.
+
+    Girdiler dosya yolu, değiştirilme zamanı ve boyutu ile anahtarlanır;
+    dosya değişince eski önizleme kullanılmaz. Önizlemeler küçük olduğundan
+    sınır girdi sayısı olarak verilir.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path):
+        stat = os.stat(path)
+        return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+    def get(self, path, load_image):
+        """path'in önizlemesini döndürür; yoksa load_image() ile üretip saklar."""
+        key = self._key(path)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                return data
+
+        data = make_thumbnail(load_image())
+        with self._lock:
+            self._entries[key] = data
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+thumbnail_cache = ThumbnailCache()
@@ -0,0 +1,101 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+import olcumler
+
+# Bu başlığı "1" olarak gönderen istek profillenir
+HEADER = 'X-Sifreleme-Profil'
+
+# tracemalloc tüm süreç için ortak olduğundan aynı anda tek istek profillenir
+_lock = threading.Lock()
+
+
+def requested(header_value):
+    """İstek profillenmeli mi?
+
+    Profil dizini (SIFRELEME_PROFIL_DIZINI) ayarlı değilse özellik
+    tamamen kapalıdır ve başlık yok sayılır. SIFRELEME_PROFIL=1 ise tüm
+    istekler, değilse yalnızca başlığı gönderen istekler profillenir.
+    """
+    if not os.environ.get('SIFRELEME_PROFIL_DIZINI'):
+        return False
+    return os.environ.get('SIFRELEME_PROFIL') == '1' or header_value == '1'
+
+
+@contextmanager
+def profile(label):
+    """with bloğunu cProfile ve tracemalloc ile profiller.
+
+    Blok, sözlük olarak verilen ayrıntıları (ör. resim boyutu) doldurabilir.
+    Bitince profil dizininde yeni bir klasöre cProfile çıktısı (profil.prof),
+    bellek ayırma özeti (bellek.txt), en pahalı fonksiyonlar (fonksiyonlar.txt)
+    ve aşama süreleriyle ayrıntılar (ozet.json) yazılır; blok hata verirse
+    rapor hata iletisiyle yine yazılır. Başka bir istek
+    profilleniyorsa blok profillenmeden çalışır.
+    """
+    details = {}
+    if not _lock.acquire(blocking=False):
+        yield details
+        return
+
+    profiler = cProfile.Profile()
+    error = None
+    try:
+        tracemalloc.start()
+        with olcumler.capture() as observations:
+            started = time.perf_counter()
+            profiler.enable()
+            try:
+                yield details
+            except BaseException as e:
+                error = str(e) or type(e).__name__
+                raise
+            finally:
+                profiler.disable()
+                elapsed = time.perf_counter() - started
+                snapshot = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                # Blok hata verse de rapor hatayla birlikte yazılır
+                _write_report(label, details, profiler, snapshot, peak, elapsed, observations,
+                              error)
+    finally:
+        _lock.release()
+
+
+def _write_report(label, details, profiler, snapshot, peak, elapsed, observations, error):
+    directory = os.path.join(
+        os.environ['SIFRELEME_PROFIL_DIZINI'],
+        f"{time.strftime('%Y%m%d-%H%M%S')}_{label}_{uuid.uuid4().hex[:8]}"
+    )
+    os.makedirs(directory, exist_ok=True)
+
+    profiler.dump_stats(os.path.join(directory, 'profil.prof'))
+
+    functions = io.StringIO()
+    pstats.Stats(profiler, stream=functions).sort_stats('cumulative').print_stats(40)
+    with open(os.path.join(directory, 'fonksiyonlar.txt'), 'w', encoding='utf-8') as f:
+        f.write(functions.getvalue())
+
+    with open(os.path.join(directory, 'bellek.txt'), 'w', encoding='utf-8') as f:
+        for statistic in snapshot.statistics('lineno')[:40]:
+            f.write(f"{statistic}\n")
+
+    summary = dict(details)
+    summary.update({
+        'label': label,
+        'total_seconds': elapsed,
+        'stage_seconds': olcumler.stage_totals(observations),
+        'peak_traced_bytes': peak,
+        'error': error,
+    })
+    with open(os.path.join(directory, 'ozet.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,70 @@
+import base64
+
+from karistirma import scramble_pixels, unscramble_pixels
+from kodlama import read_file_scheme, read_image_file, write_image_file
+from onizleme import make_thumbnail, thumbnail_cache
+
+
+class ImageSession:
+    """Masaüstü uygulamasında seçilen tek bir resmin bellek içi durumu.
+
+    Girdi dosyası bir kez okunup çözülür; şifreleme/çözme bu piksel
+    tamponundan yapılır, sonuç bir kez kodlanıp diske yazılır. Önizlemeler
+    diskten tekrar okunmadan bellekteki piksellerden küçültülerek üretilir
+    ve dosya yolu ile değiştirilme zamanına göre önbellekte tutulur.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.result = None
+        self._saved_path = None
+        # .gsif kapsayıcıları kod çözme yapılmadan eşlenir
+        self.image = read_image_file(path)
+        if self.image is None:
+            raise ValueError(f"Resim yüklenemedi: {path}")
+        # Şifreli resmin karıştırma şeması (bilgi yoksa eski piksel karıştırma)
+        self.scheme = read_file_scheme(path)
+
+    def encrypt(self, key, progress=None):
+        """Resmi şifreler; sonuç self.result'ta tutulur.
+
+        progress, scramble_pixels'e verilir (ilerleme ve iptal için).
+        """
+        self._set_result(scramble_pixels(self.image, key, progress=progress))
+        return self.result
+
+    def decrypt(self, key, progress=None):
+        """Şifreli resmi çözer; sonuç self.result'ta tutulur."""
+        self._set_result(unscramble_pixels(self.image, key, progress=progress, scheme=self.scheme))
+        return self.result
+
+    def _set_result(self, result):
+        self.result = result
+        self._saved_path = None
+
+    def save(self, path, output_format=None, compression=None):
+        """Sonucu dosyaya yazar; biçim verilmezse uzantıdan seçilir."""
+        if self.result is None:
+            raise ValueError("Kaydedilecek sonuç yok")
+        write_image_file(path, self.result, output_format, compression)
+        self._saved_path = path
+
+    def source_preview(self):
+        """Girdi resminin küçük önizlemesini base64 olarak döndürür."""
+        return _base64(thumbnail_cache.get(self.path, lambda: self.image))
+
+    def result_preview(self):
+        """Sonucun küçük önizlemesini base64 olarak döndürür (sonuç yoksa None)."""
+        if self.result is None:
+            return None
+        if self._saved_path is None:
+            return _base64(make_thumbnail(self.result))
+        return _base64(thumbnail_cache.get(self._saved_path, lambda: self.result))
+
+    def close(self):
+        """Piksel tamponlarını bırakır."""
+        self.image = self.result = None
+
+
+def _base64(data):
+    return base64.b64encode(data).decode('utf-8')
@@ -1,56 +1,42 @@
 import flet as ft
-import cv2
-import numpy as np
-import random
 import pathlib
 import os
 import locale
 
+from arka_plan import BackgroundTask, TaskCancelled
+from kodlama import (PICKER_INPUT_EXTENSIONS, PICKER_OUTPUT_EXTENSIONS, read_image_file,
+                     write_image_file)
+from karistirma import scramble_pixels
+
 # Sistem yerel ayarlarını kullan
 locale.setlocale(locale.LC_ALL, '')
 
-def encrypt_image(input_image_path, output_image_path, key):
-    """Resmi şifreler."""
+def encrypt_image(input_image_path, output_image_path, key, task=None):
+    """Resmi şifreler.
+
+    task (BackgroundTask) verilirse piksel taşıma ilerlemesi bildirilir;
+    iş iptal edilirse dosya yazılmadan TaskCancelled fırlatılır.
+    """
     # Türkçe karakterleri içeren dosya yollarını düzgün işlemek için
     try:
         # OpenCV'nin Türkçe karakter sorunu için alternatif yöntem
-        with open(input_image_path, 'rb') as f:
-            image_data = f.read()
-        
-        # Numpy array'e çevir ve OpenCV ile decode et
-        nparr = np.frombuffer(image_data, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        # (.gsif kapsayıcıları kod çözme yapılmadan doğrudan eşlenir)
+        image = read_image_file(input_image_path)
         
         if image is None:
             print(f"Hata: Resim yüklenemedi: {input_image_path}")
             return False
             
-        height, width, channels = image.shape
-
-        key_bytes = [ord(k) for k in key]
-        seed = sum(key_bytes)
-        random.seed(seed)
-
-        pixel_indices = list(range(height * width))
-        random.shuffle(pixel_indices)
-
-        flat_image = image.reshape(-1, 3)
-        encrypted_flat_image = np.zeros_like(flat_image)
-
-        for i in range(len(pixel_indices)):
-            encrypted_flat_image[i] = flat_image[pixel_indices[i]]
-
-        encrypted_image = encrypted_flat_image.reshape(height, width, channels)
+        encrypted_image = scramble_pixels(image, key, progress=task.progress if task is not None else None)
+        if task is not None:
+            task.check()
         
         # Türkçe karakterli dosya yolları için alternatif kaydetme yöntemi
-        # PNG formatı kullanarak kayıpsız sıkıştırma
-        result, encoded_img = cv2.imencode('.png', encrypted_image)
-        if result:
-            with open(output_image_path, 'wb') as f:
-                f.write(encoded_img.tobytes())
-            return True
-        else:
-            return False
+        # Uzantıya göre PNG (varsayılan, kayıpsız) veya .gsif kapsayıcısı
+        write_image_file(output_image_path, encrypted_image)
+        return True
+    except TaskCancelled:
+        raise
     except Exception as e:
         print(f"Şifreleme işlemi sırasında hata oluştu: {e}")
         return False
@@ -59,7 +45,7 @@ def main(page: ft.Page):
     """Ana uygulama fonksiyonu."""
     page.title = "Resim Şifreleme"
     page.window_width = 400
-    page.window_height = 200
+    page.window_height = 280
     page.window_center()
     page.horizontal_alignment = "center"
     page.vertical_alignment = "center"
@@ -68,12 +54,17 @@ def main(page: ft.Page):
     key_text = ft.TextField(label="Şifreleme Anahtarı", password=True)
     file_picker = ft.FilePicker()
     page.overlay.append(file_picker)
+    # İşlem arka planda yapılır; ilerleme ve iptal için
+    progress_bar = ft.ProgressBar(width=300, visible=False)
+    status_text = ft.Text("", size=12)
+    cancel_button = ft.ElevatedButton("İptal", visible=False)
+    task = None
 
     def pick_image(e):
         """Dosya seçme diyaloğunu açar."""
         file_picker.pick_files(
             allow_multiple=False,
-            allowed_extensions=["png", "jpg", "jpeg", "bmp", "gif"]
+            allowed_extensions=PICKER_INPUT_EXTENSIONS
         )
 
     def image_selected(e):
@@ -89,11 +80,16 @@ def main(page: ft.Page):
     def encrypt_and_save(e):
         """Resmi şifreler ve kaydetme diyaloğunu açar."""
         nonlocal image_path
+        if task is not None and task.running:
+            page.snack_bar = ft.SnackBar(content=ft.Text("Önceki işlem henüz bitmedi!"))
+            page.snack_bar.open = True
+            page.update()
+            return
         if image_path and key_text.value:
             save_file_dialog.save_file(
                 file_name="encrypted_image.png",
                 initial_directory=str(pathlib.Path.home()),
-                allowed_extensions=["png"],
+                allowed_extensions=PICKER_OUTPUT_EXTENSIONS,
             )
         else:
             page.snack_bar = ft.SnackBar(content=ft.Text("Resim ve şifre girin!"))
@@ -102,15 +98,56 @@ def main(page: ft.Page):
 
     def save_encrypted_image(e):
         """Şifrelenmiş resmi kaydeder."""
-        nonlocal image_path
+        nonlocal image_path, task
         if e.path:
-            success = encrypt_image(image_path, e.path, key_text.value)
-            if success:
-                page.snack_bar = ft.SnackBar(content=ft.Text(f"Resim şifrelendi ve {e.path} konumuna kaydedildi!"))
-            else:
-                page.snack_bar = ft.SnackBar(content=ft.Text("Resim şifreleme işlemi başarısız oldu!"))
-            page.snack_bar.open = True
+            output_path = e.path
+            key = key_text.value
+
+            def on_progress(fraction):
+                if fraction >= 1:
+                    progress_bar.value = None
+                    status_text.value = "Kaydediliyor..."
+                else:
+                    progress_bar.value = fraction
+                    status_text.value = f"Pikseller taşınıyor... %{fraction * 100:.0f}"
+                page.update()
+
+            def finish(message):
+                progress_bar.visible = False
+                cancel_button.visible = False
+                status_text.value = ""
+                page.snack_bar = ft.SnackBar(content=ft.Text(message))
+                page.snack_bar.open = True
+                page.update()
+
+            def on_done(success):
+                if success:
+                    finish(f"Resim şifrelendi ve {output_path} konumuna kaydedildi!")
+                else:
+                    finish("Resim şifreleme işlemi başarısız oldu!")
+
+            # Permütasyon hazırlanırken ilerleme belirsizdir
+            progress_bar.value = None
+            progress_bar.visible = True
+            cancel_button.visible = True
+            cancel_button.disabled = False
+            status_text.value = "Hazırlanıyor..."
+            page.update()
+            task = BackgroundTask(
+                lambda current: encrypt_image(image_path, output_path, key, current),
+                on_progress=on_progress,
+                on_done=on_done,
+                on_cancel=lambda: finish("İşlem iptal edildi, dosya kaydedilmedi.")
+            ).start()
+
+    def cancel_task(e):
+        """Çalışan işi iptal eder; iş bir sonraki dilimde durur."""
+        if task is not None and task.running:
+            task.cancel()
+            cancel_button.disabled = True
+            status_text.value = "İptal ediliyor..."
             page.update()
+    cancel_button.on_click = cancel_task
     
     save_file_dialog = ft.FilePicker()
     save_file_dialog.on_result = save_encrypted_image
@@ -126,6 +163,9 @@ def main(page: ft.Page):
                 ft.ElevatedButton("Resim Seç", on_click=pick_image),
                 key_text,
                 ft.ElevatedButton("Şifrele ve Kaydet", on_click=encrypt_and_save),
+                progress_bar,
+                status_text,
+                cancel_button,
             ],
             alignment="center",
             horizontal_alignment="center",
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Modüller depo kökünde; testler her dizinden çalıştırılabilsin
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# API testleri istekleri süreç havuzu olmadan, aynı süreçte işler
+os.environ.setdefault('SIFRELEME_ISCI_SAYISI', '0')
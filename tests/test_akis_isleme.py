@@ -0,0 +1,156 @@
+import struct
+import zlib
+
+import cv2
+import numpy as np
+import pytest
+
+import akis_isleme
+import kapsayici
+from akis_isleme import (PngBandReader, PngBandWriter, decrypt_file_streaming,
+                         encrypt_file_streaming)
+from karistirma import scramble_pixels
+
+KEY = 'gizli'
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def _chunk(chunk_type, data):
+    return (struct.pack('>I', len(data)) + chunk_type + data
+            + struct.pack('>I', zlib.crc32(chunk_type + data)))
+
+
+def _filter(line, prev, bpp, filter_type):
+    """Satırı PNG belirtimindeki tanımla (vektörleştirmeden bağımsız) filtreler."""
+    line = line.astype(np.int32)
+    prev = prev.astype(np.int32)
+    left = np.zeros_like(line)
+    left[bpp:] = line[:-bpp]
+    upper_left = np.zeros_like(line)
+    upper_left[bpp:] = prev[:-bpp]
+    if filter_type == 0:
+        predicted = 0
+    elif filter_type == 1:
+        predicted = left
+    elif filter_type == 2:
+        predicted = prev
+    elif filter_type == 3:
+        predicted = (left + prev) >> 1
+    else:
+        estimate = left + prev - upper_left
+        pa, pb, pc = (np.abs(estimate - left), np.abs(estimate - prev),
+                      np.abs(estimate - upper_left))
+        predicted = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, prev, upper_left))
+    return ((line - predicted) & 0xFF).astype(np.uint8)
+
+
+def make_png(raw, width, depth, color_type, filter_types, palette=None):
+    """Ham satırları verilen filtre türleriyle PNG'ye kodlar."""
+    channels = CHANNELS[color_type]
+    bpp = max(1, channels * depth // 8)
+    prev = np.zeros(raw.shape[1], dtype=np.uint8)
+    data = bytearray()
+    for line, filter_type in zip(raw, filter_types):
+        data.append(filter_type)
+        data += _filter(line, prev, bpp, filter_type).tobytes()
+        prev = line
+    header = struct.pack('>IIBBBBB', width, len(raw), depth, color_type, 0, 0, 0)
+    return (akis_isleme.PNG_SIGNATURE + _chunk(b'IHDR', header)
+            + (_chunk(b'PLTE', palette) if palette is not None else b'')
+            + _chunk(b'IDAT', zlib.compress(bytes(data))) + _chunk(b'IEND', b''))
+
+
+def filter_pattern(name, rows, rng):
+    if name == 'mixed':
+        return [int(value) for value in rng.integers(0, 5, rows)]
+    return [int(name)] * rows
+
+
+def read_bands(path, band_rows=7):
+    with PngBandReader(path) as reader:
+        return np.concatenate(list(reader.bands(band_rows)))
+
+
+@pytest.mark.parametrize('color_type, depth', [
+    (0, 1), (0, 4), (0, 8), (0, 16), (2, 8), (2, 16), (3, 8), (4, 8), (4, 16), (6, 8), (6, 16),
+])
+@pytest.mark.parametrize('filters', ['0', '1', '2', '3', '4', 'mixed'])
+@pytest.mark.parametrize('block_bytes', [1 << 25, 200])
+def test_reader_matches_opencv(tmp_path, monkeypatch, color_type, depth, filters, block_bytes):
+    # Küçük bloklarla köşegen çözme blok sınırlarını da geçer
+    monkeypatch.setattr(akis_isleme, '_UNFILTER_BLOCK_BYTES', block_bytes)
+    rng = np.random.default_rng(color_type * 100 + depth)
+    height, width = 23, 31
+    stride = (width * CHANNELS[color_type] * depth + 7) // 8
+    high = 4 if color_type == 3 else 256
+    raw = rng.integers(0, high, (height, stride), dtype=np.uint8)
+    palette = bytes(range(12)) if color_type == 3 else None
+    data = make_png(raw, width, depth, color_type, filter_pattern(filters, height, rng), palette)
+    path = tmp_path / 'resim.png'
+    path.write_bytes(data)
+
+    expected = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_UNCHANGED)
+    result = read_bands(str(path))
+    assert result.dtype == expected.dtype
+    assert np.array_equal(result, expected)
+
+
+@pytest.mark.parametrize('filters', ['3', '4', 'mixed'])
+def test_average_and_paeth_long_rows(tmp_path, filters):
+    """Köşegen yol satır uzunluğu yükseklikten çok büyükken de doğru olmalı."""
+    rng = np.random.default_rng(1)
+    height, width = 5, 3000
+    raw = rng.integers(0, 256, (height, width * 3), dtype=np.uint8)
+    data = make_png(raw, width, 8, 2, filter_pattern(filters, height, rng))
+    path = tmp_path / 'genis.png'
+    path.write_bytes(data)
+    assert np.array_equal(read_bands(str(path), 2),
+                          cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_UNCHANGED))
+
+
+def test_reader_rejects_invalid_files(tmp_path):
+    path = tmp_path / 'bozuk.png'
+    path.write_bytes(b'resim degil')
+    with pytest.raises(ValueError):
+        PngBandReader(str(path))
+
+    data = bytearray(make_png(np.zeros((2, 3), np.uint8), 3, 8, 0, [0, 0]))
+    data[20] ^= 0xFF  # IHDR CRC'si tutmaz
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        PngBandReader(str(path))
+
+
+@pytest.mark.parametrize('dtype, channels', [(np.uint8, 1), (np.uint8, 3), (np.uint16, 4)])
+def test_writer_output_decodes_with_opencv(tmp_path, dtype, channels):
+    rng = np.random.default_rng(2)
+    shape = (19, 27) if channels == 1 else (19, 27, channels)
+    image = rng.integers(0, np.iinfo(dtype).max, shape, dtype=dtype, endpoint=True)
+    path = tmp_path / 'cikti.png'
+    with open(path, 'wb') as output:
+        with PngBandWriter(output, 27, 19, channels, dtype) as writer:
+            for row in range(0, 19, 4):
+                writer.write(image[row:row + 4])
+    assert np.array_equal(cv2.imread(str(path), cv2.IMREAD_UNCHANGED), image)
+
+
+@pytest.mark.parametrize('extension', ['.png', '.npy', kapsayici.EXTENSION])
+def test_streaming_round_trip(tmp_path, extension):
+    rng = np.random.default_rng(4)
+    image = rng.integers(0, 255, (45, 38, 3), dtype=np.uint8, endpoint=True)
+    source = str(tmp_path / 'kaynak.png')
+    cv2.imwrite(source, image)
+    encrypted = str(tmp_path / f'sifreli{extension}')
+    decrypted = str(tmp_path / 'cozulmus.png')
+
+    encrypt_file_streaming(source, encrypted, KEY, band_pixels=100, work_dir=str(tmp_path))
+    if extension == '.npy':
+        result = np.load(encrypted)
+    elif extension == kapsayici.EXTENSION:
+        result = kapsayici.open_container(encrypted)[1]
+    else:
+        result = cv2.imread(encrypted, cv2.IMREAD_UNCHANGED)
+    assert np.array_equal(result, scramble_pixels(image, KEY))
+
+    decrypt_file_streaming(encrypted, decrypted, KEY, band_pixels=100, work_dir=str(tmp_path))
+    assert np.array_equal(cv2.imread(decrypted, cv2.IMREAD_UNCHANGED), image)
@@ -0,0 +1,191 @@
+import asyncio
+import io
+import json
+import threading
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+import pytest
+from werkzeug.datastructures import FileStorage
+from werkzeug.test import encode_multipart
+
+import app as app_module
+import asenkron_sunucu
+from app import compute_pool
+from karistirma import scramble_pixels
+from kodlama import decode_image
+
+PASSWORD = 'gizli'
+
+
+@pytest.fixture
+def png():
+    rng = np.random.default_rng(5)
+    image = rng.integers(0, 255, (21, 34, 3), dtype=np.uint8, endpoint=True)
+    return cv2.imencode('.png', image)[1].tobytes()
+
+
+@pytest.fixture
+def pool_slots(monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(compute_pool, '_slots', slots)
+    return slots
+
+
+def request(path, method='GET', fields=None, chunk_size=None, headers=(), events=None):
+    """ASGI uygulamasını çağırır; (durum, başlıklar, gövde) döndürür.
+
+    fields verilirse multipart gövde chunk_size'lık parçalar halinde
+    gönderilir; her parça alındığında events listesine 'read' yazılır.
+    """
+    scope_headers = list(headers)
+    messages = []
+    if fields is not None:
+        boundary, body = encode_multipart(fields)
+        scope_headers.append((b'content-type',
+                              f'multipart/form-data; boundary={boundary}'.encode('ascii')))
+        chunk_size = chunk_size or len(body)
+        for start in range(0, len(body), chunk_size):
+            messages.append({'type': 'http.request', 'body': body[start:start + chunk_size],
+                             'more_body': start + chunk_size < len(body)})
+    messages = messages or [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    scope = {'type': 'http', 'path': path, 'method': method, 'headers': scope_headers}
+    sent = []
+
+    async def receive():
+        if events is not None:
+            events.append('read')
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asenkron_sunucu.application(scope, receive, send))
+    start = sent[0]
+    body = b''.join(message.get('body', b'') for message in sent[1:])
+    return start['status'], dict(start['headers']), body
+
+
+def image_fields(png, **form):
+    return {'image': FileStorage(io.BytesIO(png), filename='resim.png'), 'password': PASSWORD,
+            **form}
+
+
+def test_busy_pool_rejects_without_reading_body(pool_slots, png):
+    events = []
+    with compute_pool.reserve():
+        status, headers, _ = request('/api/encrypt', 'POST', image_fields(png), events=events)
+    assert status == 503
+    assert headers[b'retry-after'] == b'1'
+    assert events == []
+
+
+def test_pool_slot_is_reserved_after_body_is_read(pool_slots, png, monkeypatch):
+    events = []
+    reserve = compute_pool.reserve
+
+    @contextmanager
+    def recording_reserve():
+        with reserve():
+            events.append('reserve')
+            yield
+
+    monkeypatch.setattr(compute_pool, 'reserve', recording_reserve)
+    status, _, _ = request('/api/encrypt', 'POST', image_fields(png), chunk_size=100,
+                           events=events)
+    assert status == 200
+    last_read = len(events) - events[::-1].index('read') - 1
+    assert events[0] == 'reserve'
+    assert events[1:last_read].count('reserve') == 0
+    assert events[last_read + 1:] == ['reserve']
+    assert pool_slots.acquire(blocking=False)
+
+
+def test_upload_limit_rejects_extra_uploads(pool_slots, png, monkeypatch):
+    monkeypatch.setattr(app_module, '_upload_slots', threading.BoundedSemaphore(1))
+    with app_module.reserve_upload():
+        assert request('/api/encrypt', 'POST', image_fields(png))[0] == 503
+    assert request('/api/encrypt', 'POST', image_fields(png))[0] == 200
+
+
+def test_encrypt_decrypt_round_trip(png):
+    image = cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_UNCHANGED)
+    status, headers, encrypted = request('/api/encrypt', 'POST', image_fields(png), chunk_size=64)
+    assert status == 200
+    assert headers[b'content-type'] == b'image/png'
+    assert headers[b'access-control-allow-origin'] == b'*'
+    assert np.array_equal(decode_image(encrypted), scramble_pixels(image, PASSWORD))
+
+    fields = {'image': FileStorage(io.BytesIO(encrypted), filename='sifreli.png'),
+              'password': PASSWORD}
+    status, _, decrypted = request('/api/decrypt', 'POST', fields)
+    assert status == 200
+    assert np.array_equal(decode_image(decrypted), image)
+
+
+def test_form_options_are_applied(png):
+    status, headers, body = request('/api/encrypt', 'POST', image_fields(png, format='npy'))
+    assert status == 200
+    assert b'.npy' in headers[b'content-disposition']
+    assert body.startswith(b'\x93NUMPY')
+
+
+@pytest.mark.parametrize('form, status', [
+    ({'password': ''}, 400),
+    ({'format': 'gif'}, 400),
+    ({'mode': 'yok'}, 400),
+])
+def test_invalid_forms_are_rejected(png, form, status):
+    response_status, _, body = request('/api/encrypt', 'POST', image_fields(png, **form))
+    assert response_status == status
+    assert 'error' in json.loads(body)
+
+
+def test_non_multipart_body_is_rejected():
+    status, _, _ = request('/api/encrypt', 'POST', headers=[(b'content-type', b'text/plain')])
+    assert status == 400
+
+
+def test_unreadable_image_returns_500():
+    fields = {'image': FileStorage(io.BytesIO(b'resim degil'), filename='resim.png'),
+              'password': PASSWORD}
+    status, _, body = request('/api/decrypt', 'POST', fields)
+    assert status == 500
+    assert 'error' in json.loads(body)
+
+
+def test_disconnect_during_upload_sends_nothing(png):
+    scope = {'type': 'http', 'path': '/api/encrypt', 'method': 'POST',
+             'headers': [(b'content-type', b'multipart/form-data; boundary=sinir')]}
+    messages = [{'type': 'http.request', 'body': b'--sinir\r\n', 'more_body': True},
+                {'type': 'http.disconnect'}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asenkron_sunucu.application(scope, receive, send))
+    assert sent == []
+
+
+def test_health_and_metrics():
+    status, _, body = request('/api/health')
+    assert status == 200
+    assert json.loads(body)['status']
+    status, headers, body = request('/api/metrics')
+    assert status == 200
+    assert headers[b'content-type'].startswith(b'text/plain')
+    assert b'sifreleme_requests_total' in body
+
+
+@pytest.mark.parametrize('path, method, status', [
+    ('/api/encrypt', 'GET', 405),
+    ('/api/yok', 'GET', 404),
+    ('/api/encrypt', 'OPTIONS', 204),
+])
+def test_routing(path, method, status):
+    assert request(path, method)[0] == status
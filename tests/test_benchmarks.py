@@ -0,0 +1,26 @@
+from benchmarks import motor
+
+
+def _report(seconds, rss=100.0):
+    return {'results': [{'megapixels': 1, 'seconds': seconds, 'peak_rss_mb': rss}]}
+
+
+def test_measure_size_times_every_stage():
+    result = motor.measure_size(0.01, 1)
+    assert set(result['seconds']) == set(motor.STAGES)
+    assert all(seconds >= 0 for seconds in result['seconds'].values())
+
+
+def test_compare_reports_regressions_above_threshold(capsys):
+    before = _report({'decode': 1.0, 'encode': 1.0})
+    after = _report({'decode': 1.05, 'encode': 1.5}, rss=130.0)
+    regressions = motor.compare(before, after, 10)
+    assert [(metric, round(change)) for _, metric, change in regressions] == [
+        ('encode', 50), ('peak_rss_mb', 30),
+    ]
+
+
+def test_compare_skips_stages_missing_from_baseline(capsys):
+    before = _report({'decode': 1.0})
+    after = _report({'decode': 1.0, 'encode_stream': 5.0})
+    assert motor.compare(before, after, 10) == []
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from feistel import FeistelIndices, FeistelPermutation, derive_round_keys
+from kapsayici import feistel_scheme
+
+SALT = bytes(range(16))
+
+
+def permutation_of(size, key='gizli', rounds=8):
+    return FeistelPermutation(derive_round_keys(key, SALT, 1, rounds), size)
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 17, 1000, 4096, 70001])
+def test_permutation_is_a_bijection(size):
+    permutation = permutation_of(size)
+    forward = permutation.range(0, size)
+    assert forward.dtype == np.uint64
+    assert np.array_equal(np.sort(forward), np.arange(size, dtype=np.uint64))
+    assert np.array_equal(permutation.inverse(forward), np.arange(size, dtype=np.uint64))
+    assert np.array_equal(permutation.range(0, size, inverse=True)[forward],
+                          np.arange(size, dtype=np.uint64))
+
+
+def test_ranges_are_independent():
+    permutation = permutation_of(5000)
+    whole = permutation.range(0, 5000)
+    assert np.array_equal(np.concatenate([permutation.range(0, 1234),
+                                          permutation.range(1234, 5000)]), whole)
+    assert np.array_equal(permutation.forward(np.array([4999, 0, 17])), whole[[4999, 0, 17]])
+
+
+def test_permutation_depends_on_key_salt_and_rounds():
+    whole = permutation_of(5000).range(0, 5000)
+    assert np.array_equal(permutation_of(5000).range(0, 5000), whole)
+    assert not np.array_equal(permutation_of(5000, key='gizlı').range(0, 5000), whole)
+    assert not np.array_equal(permutation_of(5000, rounds=9).range(0, 5000), whole)
+    other_salt = FeistelPermutation(derive_round_keys('gizli', bytes(16), 1, 8), 5000)
+    assert not np.array_equal(other_salt.range(0, 5000), whole)
+
+
+def test_derive_round_keys():
+    keys = derive_round_keys('gizli', SALT, 10, 12)
+    assert len(keys) == 12 and all(0 <= key < 1 << 64 for key in keys)
+    assert derive_round_keys('gizli', SALT, 10, 12) == keys
+    assert derive_round_keys('gizli', SALT, 11, 12) != keys
+
+
+def test_from_scheme_uses_scheme_parameters():
+    scheme = feistel_scheme(rounds=6, iterations=3, salt=SALT)
+    permutation = FeistelPermutation.from_scheme('gizli', scheme, 100)
+    assert permutation.round_keys == [np.uint64(key) for key in
+                                      derive_round_keys('gizli', SALT, 3, 6)]
+
+
+def test_feistel_indices():
+    permutation = permutation_of(300)
+    indices = FeistelIndices(permutation)
+    inverse = FeistelIndices(permutation, inverse=True)
+    assert len(indices) == 300
+    assert indices[10:20].dtype == np.int64
+    assert np.array_equal(indices[10:20], permutation.range(10, 20).astype(np.int64))
+    assert np.array_equal(indices[250:1000], permutation.range(250, 300).astype(np.int64))
+    positions = np.array([5, 299, 0])
+    assert np.array_equal(inverse[indices[positions]], positions)
+    with pytest.raises(ValueError):
+        indices[::2]
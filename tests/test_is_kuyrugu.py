@@ -0,0 +1,122 @@
+import io
+import os
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from is_kuyrugu import DONE, FAILED, QUEUED, JobQueue, QueueFullError
+from islem_havuzu import DECRYPT, ENCRYPT
+from karistirma import scramble_pixels
+from kodlama import read_image_file
+
+PASSWORD = 'gizli'
+
+
+@pytest.fixture
+def image():
+    return np.random.default_rng(5).integers(0, 255, (40, 33, 3), dtype=np.uint8, endpoint=True)
+
+
+@pytest.fixture
+def png(image):
+    return cv2.imencode('.png', image)[1].tobytes()
+
+
+class CountingStream(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.reads = 0
+
+    def read(self, *args):
+        self.reads += 1
+        return super().read(*args)
+
+
+def wait(job, timeout=10):
+    deadline = time.time() + timeout
+    while job.finished is None:
+        assert time.time() < deadline, "İş zamanında bitmedi"
+        time.sleep(0.01)
+    return job
+
+
+def test_job_lifecycle(tmp_path, image, png):
+    jobs = JobQueue(str(tmp_path), workers=1, max_queued=4, ttl=3600)
+    job = jobs.submit(ENCRYPT, io.BytesIO(png), 'resim.PNG', PASSWORD)
+    assert job.input_path.endswith('.png')
+    assert jobs.get(job.id) is job
+    wait(job)
+    assert job.status == DONE and job.progress == 100.0
+    assert job.key is None and not os.path.exists(job.input_path)
+    encrypted = read_image_file(job.result_path)
+    assert np.array_equal(encrypted, scramble_pixels(image, PASSWORD))
+    assert jobs.get('bilinmeyen') is None
+
+    with open(job.result_path, 'rb') as f:
+        decrypted_job = wait(jobs.submit(DECRYPT, f, 'sifreli.png', PASSWORD))
+    assert decrypted_job.status == DONE
+    assert np.array_equal(read_image_file(decrypted_job.result_path), image)
+    assert set(job.to_dict()) == {'id', 'operation', 'status', 'progress', 'error',
+                                  'created', 'finished'}
+
+
+def test_failed_job_reports_error(tmp_path):
+    jobs = JobQueue(str(tmp_path), workers=1, max_queued=4, ttl=3600)
+    job = wait(jobs.submit(ENCRYPT, io.BytesIO(b'resim degil'), 'bozuk.png', PASSWORD))
+    assert job.status == FAILED
+    assert job.error
+    assert job.key is None and not os.path.exists(job.input_path)
+
+
+def test_finished_jobs_expire(tmp_path, png):
+    jobs = JobQueue(str(tmp_path), workers=1, max_queued=4, ttl=0)
+    job = wait(jobs.submit(ENCRYPT, io.BytesIO(png), 'resim.png', PASSWORD))
+    assert os.path.isdir(job.directory)
+    time.sleep(0.01)
+    assert jobs.get(job.id) is None
+    assert not os.path.exists(job.directory)
+
+
+def test_full_queue_rejects_before_copying(tmp_path, png):
+    # İşçi yokken işler kuyrukta bekler
+    jobs = JobQueue(str(tmp_path), workers=0, max_queued=2, ttl=3600)
+    queued = [jobs.submit(ENCRYPT, io.BytesIO(png), 'resim.png', PASSWORD) for _ in range(2)]
+    assert all(job.status == QUEUED for job in queued)
+
+    source = CountingStream(png)
+    with pytest.raises(QueueFullError):
+        jobs.check_capacity()
+    with pytest.raises(QueueFullError):
+        jobs.submit(ENCRYPT, source, 'resim.png', PASSWORD)
+    assert source.reads == 0
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(job.directory)
+                                                  for job in queued)
+
+    # Kuyruktan alınan iş yerini bırakır
+    jobs.workers = 1
+    jobs._start_workers()
+    for job in queued:
+        wait(job)
+    jobs.check_capacity()
+    assert wait(jobs.submit(ENCRYPT, source, 'resim.png', PASSWORD)).status == DONE
+
+
+def test_failed_copy_releases_slot(tmp_path, png):
+    class BrokenStream(io.BytesIO):
+        def read(self, *args):
+            raise OSError("bağlantı koptu")
+
+    jobs = JobQueue(str(tmp_path), workers=0, max_queued=1, ttl=3600)
+    with pytest.raises(OSError):
+        jobs.submit(ENCRYPT, BrokenStream(), 'resim.png', PASSWORD)
+    assert os.listdir(tmp_path) == []
+    jobs.submit(ENCRYPT, io.BytesIO(png), 'resim.png', PASSWORD)
+
+
+def test_unlimited_queue(tmp_path, png):
+    jobs = JobQueue(str(tmp_path), workers=0, max_queued=0, ttl=3600)
+    for _ in range(5):
+        jobs.submit(ENCRYPT, io.BytesIO(png), 'resim.png', PASSWORD)
+    jobs.check_capacity()
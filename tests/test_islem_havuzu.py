@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from islem_havuzu import DECRYPT, ENCRYPT, ComputePool, PoolBusyError
+from kapsayici import LEGACY_SCHEME, tile_scheme
+from karistirma import scramble_pixels
+from kodlama import decode_image, encode_image
+
+KEY = 'gizli'
+
+
+@pytest.fixture(scope='module')
+def pool():
+    pool = ComputePool(workers=2, max_pending=4)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def image():
+    rng = np.random.default_rng(11)
+    return rng.integers(0, 65535, (40, 30, 4), dtype=np.uint16, endpoint=True)
+
+
+@pytest.mark.parametrize('scheme', [None, tile_scheme(8)])
+def test_run_matches_in_process_result(pool, image, scheme):
+    encrypted = pool.run(ENCRYPT, image, KEY, scheme=scheme)
+    assert encrypted == encode_image(scramble_pixels(image, KEY, scheme=scheme), scheme=scheme)
+    decrypted = pool.run(DECRYPT, decode_image(encrypted), KEY, scheme=scheme)
+    assert np.array_equal(decode_image(decrypted), image)
+
+
+def test_stream_yields_run_output_in_chunks(pool, image):
+    chunks = list(pool.stream(ENCRYPT, image, KEY, chunk_size=1000))
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert b''.join(chunks) == pool.run(ENCRYPT, image, KEY)
+
+
+def test_worker_errors_propagate(pool):
+    with pytest.raises(ValueError):
+        pool.run(ENCRYPT, np.zeros((4, 4), dtype=np.uint8), KEY,
+                 scheme=LEGACY_SCHEME._replace(algorithm=99))
+
+
+def test_reserve_rejects_when_full():
+    pool = ComputePool(workers=0, max_pending=2)
+    with pool.reserve(), pool.reserve():
+        with pytest.raises(PoolBusyError):
+            with pool.reserve():
+                pass
+        with pytest.raises(PoolBusyError):
+            pool.check_capacity()
+    with pool.reserve():
+        pass
+
+
+def test_check_capacity_does_not_hold_a_slot():
+    pool = ComputePool(workers=0, max_pending=1)
+    pool.check_capacity()
+    pool.check_capacity()
+    with pool.reserve():
+        pass
+
+
+def test_unbounded_pool_never_busy():
+    pool = ComputePool(workers=0, max_pending=0)
+    assert not pool.enabled
+    with pool.reserve(), pool.reserve():
+        pool.check_capacity()
@@ -0,0 +1,157 @@
+import numpy as np
+import pytest
+
+import kapsayici
+from kapsayici import (
+    LEGACY_SCHEME, Scheme, check_scheme, feistel_scheme, header_scheme, is_container,
+    open_container, pack_container, pack_header, read_header, tile_scheme, unpack_container,
+    write_container,
+)
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16])
+@pytest.mark.parametrize('shape', [(5, 7), (5, 7, 3), (5, 7, 4)])
+def test_header_round_trip(dtype, shape):
+    header = pack_header(shape, dtype)
+    assert len(header) == kapsayici.HEADER_SIZE
+    assert is_container(header)
+    parsed = read_header(header)
+    assert parsed.version == kapsayici.VERSION
+    assert parsed.dtype == np.dtype(dtype)
+    assert parsed.shape == shape
+    assert header_scheme(parsed) == LEGACY_SCHEME
+
+
+def test_container_round_trip(tmp_path):
+    image = np.arange(6 * 4 * 3, dtype=np.uint16).reshape(6, 4, 3)
+    header, pixels = unpack_container(pack_container(image))
+    assert header.shape == image.shape
+    assert np.array_equal(pixels, image)
+
+    path = tmp_path / 'resim.gsif'
+    write_container(path, image)
+    header, pixels = open_container(path)
+    assert np.array_equal(pixels, image)
+
+    header, pixels = open_container(path, mode='r+')
+    pixels[0, 0] = 7
+    pixels.flush()
+    del pixels
+    assert np.array_equal(open_container(path)[1][0, 0], [7, 7, 7])
+
+
+def test_create_container_allocates_pixels(tmp_path):
+    path = tmp_path / 'bos.gsif'
+    header, pixels = kapsayici.create_container(path, (3, 5), np.uint8)
+    pixels[...] = 9
+    pixels.flush()
+    del pixels
+    assert np.array_equal(open_container(path)[1], np.full((3, 5), 9, np.uint8))
+
+
+def test_is_container():
+    assert is_container(pack_header((1, 1), np.uint8))
+    assert not is_container(b'\x89PNG\r\n\x1a\n')
+
+
+def test_read_header_rejects_invalid_data():
+    header = pack_header((2, 3), np.uint8)
+    with pytest.raises(ValueError):
+        read_header(b'PNG!' + header[4:])
+    with pytest.raises(ValueError):
+        read_header(header[:kapsayici.HEADER_SIZE - 1])
+    with pytest.raises(ValueError):
+        read_header(header[:4] + (kapsayici.VERSION + 1).to_bytes(2, 'little') + header[6:])
+
+
+@pytest.mark.parametrize('dtype', [b'|O', b'<f8', b'>u2', b'|b1', b'\xff\xfe', b'u1'])
+def test_read_header_rejects_unsupported_dtype(dtype):
+    header = bytearray(pack_header((2, 3), np.uint8))
+    header[12:16] = dtype.ljust(4, b'\0')
+    with pytest.raises(ValueError):
+        read_header(bytes(header))
+
+
+@pytest.mark.parametrize('channels', [0, 5, 1000])
+def test_read_header_rejects_unsupported_channels(channels):
+    header = bytearray(pack_header((2, 3, 3), np.uint8))
+    header[24:28] = channels.to_bytes(4, 'little')
+    with pytest.raises(ValueError):
+        read_header(bytes(header))
+
+
+def test_unpack_rejects_truncated_container():
+    data = pack_container(np.zeros((4, 4, 3), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        unpack_container(data[:-1])
+
+
+def test_pack_header_rejects_unsupported_images():
+    with pytest.raises(ValueError):
+        pack_header((2, 2), np.float32)
+    with pytest.raises(ValueError):
+        pack_header((2, 2, 5), np.uint8)
+
+
+def test_check_scheme_accepts_legacy():
+    check_scheme(LEGACY_SCHEME)
+
+
+@pytest.mark.parametrize('scheme', [
+    LEGACY_SCHEME._replace(algorithm=99),
+    LEGACY_SCHEME._replace(kdf=99),
+])
+def test_check_scheme_rejects_unsupported(scheme):
+    with pytest.raises(ValueError):
+        check_scheme(scheme)
+
+
+@pytest.mark.parametrize('tile_size', [kapsayici.MIN_TILE_SIZE, 16, kapsayici.MAX_TILE_SIZE])
+def test_tile_scheme_in_header(tile_size):
+    scheme = tile_scheme(tile_size)
+    check_scheme(scheme)
+    header = read_header(pack_header((40, 30, 3), np.uint8, *scheme))
+    assert header_scheme(header) == scheme
+
+
+@pytest.mark.parametrize('tile_size', [0, 1, kapsayici.MAX_TILE_SIZE + 1])
+def test_tile_scheme_rejects_out_of_range_sizes(tile_size):
+    with pytest.raises(ValueError, match="Blok boyutu"):
+        tile_scheme(tile_size)
+    with pytest.raises(ValueError):
+        check_scheme(LEGACY_SCHEME._replace(algorithm=kapsayici.ALGORITHM_TILE_SHUFFLE,
+                                            algorithm_param=tile_size))
+
+
+def test_feistel_scheme_in_header():
+    scheme = feistel_scheme(rounds=12, iterations=5000, salt=bytes(range(16)))
+    header = read_header(pack_header((5, 7, 3), np.uint16, *scheme))
+    assert header_scheme(header) == scheme
+    # Tuz verilmezse her şemada yenisi üretilir
+    assert len(feistel_scheme().kdf_salt) == 16
+    assert feistel_scheme().kdf_salt != feistel_scheme().kdf_salt
+
+
+@pytest.mark.parametrize('scheme', [
+    feistel_scheme(),
+    feistel_scheme(rounds=kapsayici.MIN_FEISTEL_ROUNDS, iterations=1),
+    feistel_scheme(rounds=kapsayici.MAX_FEISTEL_ROUNDS, iterations=kapsayici.MAX_KDF_ITERATIONS),
+])
+def test_check_scheme_accepts_feistel(scheme):
+    check_scheme(scheme)
+
+
+@pytest.mark.parametrize('scheme', [
+    Scheme(kapsayici.ALGORITHM_FEISTEL, kapsayici.MIN_FEISTEL_ROUNDS - 1,
+           kapsayici.KDF_PBKDF2_SHA256, 1000, b'\0' * 16),
+    Scheme(kapsayici.ALGORITHM_FEISTEL, kapsayici.MAX_FEISTEL_ROUNDS + 1,
+           kapsayici.KDF_PBKDF2_SHA256, 1000, b'\0' * 16),
+    Scheme(kapsayici.ALGORITHM_FEISTEL, 8, kapsayici.KDF_PBKDF2_SHA256, 0, b'\0' * 16),
+    Scheme(kapsayici.ALGORITHM_FEISTEL, 8, kapsayici.KDF_PBKDF2_SHA256,
+           kapsayici.MAX_KDF_ITERATIONS + 1, b'\0' * 16),
+    Scheme(kapsayici.ALGORITHM_FEISTEL, 8, kapsayici.KDF_ORD_SUM, 1000, b'\0' * 16),
+    Scheme(kapsayici.ALGORITHM_FEISTEL, 8, kapsayici.KDF_PBKDF2_SHA256, 1000, b'\0' * 8),
+])
+def test_check_scheme_rejects_invalid_feistel(scheme):
+    with pytest.raises(ValueError):
+        check_scheme(scheme)
@@ -0,0 +1,294 @@
+import random
+import threading
+
+import numpy as np
+import pytest
+
+import karistirma
+from kapsayici import feistel_scheme, tile_scheme
+from karistirma import (generate_permutation, iter_scrambled_rows, iter_unscrambled_rows,
+                        scramble_pixels, unscramble_pixels)
+
+KEY = 'gizli-şifre'
+
+
+def image_of(dtype, channels, shape=(37, 53)):
+    rng = np.random.default_rng(7)
+    if channels > 1:
+        shape = shape + (channels,)
+    return rng.integers(0, np.iinfo(dtype).max, shape, dtype=dtype, endpoint=True)
+
+
+def test_legacy_scramble_matches_original_algorithm():
+    """Eski şemada encrypted[i] = original[shuffled[i]] olmalı."""
+    image = image_of(np.uint8, 3)
+    height, width = image.shape[:2]
+    order = list(range(height * width))
+    random.Random(sum(ord(k) for k in KEY)).shuffle(order)
+    expected = image.reshape(-1, 3)[order].reshape(image.shape)
+    assert np.array_equal(scramble_pixels(image, KEY), expected)
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16])
+@pytest.mark.parametrize('channels', [1, 3, 4])
+def test_round_trip(dtype, channels):
+    image = image_of(dtype, channels)
+    encrypted = scramble_pixels(image, KEY)
+    assert encrypted.shape == image.shape and encrypted.dtype == image.dtype
+    assert not np.array_equal(encrypted, image)
+    assert np.array_equal(unscramble_pixels(encrypted, KEY), image)
+    assert not np.array_equal(unscramble_pixels(encrypted, KEY + 'x'), image)
+
+
+def test_out_buffer_receives_result():
+    image = image_of(np.uint8, 3)
+    out = np.empty_like(image)
+    result = scramble_pixels(image, KEY, out=out)
+    assert np.shares_memory(result, out)
+    assert np.array_equal(out, scramble_pixels(image, KEY))
+
+
+def test_progress_reports_every_pixel():
+    image = image_of(np.uint8, 1)
+    calls = []
+    scramble_pixels(image, KEY, progress=lambda done, total: calls.append((done, total)))
+    assert calls and calls[-1] == (image.size, image.size)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 1234, 987654321])
+@pytest.mark.parametrize('pixel_count', [0, 1, 2, 3, 100, 4097, 70001])
+def test_generate_permutation_matches_random_shuffle(seed, pixel_count):
+    """Eski şifreli resimler ancak random.shuffle ile aynı sırayla çözülebilir."""
+    expected = list(range(pixel_count))
+    random.Random(seed).shuffle(expected)
+    permutation = generate_permutation(seed, pixel_count)
+    assert permutation.dtype == np.uint32
+    assert permutation.tolist() == expected
+
+
+def test_generate_permutation_writes_into_out():
+    out = np.empty(5000, dtype=np.uint32)
+    result = generate_permutation(42, 5000, out=out)
+    assert result is out
+    assert np.array_equal(out, generate_permutation(42, 5000))
+
+
+def test_generate_permutation_leaves_global_random_alone():
+    random.seed(5)
+    expected = random.random()
+    random.seed(5)
+    generate_permutation(99, 1000)
+    assert random.random() == expected
+
+
+def test_generate_permutation_rejects_too_many_pixels():
+    with pytest.raises(ValueError):
+        generate_permutation(1, 1 << 32)
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16])
+@pytest.mark.parametrize('channels', [1, 3, 4])
+@pytest.mark.parametrize('tile_size', [2, 8, 16])
+def test_tile_round_trip(dtype, channels, tile_size):
+    # 37 × 53 blok boyutuna bölünmez; kenar pikselleri ayrıca karıştırılır
+    image = image_of(dtype, channels)
+    scheme = tile_scheme(tile_size)
+    encrypted = scramble_pixels(image, KEY, scheme=scheme)
+    assert encrypted.shape == image.shape and encrypted.dtype == image.dtype
+    assert not np.array_equal(encrypted, image)
+    assert not np.array_equal(encrypted, scramble_pixels(image, KEY))
+    assert np.array_equal(unscramble_pixels(encrypted, KEY, scheme=scheme), image)
+    assert not np.array_equal(unscramble_pixels(encrypted, KEY), image)
+
+
+def test_tile_scramble_moves_whole_tiles():
+    tile = 4
+    image = image_of(np.uint16, 1, shape=(8 * tile, 6 * tile))
+    encrypted = scramble_pixels(image, KEY, scheme=tile_scheme(tile))
+
+    def tiles(array):
+        return sorted(tuple(sorted(array[row:row + tile, col:col + tile].ravel()))
+                      for row in range(0, array.shape[0], tile)
+                      for col in range(0, array.shape[1], tile))
+
+    # Her blok içinde karışır ama blokların piksel kümeleri korunur
+    assert tiles(encrypted) == tiles(image)
+
+
+@pytest.mark.parametrize('scheme', [None, tile_scheme(8),
+                                    feistel_scheme(iterations=1, salt=bytes(16))])
+@pytest.mark.parametrize('band_pixels', [1, 53 * 5, 10000])
+def test_row_iterators_match_whole_image(scheme, band_pixels):
+    image = image_of(np.uint8, 3)
+    encrypted = scramble_pixels(image, KEY, scheme=scheme)
+    bands = list(iter_scrambled_rows(image, KEY, band_pixels, scheme=scheme))
+    assert all(band.shape[1:] == image.shape[1:] for band in bands)
+    assert np.array_equal(np.concatenate(bands), encrypted)
+    bands = list(iter_unscrambled_rows(encrypted, KEY, band_pixels, scheme=scheme))
+    assert np.array_equal(np.concatenate(bands), image)
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16])
+@pytest.mark.parametrize('channels', [1, 3, 4])
+def test_feistel_round_trip(dtype, channels):
+    image = image_of(dtype, channels)
+    scheme = feistel_scheme(rounds=6, iterations=10, salt=bytes(range(16)))
+    encrypted = scramble_pixels(image, KEY, scheme=scheme)
+    assert encrypted.shape == image.shape and encrypted.dtype == image.dtype
+    assert not np.array_equal(encrypted, image)
+    assert not np.array_equal(encrypted, scramble_pixels(image, KEY))
+    assert np.array_equal(unscramble_pixels(encrypted, KEY, scheme=scheme), image)
+    assert not np.array_equal(unscramble_pixels(encrypted, KEY + 'x', scheme=scheme), image)
+    # Aynı şifre farklı tuzla farklı sonuç verir
+    other = scheme._replace(kdf_salt=bytes(16))
+    assert not np.array_equal(scramble_pixels(image, KEY, scheme=other), encrypted)
+
+
+@pytest.fixture
+def move_threads(monkeypatch):
+    """Taşımayı dört iş parçacığına böler ve hangi iş parçacıklarının çalıştığını kaydeder."""
+    threads = set()
+    take_block = karistirma._take_block
+
+    def recording_take_block(*args):
+        threads.add(threading.current_thread().name)
+        take_block(*args)
+
+    def set_threads(count):
+        monkeypatch.setattr(karistirma, 'MOVE_THREADS', count)
+        threads.clear()
+
+    monkeypatch.setattr(karistirma, '_take_block', recording_take_block)
+    monkeypatch.setattr(karistirma, '_move_executor', None)
+    yield set_threads, threads
+    if karistirma._move_executor is not None:
+        karistirma._move_executor.shutdown()
+
+
+@pytest.mark.parametrize('scheme', [None, tile_scheme(16),
+                                    feistel_scheme(iterations=1, salt=bytes(16))])
+@pytest.mark.parametrize('move_block, shape', [(None, (300, 260)), (1000, (37, 53))])
+def test_threaded_move_matches_single_thread(move_threads, monkeypatch, scheme, move_block, shape):
+    set_threads, threads = move_threads
+    if move_block is not None:
+        monkeypatch.setattr(karistirma, '_MOVE_BLOCK', move_block)
+    image = image_of(np.uint16, 3, shape=shape)
+    assert image.shape[0] * image.shape[1] > karistirma._MOVE_BLOCK
+
+    set_threads(1)
+    expected = scramble_pixels(image, KEY, scheme=scheme)
+    expected_bands = list(iter_scrambled_rows(image, KEY, 20000, scheme=scheme))
+    assert threads == {threading.current_thread().name}
+
+    set_threads(4)
+    assert np.array_equal(scramble_pixels(image, KEY, scheme=scheme), expected)
+    bands = list(iter_scrambled_rows(image, KEY, 20000, scheme=scheme))
+    assert all(np.array_equal(band, other) for band, other in zip(bands, expected_bands))
+    assert np.array_equal(unscramble_pixels(expected, KEY, scheme=scheme), image)
+    assert any(name.startswith('piksel-tasima') for name in threads)
+
+
+def test_limit_move_threads(monkeypatch):
+    monkeypatch.delenv('SIFRELEME_TASIMA_IS_PARCACIGI', raising=False)
+    monkeypatch.setattr(karistirma.os, 'cpu_count', lambda: 8)
+    monkeypatch.setattr(karistirma, 'MOVE_THREADS', 8)
+    karistirma.limit_move_threads(3)
+    assert karistirma.MOVE_THREADS == 2
+    karistirma.limit_move_threads(16)
+    assert karistirma.MOVE_THREADS == 1
+
+    monkeypatch.setenv('SIFRELEME_TASIMA_IS_PARCACIGI', '8')
+    monkeypatch.setattr(karistirma, 'MOVE_THREADS', 8)
+    karistirma.limit_move_threads(4)
+    assert karistirma.MOVE_THREADS == 8
+
+
+@pytest.fixture
+def cycle_walks(monkeypatch):
+    """_walk_cycle_segments çağrılarını ve her çağrıdaki en uzun parça adım sayısını kaydeder."""
+    walks = []
+    walk = karistirma._walk_cycle_segments
+    mark_visited = karistirma._mark_visited
+
+    def recording_walk(flat_image, indices, anchors, visited, inverse, report):
+        steps = []
+        monkeypatch.setattr(karistirma, '_mark_visited',
+                            lambda visited, positions: (steps.append(len(positions)),
+                                                        mark_visited(visited, positions)))
+        try:
+            return walk(flat_image, indices, anchors, visited, inverse, report)
+        finally:
+            monkeypatch.setattr(karistirma, '_mark_visited', mark_visited)
+            walks.append((len(anchors), len(steps)))
+
+    monkeypatch.setattr(karistirma, '_walk_cycle_segments', recording_walk)
+    return walks
+
+
+@pytest.mark.parametrize('scheme', [None, feistel_scheme(iterations=1, salt=bytes(16))])
+# Çapalar arası mesafe ancak piksel sayısı çapa sayısının iki katını aşınca
+# 1'den büyük olur; 512 × 400 varsayılan _CYCLE_WALKERS ile de çok adımlıdır
+@pytest.mark.parametrize('walkers, shape', [(4, (37, 53)), (16, (37, 53)), (1, (9, 7)),
+                                            (None, (512, 400))])
+def test_in_place_round_trip(monkeypatch, cycle_walks, scheme, walkers, shape):
+    if walkers is not None:
+        monkeypatch.setattr(karistirma, '_CYCLE_WALKERS', walkers)
+    image = image_of(np.uint8, 3, shape=shape)
+    pixel_count = shape[0] * shape[1]
+    expected = scramble_pixels(image, KEY, scheme=scheme)
+
+    buffer = image.copy()
+    calls = []
+    result = scramble_pixels(buffer, KEY, scheme=scheme, in_place=True,
+                             progress=lambda done, total: calls.append((done, total)))
+    assert np.shares_memory(result, buffer)
+    assert np.array_equal(buffer, expected)
+    assert calls[-1] == (pixel_count, pixel_count)
+    # Her çapa birden çok adım yürür; kısa döngüler sonraki turlarda taşınır
+    assert max(steps for _, steps in cycle_walks) > 2
+    assert len(cycle_walks) > 1
+    assert sum(anchors for anchors, _ in cycle_walks) > karistirma._CYCLE_WALKERS
+
+    cycle_walks.clear()
+    result = unscramble_pixels(buffer, KEY, scheme=scheme, in_place=True)
+    assert np.shares_memory(result, buffer)
+    assert np.array_equal(buffer, image)
+    assert len(cycle_walks) > 1
+
+
+def test_unvisited_returns_first_unmarked_positions(monkeypatch):
+    monkeypatch.setattr(karistirma, '_MOVE_CHUNK', 16)
+    total = 45
+    visited = np.zeros((total + 7) // 8, dtype=np.uint8)
+    marked = np.array([0, 1, 2, 5, 8, 20, 21, 44], dtype=np.int64)
+    karistirma._mark_visited(visited, marked)
+    free = [position for position in range(total) if position not in marked]
+    assert list(karistirma._unvisited(visited, total, 3)) == free[:3]
+    assert list(karistirma._unvisited(visited, total, 100)) == free
+    karistirma._mark_visited(visited, np.array(free, dtype=np.int64))
+    assert len(karistirma._unvisited(visited, total, 100)) == 0
+
+
+def test_in_place_rejects_tile_scheme():
+    image = image_of(np.uint8, 3)
+    with pytest.raises(ValueError, match="Yerinde"):
+        scramble_pixels(image.copy(), KEY, scheme=tile_scheme(8), in_place=True)
+    assert not karistirma.in_place_preferred(image, tile_scheme(8))
+
+
+def test_in_place_preferred(monkeypatch):
+    image = image_of(np.uint8, 3, shape=(100, 100))
+    # Girdi + çıktı + uint32 permütasyon
+    monkeypatch.setattr(karistirma, 'IN_PLACE_THRESHOLD', 2 * image.nbytes + 100 * 100 * 4)
+    assert not karistirma.in_place_preferred(image)
+    # Çözmede ters permütasyon da tutulur
+    assert karistirma.in_place_preferred(image, inverse=True)
+    assert not karistirma.in_place_preferred(image[:, ::2], inverse=True)
+    read_only = image.copy()
+    read_only.flags.writeable = False
+    assert not karistirma.in_place_preferred(read_only, inverse=True)
+
+    monkeypatch.setattr(karistirma, 'IN_PLACE_THRESHOLD', 2 * image.nbytes - 1)
+    assert karistirma.in_place_preferred(image, feistel_scheme(salt=bytes(16)))
+    monkeypatch.setattr(karistirma, 'IN_PLACE_THRESHOLD', 0)
+    assert not karistirma.in_place_preferred(image, inverse=True)
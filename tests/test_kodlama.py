@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+import app
+import kapsayici
+import toplu_islem
+from kodlama import (OUTPUT_FORMATS, PICKER_INPUT_EXTENSIONS, PICKER_OUTPUT_EXTENSIONS,
+                     decode_image, encode_image, iter_encoded, read_scheme,
+                     validate_output_options, validate_scheme_options)
+
+
+def test_picker_extensions_match_supported_formats():
+    """Masaüstü seçicileri API ve toplu araçla aynı dosyaları kabul etmeli."""
+    inputs = {'.' + extension for extension in PICKER_INPUT_EXTENSIONS}
+    assert inputs == toplu_islem.IMAGE_EXTENSIONS == app.ALLOWED_EXTENSIONS
+    assert {'.' + extension for extension in PICKER_OUTPUT_EXTENSIONS} == {
+        extension for extension, _ in OUTPUT_FORMATS.values()
+    }
+
+
+@pytest.fixture
+def image():
+    rng = np.random.default_rng(8)
+    return rng.integers(0, 65535, (17, 23, 3), dtype=np.uint16, endpoint=True)
+
+
+@pytest.mark.parametrize('output_format', sorted(OUTPUT_FORMATS))
+def test_encode_decode_round_trip(image, output_format):
+    assert np.array_equal(decode_image(encode_image(image, output_format)), image)
+
+
+@pytest.mark.parametrize('output_format', sorted(OUTPUT_FORMATS))
+def test_iter_encoded_matches_encode_image(image, output_format):
+    bands = (image[row:row + 5] for row in range(0, len(image), 5))
+    encoded = b''.join(iter_encoded(bands, image.shape, image.dtype, output_format))
+    assert np.array_equal(decode_image(encoded), image)
+    if output_format != 'png':
+        assert encoded == encode_image(image, output_format)
+
+
+def test_png_compression_levels():
+    image = np.tile(np.arange(64, dtype=np.uint8), (64, 1))
+    sizes = [len(encode_image(image, 'png', level)) for level in (0, 9)]
+    assert sizes[0] > sizes[1]
+    for level in (0, 9):
+        assert np.array_equal(decode_image(encode_image(image, 'png', level)), image)
+
+
+@pytest.mark.parametrize('output_format, compression, expected', [
+    (None, None, ('png', None)),
+    ('TIFF', '', ('tiff', None)),
+    ('png', '0', ('png', 0)),
+    ('png', 9, ('png', 9)),
+])
+def test_validate_output_options(output_format, compression, expected):
+    assert validate_output_options(output_format, compression) == expected
+
+
+@pytest.mark.parametrize('output_format, compression', [
+    ('jpg', None), ('png', '10'), ('png', '-1'), ('png', 'yuksek'),
+])
+def test_validate_output_options_rejects(output_format, compression):
+    with pytest.raises(ValueError):
+        validate_output_options(output_format, compression)
+
+
+@pytest.mark.parametrize('mode, tile_size, expected', [
+    (None, None, None),
+    ('', '8', None),
+    ('pixel', None, kapsayici.LEGACY_SCHEME),
+    ('tile', None, kapsayici.tile_scheme()),
+    ('TILE', '', kapsayici.tile_scheme()),
+    ('tile', '32', kapsayici.tile_scheme(32)),
+])
+def test_validate_scheme_options(mode, tile_size, expected):
+    assert validate_scheme_options(mode, tile_size) == expected
+
+
+@pytest.mark.parametrize('mode, tile_size', [('blok', None), ('tile', 'on'), ('tile', '1'),
+                                             ('tile', '300')])
+def test_validate_scheme_options_rejects(mode, tile_size):
+    with pytest.raises(ValueError):
+        validate_scheme_options(mode, tile_size)
+
+
+@pytest.mark.parametrize('output_format', ['png', 'gsif'])
+def test_scheme_is_stored_in_output(image, output_format):
+    scheme = kapsayici.tile_scheme(8)
+    data = encode_image(image, output_format, scheme=scheme)
+    assert read_scheme(data) == scheme
+    assert read_scheme(encode_image(image, output_format)) == kapsayici.LEGACY_SCHEME
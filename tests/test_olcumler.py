@@ -0,0 +1,101 @@
+import io
+
+import cv2
+import numpy as np
+import pytest
+
+import olcumler
+from app import app
+from karistirma import permutation_cache
+
+
+def parse(text):
+    """Prometheus metnini {örnek adı ve etiketleri: değer} sözlüğüne çevirir."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_counter_and_gauge_render():
+    registry = olcumler.Registry()
+    counter = registry.register(olcumler.Counter('c_total', 'sayaç', ('kind',)))
+    gauge = registry.register(olcumler.Gauge('g', 'değer'))
+    counter.inc(kind='a')
+    counter.inc(2, kind='a')
+    counter.inc(kind='b"\n')
+    gauge.inc(3)
+    gauge.dec()
+    text = registry.render()
+    assert '# TYPE c_total counter' in text and '# TYPE g gauge' in text
+    samples = parse(text)
+    assert samples['c_total{kind="a"}'] == 3
+    assert samples['c_total{kind="b\\"\\n"}'] == 1
+    assert samples['g'] == 2
+    assert counter.value(kind='a') == 3 and counter.value(kind='yok') == 0
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = olcumler.Histogram('h_seconds', 'süre', ('stage',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, stage='x')
+    samples = parse('\n'.join(histogram.render()))
+    assert samples['h_seconds_bucket{stage="x",le="0.1"}'] == 1
+    assert samples['h_seconds_bucket{stage="x",le="1.0"}'] == 3
+    assert samples['h_seconds_bucket{stage="x",le="+Inf"}'] == 4
+    assert samples['h_seconds_count{stage="x"}'] == 4
+    assert samples['h_seconds_sum{stage="x"}'] == pytest.approx(6.05)
+
+
+def test_capture_and_replay():
+    before = olcumler.PIXELS.value(operation='test')
+    with olcumler.capture() as observations:
+        olcumler.count_pixels('test', 10)
+        olcumler.observe_stage('test_stage', 0.5)
+    assert observations == [('pixels', 'test', 10), ('stage', 'test_stage', 0.5)]
+    olcumler.replay(observations)
+    assert olcumler.PIXELS.value(operation='test') == before + 20
+
+
+def test_metrics_endpoint_after_requests():
+    client = app.test_client()
+    permutation_cache.clear()
+    image = np.random.default_rng(2).integers(0, 255, (20, 30, 3), dtype=np.uint8, endpoint=True)
+    png = cv2.imencode('.png', image)[1].tobytes()
+    with client.get('/api/metrics') as response:
+        before = parse(response.get_data(as_text=True))
+
+    for _ in range(2):
+        response = client.post('/api/encrypt', data={'image': (io.BytesIO(png), 'resim.png'),
+                                                     'password': 'olcum-sifresi'})
+        assert response.status_code == 200
+        # Akış halindeki yanıtların ölçümleri yanıt kapanınca kaydedilir
+        response.close()
+    response = client.post('/api/encrypt', data={})
+    assert response.status_code == 400
+    response.close()
+
+    response = client.get('/api/metrics')
+    assert response.content_type == olcumler.CONTENT_TYPE
+    after = parse(response.get_data(as_text=True))
+
+    def delta(name):
+        return after.get(name, 0) - before.get(name, 0)
+
+    assert delta('sifreleme_requests_total{endpoint="/api/encrypt",status="200"}') == 2
+    assert delta('sifreleme_requests_total{endpoint="/api/encrypt",status="400"}') == 1
+    assert delta('sifreleme_pixels_total{operation="encrypt"}') == 2 * 20 * 30
+    for stage in ('upload', 'decode', 'permutation', 'pixel_move', 'encode'):
+        assert delta(f'sifreleme_stage_duration_seconds_count{{stage="{stage}"}}') >= 2, stage
+    assert delta('sifreleme_request_duration_seconds_count{endpoint="/api/encrypt"}') == 3
+    assert delta('sifreleme_received_bytes_total') >= 2 * len(png)
+    assert delta('sifreleme_sent_bytes_total') > 0
+    assert delta('sifreleme_permutation_cache_lookups_total{result="miss"}') == 1
+    assert delta('sifreleme_permutation_cache_lookups_total{result="hit"}') == 1
+    hits = after['sifreleme_permutation_cache_lookups_total{result="hit"}']
+    misses = after['sifreleme_permutation_cache_lookups_total{result="miss"}']
+    assert after['sifreleme_permutation_cache_hit_ratio'] == pytest.approx(hits / (hits + misses))
+    # Yalnızca bu /api/metrics isteği sürüyor
+    assert after['sifreleme_requests_in_flight'] - before['sifreleme_requests_in_flight'] == 0
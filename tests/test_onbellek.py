@@ -0,0 +1,153 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from karistirma import generate_permutation
+from onbellek import PermutationCache
+
+
+class CountingFactory:
+    def __init__(self, delay=0):
+        self.calls = []
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, seed, pixel_count):
+        with self._lock:
+            self.calls.append((seed, pixel_count))
+        time.sleep(self.delay)
+        return generate_permutation(seed, pixel_count)
+
+
+def test_hits_and_misses_are_counted():
+    factory = CountingFactory()
+    observed = []
+    cache = PermutationCache(factory, 1 << 20, observer=observed.append)
+
+    first = cache.get(1, 100)
+    assert cache.get(1, 100) is first
+    cache.get(2, 100)
+
+    assert factory.calls == [(1, 100), (2, 100)]
+    assert observed == [False, True, False]
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 2)
+    assert stats['hit_ratio'] == pytest.approx(1 / 3)
+
+
+def test_inverse_is_derived_from_cached_forward():
+    factory = CountingFactory()
+    cache = PermutationCache(factory, 1 << 20)
+    forward = cache.get(7, 1000)
+    inverse = cache.get(7, 1000, inverse=True)
+
+    assert factory.calls == [(7, 1000)]
+    assert np.array_equal(inverse[forward], np.arange(1000))
+    assert cache.get(7, 1000, inverse=True) is inverse
+    assert not forward.flags.writeable and not inverse.flags.writeable
+
+
+def test_byte_accounting():
+    cache = PermutationCache(CountingFactory(), 1 << 20)
+    cache.get(1, 100)
+    assert cache.stats()['bytes'] == 400
+    cache.get(1, 100, inverse=True)
+    assert cache.stats()['bytes'] == 800
+    cache.get(2, 50)
+    assert cache.stats()['bytes'] == 1000
+
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'hit_ratio': 0.0, 'entries': 0,
+                             'bytes': 0, 'max_bytes': 1 << 20}
+
+
+def test_least_recently_used_entry_is_evicted():
+    factory = CountingFactory()
+    # Her girdi 400 bayt; sınır iki girdiye yeter
+    cache = PermutationCache(factory, 800)
+    cache.get(1, 100)
+    cache.get(2, 100)
+    cache.get(1, 100)  # 1 en son kullanılan olur
+    cache.get(3, 100)  # 2 atılır
+
+    assert cache.stats()['entries'] == 2
+    assert cache.stats()['bytes'] == 800
+    cache.get(1, 100)
+    assert factory.calls == [(1, 100), (2, 100), (3, 100)]
+    cache.get(2, 100)
+    assert factory.calls[-1] == (2, 100)
+
+
+def test_entry_larger_than_limit_is_not_kept():
+    factory = CountingFactory()
+    cache = PermutationCache(factory, 100)
+    assert len(cache.get(1, 1000)) == 1000
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['bytes'] == 0
+
+
+def _run_concurrently(target, count):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def run(index):
+        barrier.wait()
+        results[index] = target()
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.mark.parametrize('inverse', [False, True])
+def test_concurrent_misses_generate_once(inverse):
+    factory = CountingFactory(delay=0.05)
+    cache = PermutationCache(factory, 1 << 20)
+    results = _run_concurrently(lambda: cache.get(3, 5000, inverse=inverse), 8)
+
+    assert factory.calls == [(3, 5000)]
+    assert all(result is results[0] for result in results)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (7, 1)
+
+
+def test_failed_generation_releases_waiters():
+    attempts = []
+
+    def factory(seed, pixel_count):
+        attempts.append(seed)
+        time.sleep(0.05)
+        if len(attempts) == 1:
+            raise MemoryError
+        return generate_permutation(seed, pixel_count)
+
+    cache = PermutationCache(factory, 1 << 20)
+
+    def get():
+        try:
+            return cache.get(4, 100)
+        except MemoryError:
+            return None
+
+    results = _run_concurrently(get, 4)
+    assert sum(result is None for result in results) == 1
+    assert len(attempts) == 2
+    assert np.array_equal(cache.get(4, 100), generate_permutation(4, 100))
+
+
+def test_concurrent_scrambles_match_sequential():
+    from karistirma import scramble_pixels
+
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 255, (64, 48, 3), dtype=np.uint8)
+    keys = [f'anahtar{index}' for index in range(8)]
+    expected = {key: scramble_pixels(image, key) for key in keys}
+    results = _run_concurrently(lambda: {key: scramble_pixels(image, key) for key in keys}, 8)
+    for result in results:
+        for key in keys:
+            assert np.array_equal(result[key], expected[key])
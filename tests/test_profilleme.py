@@ -0,0 +1,121 @@
+import io
+import json
+import os
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+import olcumler
+import profilleme
+from app import app
+from kodlama import decode_image
+
+REPORT_FILES = {'profil.prof', 'fonksiyonlar.txt', 'bellek.txt', 'ozet.json'}
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('SIFRELEME_PROFIL_DIZINI', str(tmp_path))
+    monkeypatch.delenv('SIFRELEME_PROFIL', raising=False)
+    return tmp_path
+
+
+def reports(directory):
+    result = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        assert set(os.listdir(path)) == REPORT_FILES
+        with open(os.path.join(path, 'ozet.json'), encoding='utf-8') as f:
+            result.append((name, json.load(f)))
+    return result
+
+
+def test_requested(monkeypatch):
+    monkeypatch.delenv('SIFRELEME_PROFIL_DIZINI', raising=False)
+    monkeypatch.setenv('SIFRELEME_PROFIL', '1')
+    # Dizin ayarlı değilse özellik kapalıdır
+    assert not profilleme.requested('1')
+
+    monkeypatch.setenv('SIFRELEME_PROFIL_DIZINI', '/tmp')
+    assert profilleme.requested(None)
+    monkeypatch.setenv('SIFRELEME_PROFIL', '0')
+    assert profilleme.requested('1')
+    assert not profilleme.requested(None)
+    assert not profilleme.requested('0')
+
+
+def test_profile_writes_report(profile_dir):
+    with profilleme.profile('encrypt') as details:
+        details['shape'] = [2, 3]
+        olcumler.observe_stage('decode', 0.25)
+        olcumler.observe_stage('decode', 0.5)
+        sum(range(1000))
+    [(name, summary)] = reports(profile_dir)
+    assert '_encrypt_' in name
+    assert summary['shape'] == [2, 3]
+    assert summary['label'] == 'encrypt'
+    assert summary['error'] is None
+    assert summary['stage_seconds'] == {'decode': 0.75}
+    assert summary['total_seconds'] > 0 and summary['peak_traced_bytes'] >= 0
+
+
+def test_profile_writes_report_on_error(profile_dir):
+    with pytest.raises(ValueError, match="Resim yüklenemedi"):
+        with profilleme.profile('decrypt') as details:
+            details['shape'] = [1]
+            raise ValueError("Resim yüklenemedi")
+    [(_, summary)] = reports(profile_dir)
+    assert summary['error'] == "Resim yüklenemedi"
+    assert summary['shape'] == [1]
+
+    # Kilit bırakılır, sonraki istek yine profillenir
+    with profilleme.profile('decrypt'):
+        pass
+    assert len(reports(profile_dir)) == 2
+
+
+def test_concurrent_request_is_not_profiled(profile_dir):
+    inside = threading.Event()
+    release = threading.Event()
+
+    def first():
+        with profilleme.profile('first'):
+            inside.set()
+            release.wait(10)
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    inside.wait(10)
+    with profilleme.profile('second') as details:
+        details['ran'] = True
+    release.set()
+    thread.join()
+    assert details == {'ran': True}
+    assert [summary['label'] for _, summary in reports(profile_dir)] == ['first']
+
+
+def test_profiled_api_request(profile_dir):
+    image = np.random.default_rng(4).integers(0, 255, (12, 17, 3), dtype=np.uint8, endpoint=True)
+    png = cv2.imencode('.png', image)[1].tobytes()
+    client = app.test_client()
+
+    def post(data, **headers):
+        return client.post('/api/encrypt', headers=headers,
+                           data={'image': (io.BytesIO(data), 'resim.png'), 'password': 'gizli'})
+
+    response = post(png)
+    assert response.status_code == 200
+    assert os.listdir(profile_dir) == []
+
+    response = post(png, **{profilleme.HEADER: '1'})
+    assert response.status_code == 200
+    assert decode_image(response.data).shape == image.shape
+    [(_, summary)] = reports(profile_dir)
+    assert summary['shape'] == [12, 17, 3] and summary['error'] is None
+    assert {'decode', 'pixel_move', 'encode'} <= set(summary['stage_seconds'])
+
+    response = post(b'resim degil', **{profilleme.HEADER: '1'})
+    assert response.status_code == 500
+    assert [summary['error'] for _, summary in reports(profile_dir)].count("Resim yüklenemedi") == 1
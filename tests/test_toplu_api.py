@@ -0,0 +1,143 @@
+import io
+import json
+import tarfile
+import zipfile
+
+import cv2
+import numpy as np
+import pytest
+
+import app as app_module
+from app import ArchiveTooLargeError, BATCH_SUMMARY_NAME, app
+from karistirma import scramble_pixels
+from kodlama import decode_image
+
+PASSWORD = 'gizli'
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def make_image(seed, shape=(15, 22, 3)):
+    return np.random.default_rng(seed).integers(0, 255, shape, dtype=np.uint8, endpoint=True)
+
+
+def png_of(image):
+    return cv2.imencode('.png', image)[1].tobytes()
+
+
+def zip_of(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def tar_of(members, mode='w:gz'):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode=mode) as archive:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def post_batch(client, operation, files, **form):
+    response = client.post(f'/api/{operation}/batch', data={
+        'images': [(io.BytesIO(data), name) for name, data in files],
+        'password': PASSWORD, **form,
+    })
+    return response
+
+
+def read_zip(response):
+    assert response.status_code == 200, response.data[:200]
+    with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def test_batch_round_trip_keeps_archive_layout(client):
+    images = {name: make_image(seed) for seed, name in enumerate(
+        ['a.png', 'klasor/b.png', 'klasor/alt/c.png', 'd.png'])}
+    uploads = [
+        ('a.png', png_of(images['a.png'])),
+        ('arsiv.zip', zip_of({'klasor/b.png': png_of(images['klasor/b.png']),
+                              'klasor/not.txt': b'atlanir'})),
+        ('arsiv.tar.gz', tar_of({'klasor/alt/c.png': png_of(images['klasor/alt/c.png'])})),
+        ('d.png', png_of(images['d.png'])),
+    ]
+    encrypted = read_zip(post_batch(client, 'encrypt', uploads))
+    summary = json.loads(encrypted.pop(BATCH_SUMMARY_NAME))
+    assert summary['processed'] == 4 and summary['failed'] == []
+    assert sorted(encrypted) == sorted(images)
+    for name, image in images.items():
+        assert np.array_equal(decode_image(encrypted[name]), scramble_pixels(image, PASSWORD))
+
+    decrypted = read_zip(post_batch(client, 'decrypt', [('sifreli.zip', zip_of(encrypted))]))
+    decrypted.pop(BATCH_SUMMARY_NAME)
+    for name, image in images.items():
+        assert np.array_equal(decode_image(decrypted[name]), image)
+
+
+def test_colliding_and_unsafe_names(client):
+    image = png_of(make_image(0))
+    uploads = [('a.png', image), ('a.png', image),
+               ('arsiv.zip', zip_of({'../../kacak.png': image}))]
+    names = sorted(read_zip(post_batch(client, 'encrypt', uploads)))
+    assert names == sorted(['a.png', 'a (2).png', 'kacak.png', BATCH_SUMMARY_NAME])
+
+
+def test_failed_files_are_listed_in_summary(client):
+    uploads = [('iyi.png', png_of(make_image(1))), ('bozuk.png', b'resim degil'),
+               ('bozuk.zip', b'arsiv degil')]
+    result = read_zip(post_batch(client, 'encrypt', uploads))
+    summary = json.loads(result[BATCH_SUMMARY_NAME])
+    assert summary['processed'] == 1
+    assert sorted(entry['name'] for entry in summary['failed']) == ['bozuk.png', 'bozuk.zip']
+
+
+def test_batch_rejects_invalid_requests(client):
+    assert client.post('/api/encrypt/batch', data={'password': PASSWORD}).status_code == 400
+    response = post_batch(client, 'encrypt', [('a.png', png_of(make_image(0)))], password='')
+    assert response.status_code == 400
+    response = post_batch(client, 'encrypt', [('a.png', png_of(make_image(0)))], format='gif')
+    assert response.status_code == 400
+
+
+@pytest.fixture
+def archive_limits(monkeypatch):
+    monkeypatch.setattr(app_module, 'ARCHIVE_SIZE_LIMIT', 1 << 20)
+    monkeypatch.setattr(app_module, 'ARCHIVE_MEMBER_LIMIT', 5)
+
+
+@pytest.mark.parametrize('name, build', [('bomba.zip', zip_of), ('bomba.tar.gz', tar_of)])
+def test_archive_size_limit(client, archive_limits, name, build):
+    archive = build({'a.png': bytes(2 << 20)})
+    assert len(archive) < 1 << 16
+    response = post_batch(client, 'encrypt', [(name, archive)])
+    assert response.status_code == 413
+    assert 'MB' in response.json['error']
+
+
+@pytest.mark.parametrize('name, build', [('cok.zip', zip_of), ('cok.tgz', tar_of)])
+def test_archive_member_limit(client, archive_limits, name, build):
+    image = png_of(make_image(0))
+    response = post_batch(client, 'encrypt', [(name, build({f'{i}.png': image for i in range(6)}))])
+    assert response.status_code == 413
+    response = post_batch(client, 'encrypt', [(name, build({f'{i}.png': image for i in range(5)}))])
+    assert len(read_zip(response)) == 6
+
+
+def test_archive_limits_count_all_archives(archive_limits):
+    image = png_of(make_image(0))
+    uploads = [(f'{index}.zip', io.BytesIO(zip_of({f'{index}/{i}.png': image for i in range(3)})))
+               for index in range(2)]
+    with pytest.raises(ArchiveTooLargeError):
+        app_module._check_archive_limits(uploads)
+    # Akışlar başa sarılır ki arşivler sonra okunabilsin
+    assert all(stream.tell() == 0 for _, stream in uploads)
+    app_module._check_archive_limits(uploads[:1])
@@ -0,0 +1,202 @@
+import json
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+import kapsayici
+import toplu_islem
+from karistirma import scramble_pixels
+from kodlama import OUTPUT_FORMATS, decode_image, read_scheme
+from toplu_islem import MANIFEST_NAME, collect_inputs, key_fingerprint, run_batch
+
+KEY = 'gizli'
+
+
+def write_image(path, shape=(20, 30, 3), seed=0):
+    image = np.random.default_rng(seed).integers(0, 255, shape, dtype=np.uint8, endpoint=True)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if path.endswith('.npy'):
+        np.save(path, image)
+    elif path.endswith(kapsayici.EXTENSION):
+        kapsayici.write_container(path, image)
+    else:
+        cv2.imwrite(path, image)
+    return image
+
+
+def read_image(path):
+    with open(path, 'rb') as f:
+        return decode_image(f.read())
+
+
+def run(operation, source, output, **options):
+    return run_batch(operation, [str(source)], str(output), KEY, workers=1, log=lambda _: None,
+                     **options)
+
+
+def test_collect_inputs_walks_directories_and_globs(tmp_path):
+    write_image(str(tmp_path / 'arsiv' / 'a.png'))
+    write_image(str(tmp_path / 'arsiv' / 'alt' / 'b.jpg'))
+    (tmp_path / 'arsiv' / 'not.txt').write_text('resim degil')
+    write_image(str(tmp_path / 'tek.bmp'))
+
+    inputs = collect_inputs([str(tmp_path / 'arsiv'), str(tmp_path / '*.bmp')])
+    assert [name for _, name in inputs] == ['a.png', os.path.join('alt', 'b.jpg'), 'tek.bmp']
+
+
+def test_colliding_output_names_are_numbered(tmp_path):
+    source = tmp_path / 'arsiv'
+    images = {name: write_image(str(source / name), seed=seed)
+              for seed, name in enumerate(['a.jpg', 'a.png', 'a.tiff'])}
+    summary = run('sifrele', source, tmp_path / 'cikti')
+
+    assert summary['processed'] == 3
+    outputs = sorted(os.listdir(tmp_path / 'cikti'))
+    assert outputs == sorted([MANIFEST_NAME, 'a.png', 'a (2).png', 'a (3).png'])
+    assert np.array_equal(read_image(str(tmp_path / 'cikti' / 'a (2).png')),
+                          scramble_pixels(images['a.png'], KEY))
+
+
+@pytest.mark.parametrize('name', ['resim.png', 'resim.npy', 'resim.gsif'])
+def test_image_size_reads_headers(tmp_path, name):
+    path = str(tmp_path / name)
+    write_image(path, shape=(12, 34, 3))
+    assert toplu_islem._image_size(path) == (34, 12)
+
+
+def test_image_size_of_unreadable_file(tmp_path):
+    path = tmp_path / 'bozuk.gsif'
+    path.write_bytes(b'resim degil')
+    assert toplu_islem._image_size(str(path)) is None
+
+
+def test_round_trip_and_manifest_skip(tmp_path):
+    source = tmp_path / 'arsiv'
+    images = {name: write_image(str(source / name), seed=seed)
+              for seed, name in enumerate(['a.png', 'b.npy', 'c.gsif'])}
+    encrypted, decrypted = tmp_path / 'sifreli', tmp_path / 'cozulmus'
+
+    assert run('sifrele', source, encrypted)['processed'] == 3
+    assert run('coz', encrypted, decrypted)['processed'] == 3
+    for name, image in images.items():
+        output = str(decrypted / (os.path.splitext(name)[0] + '.png'))
+        assert np.array_equal(read_image(output), image)
+
+    manifest = json.loads((encrypted / MANIFEST_NAME).read_text(encoding='utf-8'))
+    assert sorted(manifest) == ['a.png', 'b.png', 'c.png']
+    assert KEY not in json.dumps(manifest)
+
+    summary = run('sifrele', source, encrypted)
+    assert (summary['processed'], summary['skipped']) == (0, 3)
+
+    # Değişen girdi, değişen şifre ve --zorla yeniden işlenir
+    write_image(str(source / 'a.png'), seed=9)
+    summary = run('sifrele', source, encrypted)
+    assert (summary['processed'], summary['skipped']) == (1, 2)
+    summary = run_batch('sifrele', [str(source)], str(encrypted), KEY + 'x', workers=1,
+                        log=lambda _: None)
+    assert summary['processed'] == 3
+    assert run('sifrele', source, encrypted, force=True)['processed'] == 3
+
+
+def test_failed_files_are_reported(tmp_path):
+    source = tmp_path / 'arsiv'
+    write_image(str(source / 'iyi.png'))
+    (source / 'bozuk.png').write_bytes(b'resim degil')
+    errors = []
+    summary = run_batch('sifrele', [str(source)], str(tmp_path / 'cikti'), KEY, workers=1,
+                        log=errors.append)
+    assert (summary['processed'], summary['failed']) == (1, 1)
+    assert len(errors) == 1 and 'bozuk.png' in errors[0]
+
+
+def test_main_returns_failure_status(tmp_path):
+    source = tmp_path / 'arsiv'
+    write_image(str(source / 'a.png'))
+    args = ['sifrele', str(source), '-o', str(tmp_path / 'cikti'), '--sifre', KEY, '--isci', '1']
+    assert toplu_islem.main(args) == 0
+    (source / 'bozuk.png').write_bytes(b'resim degil')
+    assert toplu_islem.main(args) == 1
+
+
+@pytest.mark.parametrize('output_format', ['png', 'tiff'])
+def test_main_tile_mode(tmp_path, output_format):
+    source = tmp_path / 'arsiv'
+    image = write_image(str(source / 'a.png'), shape=(21, 34, 3))
+    encrypted, decrypted = tmp_path / 'sifreli', tmp_path / 'cozulmus'
+    common = ['--sifre', KEY, '--isci', '1', '--bicim', output_format]
+    assert toplu_islem.main(['sifrele', str(source), '-o', str(encrypted), '--blok', '8']
+                            + common) == 0
+    encrypted_name = 'a' + OUTPUT_FORMATS[output_format][0]
+    assert np.array_equal(read_image(str(encrypted / encrypted_name)),
+                          scramble_pixels(image, KEY, scheme=kapsayici.tile_scheme(8)))
+
+    # PNG şemayı saklar; TIFF çözülürken blok boyutu yeniden verilir
+    decrypt = ['coz', str(encrypted), '-o', str(decrypted)] + common
+    if output_format == 'tiff':
+        decrypt += ['--blok', '8']
+    assert toplu_islem.main(decrypt) == 0
+    assert np.array_equal(read_image(str(decrypted / encrypted_name)), image)
+
+
+@pytest.mark.parametrize('option', [['--blok', '1'], ['--blok', '257'], ['--blok', 'on'],
+                                    ['--blok', '8', '--feistel']])
+def test_main_rejects_invalid_tile_options(tmp_path, capsys, option):
+    with pytest.raises(SystemExit) as error:
+        toplu_islem.main(['sifrele', str(tmp_path), '-o', str(tmp_path / 'cikti'),
+                          '--sifre', KEY] + option)
+    assert error.value.code == 2
+    assert 'error' in capsys.readouterr().err
+    assert not (tmp_path / 'cikti').exists()
+
+
+def test_main_feistel_mode(tmp_path):
+    source = tmp_path / 'arsiv'
+    image = write_image(str(source / 'a.png'), shape=(21, 34, 3))
+    encrypted, decrypted = tmp_path / 'sifreli', tmp_path / 'cozulmus'
+    common = ['--sifre', KEY, '--isci', '1']
+    assert toplu_islem.main(['sifrele', str(source), '-o', str(encrypted), '--feistel']
+                            + common) == 0
+    with open(encrypted / 'a.png', 'rb') as f:
+        data = f.read()
+    scheme = read_scheme(data)
+    assert scheme.algorithm == kapsayici.ALGORITHM_FEISTEL
+    assert np.array_equal(decode_image(data), scramble_pixels(image, KEY, scheme=scheme))
+
+    # Şema resimden okunduğundan çözmede --feistel gerekmez
+    assert toplu_islem.main(['coz', str(encrypted), '-o', str(decrypted)] + common) == 0
+    assert np.array_equal(read_image(str(decrypted / 'a.png')), image)
+
+    # Tuz her çalıştırmada yenilense de işlenmiş dosyalar atlanır
+    summary = run('sifrele', source, encrypted, scheme=kapsayici.feistel_scheme())
+    assert (summary['processed'], summary['skipped']) == (0, 1)
+
+
+def test_main_feistel_rejects_formats_without_scheme(tmp_path, capsys):
+    with pytest.raises(SystemExit) as error:
+        toplu_islem.main(['sifrele', str(tmp_path), '-o', str(tmp_path / 'cikti'),
+                          '--sifre', KEY, '--feistel', '--bicim', 'tiff'])
+    assert error.value.code == 2
+    assert 'Feistel' in capsys.readouterr().err
+
+
+def test_key_fingerprint():
+    feistel = kapsayici.feistel_scheme(iterations=1)
+    # Eski şemada sonuç yalnızca karakter kodlarının toplamına bağlıdır
+    assert key_fingerprint('sifrele', 'ab') == key_fingerprint('sifrele', 'ba')
+    assert (key_fingerprint('sifrele', 'ab', kapsayici.LEGACY_SCHEME)
+            == key_fingerprint('sifrele', 'ab'))
+    assert key_fingerprint('sifrele', 'ab') != key_fingerprint('coz', 'ab', kapsayici.LEGACY_SCHEME)
+    # Diğer şemalarda şifrenin tamamı ve şema önemlidir, tuz önemli değildir
+    assert key_fingerprint('sifrele', 'ab', feistel) != key_fingerprint('sifrele', 'ba', feistel)
+    assert (key_fingerprint('sifrele', 'ab', feistel)
+            == key_fingerprint('sifrele', 'ab', kapsayici.feistel_scheme(iterations=1)))
+    assert (key_fingerprint('sifrele', 'ab', feistel)
+            != key_fingerprint('sifrele', 'ab', kapsayici.feistel_scheme(rounds=9)))
+    assert (key_fingerprint('sifrele', 'ab', kapsayici.tile_scheme(8))
+            != key_fingerprint('sifrele', 'ab', kapsayici.tile_scheme(16)))
+    # Şemanın resimden okunduğu çözmede şifrenin tamamı kullanılır
+    assert key_fingerprint('coz', 'ab') != key_fingerprint('coz', 'ba')
+    assert key_fingerprint('coz', 'ab') != key_fingerprint('coz', 'ab', kapsayici.LEGACY_SCHEME)
@@ -0,0 +1,331 @@
+import argparse
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+from PIL import Image
+
+import kapsayici
+import olcumler
+from karistirma import derive_seed, limit_move_threads, scramble_pixels, unscramble_pixels
+from kodlama import (DEFAULT_FORMAT, OUTPUT_FORMATS, check_scheme_format, decode_image,
+                     decrypt_scheme, encode_image, read_scheme, validate_output_options)
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.npy', '.gsif'}
+MANIFEST_NAME = '.toplu_manifest.json'
+# Aynı boyuttaki resimler bu büyüklükte gruplar halinde aynı işçiye verilir
+GROUP_SIZE = 16
+
+
+def file_checksum(path):
+    """Dosyanın SHA-256 özetini döndürür."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def key_fingerprint(operation, key, scheme=None):
+    """Manifestte şifrenin kendisi yerine saklanan parmak izi.
+
+    Eski piksel karıştırmada sonuç yalnızca derive_seed(key)'e bağlı
+    olduğundan parmak izi ondan üretilir. Diğer şemalarda ve şemanın her
+    resimden okunduğu çözmede (scheme None) şifrenin tamamı önemlidir;
+    parmak izi şifrenin PBKDF2 özetinden üretilir ve şema katılır. Her
+    çalıştırmada yeniden üretilen tuz katılmaz, yoksa yarıda kalan bir
+    toplu iş hiçbir dosyayı atlayamazdı.
+    """
+    if scheme == kapsayici.LEGACY_SCHEME or (scheme is None and operation == 'sifrele'):
+        text = f"{operation}:{derive_seed(key)}"
+    else:
+        digest = hashlib.pbkdf2_hmac('sha256', key.encode('utf-8'), f"toplu:{operation}".encode(),
+                                     kapsayici.DEFAULT_KDF_ITERATIONS)
+        text = f"{operation}:{digest.hex()}"
+        if scheme is not None:
+            text += f":{scheme.algorithm}:{scheme.algorithm_param}"
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def collect_inputs(patterns):
+    """Dizin ve glob desenlerinden (girdi yolu, göreli çıktı adı) listesi üretir."""
+    inputs = []
+    for pattern in patterns:
+        if os.path.isfile(pattern):
+            # Tek dosya (adında glob karakterleri olsa bile)
+            if os.path.splitext(pattern)[1].lower() in IMAGE_EXTENSIONS:
+                inputs.append((pattern, os.path.basename(pattern)))
+        elif os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                for name in sorted(files):
+                    if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+                        path = os.path.join(root, name)
+                        inputs.append((path, os.path.relpath(path, pattern)))
+        else:
+            for path in sorted(glob.glob(pattern, recursive=True)):
+                if os.path.isfile(path) and os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS:
+                    inputs.append((path, os.path.basename(path)))
+    return inputs
+
+
+def _output_name(relative_name, extension, used_names):
+    """Göreli çıktı adını üretir; aynı ada düşen girdileri (a.jpg, a.png) numaralar."""
+    stem = os.path.splitext(relative_name)[0]
+    candidate = stem + extension
+    counter = 2
+    while os.path.normcase(candidate) in used_names:
+        candidate = f"{stem} ({counter}){extension}"
+        counter += 1
+    used_names.add(os.path.normcase(candidate))
+    return candidate
+
+
+def _image_size(path):
+    """Resmin (genişlik, yükseklik) boyutunu yalnızca başlığını okuyarak döndürür."""
+    try:
+        lowered = path.lower()
+        if lowered.endswith('.npy'):
+            shape = np.load(path, mmap_mode='r').shape
+        elif lowered.endswith(kapsayici.EXTENSION):
+            with open(path, 'rb') as f:
+                shape = kapsayici.read_header(f.read(kapsayici.HEADER_SIZE)).shape
+        else:
+            with Image.open(path) as image:
+                return image.size
+        return shape[1], shape[0]
+    except Exception:
+        return None
+
+
+def _process_group(operation, jobs, key, output_format=DEFAULT_FORMAT, compression=None,
+                   scheme=None):
+    """İşçi süreçte aynı boyuttaki resimleri sırayla işler.
+
+    Gruptaki resimler aynı permütasyonu kullandığından permütasyon yalnızca
+    ilk resimde üretilir, sonrakiler süreç içi önbellekten okur. Çözmede
+    scheme verilmezse (veya Feistel ise) her resmin şeması kendisinden okunur.
+    """
+    results = []
+    for input_path, output_path in jobs:
+        # Aşama süreleri ana sürece sonuçla birlikte döndürülür
+        with olcumler.capture() as observations:
+            try:
+                with open(input_path, 'rb') as f:
+                    image_data = f.read()
+                image = decode_image(image_data)
+                if image is None:
+                    raise ValueError("Resim yüklenemedi")
+
+                if operation == 'sifrele':
+                    result_image = scramble_pixels(image, key, scheme=scheme)
+                    encoded = encode_image(result_image, output_format, compression, scheme)
+                else:
+                    result_image = unscramble_pixels(
+                        image, key, scheme=decrypt_scheme(scheme, lambda: read_scheme(image_data))
+                    )
+                    encoded = encode_image(result_image, output_format, compression)
+                os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+                with open(output_path, 'wb') as f:
+                    f.write(encoded)
+
+                results.append({
+                    'input': input_path,
+                    'output': output_path,
+                    'pixels': image.shape[0] * image.shape[1],
+                    'input_sha256': hashlib.sha256(image_data).hexdigest(),
+                    'output_sha256': hashlib.sha256(encoded).hexdigest(),
+                })
+            except Exception as e:
+                results.append({'input': input_path, 'output': output_path, 'error': str(e)})
+        results[-1]['observations'] = observations
+    return results
+
+
+def _load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+
+
+def _is_up_to_date(entry, input_path, output_path, fingerprint):
+    """Çıktı daha önce aynı girdi ve şifreyle üretilmiş mi?"""
+    if not entry or entry.get('key') != fingerprint or not os.path.exists(output_path):
+        return False
+    return (entry.get('input_sha256') == file_checksum(input_path)
+            and entry.get('output_sha256') == file_checksum(output_path))
+
+
+def run_batch(operation, patterns, output_dir, key, workers=None, force=False, log=print,
+              output_format=DEFAULT_FORMAT, compression=None, scheme=None):
+    """Resimleri süreç havuzunda toplu olarak şifreler/çözer ve özet döndürür."""
+    return process_inputs(operation, collect_inputs(patterns), output_dir, key, workers, force, log,
+                          output_format, compression, scheme=scheme)
+
+
+def process_inputs(operation, inputs, output_dir, key, workers=None, force=False, log=print,
+                   output_format=DEFAULT_FORMAT, compression=None, on_file=None, cancelled=None,
+                   scheme=None):
+    """collect_inputs biçimindeki (girdi yolu, göreli çıktı adı) listesini işler.
+
+    on_file verilirse her dosya bittiğinde (veya atlandığında) sonuç
+    sözlüğüyle çağrılır: 'input', 'output' ve 'pixels', 'skipped' ya da
+    'error' anahtarlarından biri. cancelled() True döndürürse henüz
+    başlamamış gruplar iptal edilir; çalışanlar bitirilir. scheme
+    (kapsayici.Scheme) verilmezse şifrelemede eski piksel karıştırma
+    kullanılır, çözmede şema her resimden okunur.
+    """
+    output_format, compression = validate_output_options(output_format, compression)
+    extension = OUTPUT_FORMATS[output_format][0]
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = _load_manifest(output_dir)
+    fingerprint = key_fingerprint(operation, key, scheme)
+
+    groups = {}
+    skipped = 0
+    used_names = set()
+    for input_path, relative_name in inputs:
+        output_name = _output_name(relative_name, extension, used_names)
+        output_path = os.path.join(output_dir, output_name)
+        if not force and _is_up_to_date(manifest.get(output_name), input_path, output_path, fingerprint):
+            skipped += 1
+            if on_file is not None:
+                on_file({'input': input_path, 'output': output_path, 'skipped': True})
+            continue
+        groups.setdefault(_image_size(input_path), []).append((input_path, output_path))
+
+    # Aynı boyuttaki resimler aynı işçiye gider ki permütasyon tekrar üretilmesin
+    tasks = [
+        jobs[start:start + GROUP_SIZE]
+        for jobs in groups.values()
+        for start in range(0, len(jobs), GROUP_SIZE)
+    ]
+
+    processed, failed, total_pixels = 0, 0, 0
+    observations = []
+    was_cancelled = False
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    remaining = iter(tasks)
+    # spawn: masaüstü uygulaması bu fonksiyonu bir arka plan iş
+    # parçacığından çağırır; çok iş parçacıklı süreçte fork kilitlenebilir
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=limit_move_threads, initargs=(workers,)) as executor:
+        running = set()
+        while True:
+            # İşçi sayısından fazla grup gönderilmez; böylece iptal edilince
+            # kuyrukta bekleyen gruplar hiç başlamaz
+            while not was_cancelled and len(running) < workers:
+                jobs = next(remaining, None)
+                if jobs is None:
+                    break
+                running.add(executor.submit(_process_group, operation, jobs, key, output_format,
+                                            compression, scheme))
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                for result in future.result():
+                    result_observations = result.pop('observations')
+                    olcumler.replay(result_observations)
+                    observations.extend(result_observations)
+                    if 'error' in result:
+                        failed += 1
+                        log(f"HATA: {result['input']}: {result['error']}")
+                    else:
+                        processed += 1
+                        total_pixels += result['pixels']
+                        manifest[os.path.relpath(result['output'], output_dir)] = {
+                            'input_sha256': result['input_sha256'],
+                            'output_sha256': result['output_sha256'],
+                            'key': fingerprint,
+                        }
+                    if on_file is not None:
+                        on_file(result)
+            if cancelled is not None and cancelled():
+                was_cancelled = True
+    elapsed = time.perf_counter() - started
+    _save_manifest(output_dir, manifest)
+
+    return {
+        'processed': processed,
+        'skipped': skipped,
+        'failed': failed,
+        'cancelled': was_cancelled,
+        'seconds': elapsed,
+        'images_per_second': processed / elapsed if elapsed else 0.0,
+        'megapixels_per_second': total_pixels / 1e6 / elapsed if elapsed else 0.0,
+        # Tüm işçilerdeki toplam süre (işçiler paralel çalıştığından geçen süreyi aşabilir)
+        'stage_seconds': olcumler.stage_totals(observations),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m toplu_islem',
+        description="Dizinlerdeki resimleri paralel olarak şifreler veya çözer"
+    )
+    parser.add_argument('islem', choices=['sifrele', 'coz'])
+    parser.add_argument('girdiler', nargs='+', help="Dizinler veya glob desenleri (ör. 'arsiv/**/*.jpg')")
+    parser.add_argument('-o', '--cikti', required=True, help="Çıktı dizini")
+    parser.add_argument('--sifre', required=True)
+    parser.add_argument('--isci', type=int, default=None, help="İşçi süreç sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument('--zorla', action='store_true', help="Daha önce işlenmiş dosyaları da yeniden işle")
+    parser.add_argument('--bicim', choices=sorted(OUTPUT_FORMATS), default=DEFAULT_FORMAT,
+                        help="Çıktı biçimi (varsayılan: png)")
+    parser.add_argument('--sikistirma', type=int, choices=range(10), default=None,
+                        help="PNG sıkıştırma seviyesi (0: en hızlı, 9: en küçük)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--blok', type=int, default=None,
+                      help="Pikseller yerine bu kenardaki blokları karıştır (ör. 16); çözmede "
+                           "yalnızca şemayı saklamayan TIFF/NPY girdileri için gerekir")
+    mode.add_argument('--feistel', action='store_true',
+                      help="Tablosuz Feistel permütasyonuyla şifrele (yalnızca png/gsif); "
+                           "çözmede şema resimden okunur")
+    args = parser.parse_args(argv)
+
+    if args.feistel:
+        scheme = kapsayici.feistel_scheme()
+        if args.islem == 'sifrele':
+            try:
+                check_scheme_format(scheme, args.bicim)
+            except ValueError as e:
+                parser.error(str(e))
+    elif args.blok is not None:
+        try:
+            scheme = kapsayici.tile_scheme(args.blok)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        scheme = None
+    summary = run_batch(args.islem, args.girdiler, args.cikti, args.sifre, args.isci, args.zorla,
+                        output_format=args.bicim, compression=args.sikistirma, scheme=scheme)
+    print(
+        f"{summary['processed']} resim işlendi, {summary['skipped']} atlandı, "
+        f"{summary['failed']} hatalı ({summary['seconds']:.2f} sn)"
+    )
+    print(
+        f"Hız: {summary['images_per_second']:.2f} resim/sn, "
+        f"{summary['megapixels_per_second']:.2f} MP/sn"
+    )
+    if summary['stage_seconds']:
+        stages = ', '.join(f"{name} {seconds:.2f} sn" for name, seconds in summary['stage_seconds'].items())
+        print(f"Aşamalar (işçi toplamı): {stages}")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())